@@ -3,14 +3,44 @@ Custom widget for individual brick entries in the brick list.
 Displays brick information including preview image, ID, name, and quantity.
 """
 
+from functools import lru_cache
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QSizePolicy, QCheckBox
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QPixmap, QFont, QMouseEvent
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QSignalBlocker
+from PyQt6.QtGui import QPixmap, QFont, QMouseEvent, QPainter, QColor
 from typing import Optional
 from ..models.brick import Brick
 from ..utils.image_cache import ImageCache
 
 
+@lru_cache(maxsize=None)
+def _label_font(point_size: int, bold: bool = False) -> QFont:
+    """Get the shared label font for a size/weight (built once, not per row)."""
+    font = QFont()
+    font.setPointSize(point_size)
+    font.setBold(bold)
+    return font
+
+
+@lru_cache(maxsize=None)
+def _detection_pixmap(size: int = 24) -> QPixmap:
+    """Render the detection badge (camera on a green disc) once; every row shares it."""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QColor("#4CAF50"))
+    painter.drawEllipse(pixmap.rect())
+    
+    font = QFont()
+    font.setPixelSize(size * 2 // 3)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "📷")  # Camera emoji as detection indicator
+    painter.end()
+    return pixmap
+
+
 class BrickListItem(QWidget):
     """Custom widget for displaying individual brick information in a list."""
     
@@ -19,6 +49,22 @@ class BrickListItem(QWidget):
     counter_decremented = pyqtSignal()  # Emitted when right-clicked
     manually_marked_changed = pyqtSignal(bool)  # Emitted when checkbox toggled
     
+    # Row stylesheets, built once; green for complete, grayed out and italic for manually marked
+    _COMPLETE_STYLE = """
+            QWidget#brick_item {
+                background-color: #c8e6c9;
+            }
+        """
+    _MANUAL_STYLE = """
+            QWidget#brick_item {
+                background-color: #f0f0f0;
+            }
+            QLabel {
+                color: #888888;
+                font-style: italic;
+            }
+        """
+    
     def __init__(self, brick: Brick, image_cache: ImageCache, parent=None):
         """
         Initialize brick list item.
@@ -35,6 +81,7 @@ class BrickListItem(QWidget):
         self._is_complete = False
         self._is_manually_marked = False
         self._is_detected = False
+        self._style = ""  # Stylesheet currently installed
         
         self._setup_ui()
         self._update_display()
@@ -65,15 +112,7 @@ class BrickListItem(QWidget):
         self.detection_icon.setFixedSize(24, 24)
         self.detection_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.detection_icon.setToolTip("Currently detected by camera")
-        self.detection_icon.setText("📷")  # Camera emoji as detection indicator
-        self.detection_icon.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                background-color: #4CAF50;
-                border-radius: 12px;
-                padding: 2px;
-            }
-        """)
+        self.detection_icon.setPixmap(_detection_pixmap())
         self.detection_icon.setVisible(False)  # Hidden by default
         layout.addWidget(self.detection_icon)
         
@@ -83,17 +122,12 @@ class BrickListItem(QWidget):
         
         # Brick ID - prominent display
         self.id_label = QLabel()
-        id_font = QFont()
-        id_font.setBold(True)
-        id_font.setPointSize(10)
-        self.id_label.setFont(id_font)
+        self.id_label.setFont(_label_font(10, bold=True))
         info_layout.addWidget(self.id_label)
         
         # Brick name with color
         self.name_label = QLabel()
-        name_font = QFont()
-        name_font.setPointSize(8)
-        self.name_label.setFont(name_font)
+        self.name_label.setFont(_label_font(8))
         self.name_label.setWordWrap(False)
         # Truncate long names with ellipsis
         self.name_label.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
@@ -104,10 +138,7 @@ class BrickListItem(QWidget):
         
         # Counter display label (format: "X/Y")
         self.counter_label = QLabel()
-        counter_font = QFont()
-        counter_font.setPointSize(10)
-        counter_font.setBold(True)
-        self.counter_label.setFont(counter_font)
+        self.counter_label.setFont(_label_font(10, bold=True))
         self.counter_label.setAlignment(Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter)
         self.counter_label.setMinimumWidth(50)
         self.counter_label.setToolTip("Left-click: add 1 | Right-click: remove 1")
@@ -115,9 +146,7 @@ class BrickListItem(QWidget):
         
         # Required quantity label (right side)
         self.quantity_label = QLabel()
-        quantity_font = QFont()
-        quantity_font.setPointSize(9)
-        self.quantity_label.setFont(quantity_font)
+        self.quantity_label.setFont(_label_font(9))
         self.quantity_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
         self.quantity_label.setMinimumWidth(60)
         layout.addWidget(self.quantity_label)
@@ -183,15 +212,17 @@ class BrickListItem(QWidget):
     
     def _apply_completion_highlight(self) -> None:
         """Apply green highlight to indicate brick collection is complete."""
-        self.setStyleSheet("""
-            QWidget#brick_item {
-                background-color: #c8e6c9;
-            }
-        """)
+        self._set_style(self._COMPLETE_STYLE)
     
     def _remove_completion_highlight(self) -> None:
         """Remove completion highlight."""
-        self.setStyleSheet("")
+        self._set_style("")
+    
+    def _set_style(self, style: str) -> None:
+        """Install a row stylesheet, skipping the QSS re-parse when it is already set."""
+        if style != self._style:
+            self._style = style
+            self.setStyleSheet(style)
     
     def _on_checkbox_toggled(self, checked: bool) -> None:
         """Handle manual marking checkbox toggle."""
@@ -200,30 +231,24 @@ class BrickListItem(QWidget):
         self.manually_marked_changed.emit(checked)
     
     def set_manual_marking(self, is_marked: bool) -> None:
-        """Set the manual marking state programmatically."""
+        """Set the manual marking state programmatically (display only, no signal)."""
         self._is_manually_marked = is_marked
-        self.manual_checkbox.setChecked(is_marked)
+        # Keep the checkbox in sync without re-entering _on_checkbox_toggled
+        with QSignalBlocker(self.manual_checkbox):
+            self.manual_checkbox.setChecked(is_marked)
         self._apply_manual_marking_style()
     
     def _apply_manual_marking_style(self) -> None:
         """Apply visual styling for manually marked bricks."""
         if self._is_manually_marked:
             # Gray out entire row and italicize text for manually marked bricks
-            self.setStyleSheet("""
-                QWidget#brick_item {
-                    background-color: #f0f0f0;
-                }
-                QLabel {
-                    color: #888888;
-                    font-style: italic;
-                }
-            """)
+            self._set_style(self._MANUAL_STYLE)
         elif self._is_complete:
             # Restore completion highlight if complete
             self._apply_completion_highlight()
         else:
             # Remove all styling
-            self.setStyleSheet("")
+            self._set_style("")
     
     def set_detection_status(self, is_detected: bool) -> None:
         """Set the detection status and update icon visibility."""
@@ -6,8 +6,8 @@ Manages brick display, counter tracking, manual marking, and detection feedback.
 from pathlib import Path
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Optional, Set, Dict
-from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QWidget
+from typing import Optional, Set, Dict, List
+from PyQt6.QtWidgets import QListView, QListWidget, QListWidgetItem, QWidget
 from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QSize
 from PyQt6.QtGui import QFont
 from ..models.brick import Brick
@@ -17,7 +17,7 @@ from ..utils.logger import get_logger
 from .brick_list_item import BrickListItem
 
 
-@dataclass
+@dataclass(slots=True)
 class BrickListState:
     """Manages state for brick list display."""
     # Original ordering (before detection-based reordering)
@@ -33,6 +33,22 @@ class BrickListState:
     scroll_position: int = 0
 
 
+class _BrickRow(QListWidgetItem):
+    """List row that sorts detected bricks first, then by original list position."""
+    
+    def __init__(self, original_position: int, parent=None):
+        super().__init__(parent)
+        self.sort_key = (1, original_position)
+        self.widget: Optional["BrickListItem"] = None  # Row widget, kept here to skip itemWidget() calls
+    
+    def set_detected(self, is_detected: bool) -> None:
+        """Move the row into the detected or not-detected group for the next sort."""
+        self.sort_key = (0 if is_detected else 1, self.sort_key[1])
+    
+    def __lt__(self, other: "_BrickRow") -> bool:
+        return self.sort_key < other.sort_key
+
+
 class BrickListWidget(QListWidget):
     """
     Custom list widget for displaying and interacting with bricks in a set.
@@ -47,9 +63,13 @@ class BrickListWidget(QListWidget):
     
     # Signals
     brick_counter_changed = pyqtSignal(str, int)  # part_number, new_count
+    brick_counters_changed = pyqtSignal(dict)     # part_number -> applied count change, one per batch
     brick_manually_marked = pyqtSignal(str, bool)  # part_number, is_marked
     brick_selected = pyqtSignal(str)  # part_number
     
+    # Every row has the same height
+    _ROW_SIZE_HINT = QSize(0, 60)
+    
     def __init__(self, parent=None):
         """Initialize the brick list widget."""
         super().__init__(parent)
@@ -64,19 +84,26 @@ class BrickListWidget(QListWidget):
         
         # Brick items lookup (part_number -> BrickListItem)
         self._brick_items: Dict[str, BrickListItem] = {}
+        # Part number -> list rows showing it (a part can appear in several colors)
+        self._list_items: Dict[str, List[_BrickRow]] = {}
         
-        # Setup update batching timer (for detection updates)
+        # Setup update batching timer (for detection updates): armed by the first
+        # update_detection_status call and fired once per 100ms batching interval
         self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(100)
         self._update_timer.timeout.connect(self._apply_detection_updates)
-        self._update_timer.start(100)  # 100ms batching interval
         
         self._setup_ui()
         self.logger.info("Brick list widget initialized")
     
     def _setup_ui(self):
         """Setup the list widget appearance."""
-        # Set uniform item sizes
+        # Set uniform item sizes; rows share one height, so lay them out in a single
+        # pass and don't relayout on resize
         self.setUniformItemSizes(True)
+        self.setLayoutMode(QListView.LayoutMode.SinglePass)
+        self.setResizeMode(QListView.ResizeMode.Fixed)
         
         # Enable smooth scrolling
         self.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
@@ -120,9 +147,15 @@ class BrickListWidget(QListWidget):
         for idx, brick in enumerate(lego_set.bricks):
             brick.original_list_position = idx
         
-        # Add brick items
-        for brick in lego_set.bricks:
-            self._add_brick_item(brick)
+        # Add brick items with repaints and list signals held until all rows exist
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            for brick in lego_set.bricks:
+                self._add_brick_item(brick)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
         
         # Preload images in background
         part_numbers = [brick.part_number for brick in lego_set.bricks]
@@ -138,14 +171,16 @@ class BrickListWidget(QListWidget):
             brick: The Brick object to display
         """
         # Create list item
-        item = QListWidgetItem(self)
-        item.setSizeHint(QSize(0, 60))
+        item = _BrickRow(brick.original_list_position, self)
+        item.setSizeHint(self._ROW_SIZE_HINT)
         
         # Create custom widget
         widget = BrickListItem(brick, self._image_cache, self)
         
         # Store reference
+        item.widget = widget
         self._brick_items[brick.part_number] = widget
+        self._list_items.setdefault(brick.part_number, []).append(item)
         
         # Set widget for item
         self.setItemWidget(item, widget)
@@ -165,6 +200,7 @@ class BrickListWidget(QListWidget):
         """Clear all items from the list."""
         self.clear()
         self._brick_items.clear()
+        self._list_items.clear()
         self._state = BrickListState()
         self.logger.info("Brick list cleared")
     
@@ -179,7 +215,7 @@ class BrickListWidget(QListWidget):
             return (0, 0)
         
         found = self.current_set.get_found_bricks_count()
-        total = sum(brick.quantity for brick in self.current_set.bricks)
+        total = self.current_set.total_quantity
         
         return (found, total)
     
@@ -208,64 +244,93 @@ class BrickListWidget(QListWidget):
         Args:
             part_number: The brick part number
         """
-        if not self.current_set:
-            return
+        new_count = self._change_counter(part_number, 1)
+        if new_count is not None:
+            self.brick_counter_changed.emit(part_number, new_count)
+    
+    def decrement_brick_counter(self, part_number: str) -> None:
+        """
+        Decrement the found counter for a brick.
         
-        # Find the brick
-        brick = next((b for b in self.current_set.bricks if b.part_number == part_number), None)
-        if not brick:
-            self.logger.warning(f"Brick {part_number} not found in current set")
-            return
+        Args:
+            part_number: The brick part number
+        """
+        new_count = self._change_counter(part_number, -1)
+        if new_count is not None:
+            self.brick_counter_changed.emit(part_number, new_count)
+    
+    def apply_detection_counts(self, counts: Dict[str, int]) -> Dict[str, int]:
+        """
+        Apply counter changes for several bricks at once, e.g. everything found in one frame.
         
-        # Validate counter (max = required quantity)
-        if brick.found_quantity >= brick.quantity:
-            self.logger.debug(f"Brick {part_number} already at maximum count")
-            return
+        The rows are repainted once and a single brick_counters_changed signal is
+        emitted for the whole batch instead of one brick_counter_changed per brick.
         
-        # Increment counter
-        brick.found_quantity += 1
-        self.logger.debug(f"Incremented {part_number}: {brick.found_quantity}/{brick.quantity}")
+        Args:
+            counts: Part number -> amount to add (negative to remove), clamped to [0, quantity]
+            
+        Returns:
+            Part number -> change actually applied after clamping, for the bricks that changed
+        """
+        if not self.current_set or not counts:
+            return {}
         
-        # Update display
-        widget = self._brick_items.get(part_number)
-        if widget:
-            widget.update_counter_display(brick.found_quantity, brick.quantity)
+        changes = {}
+        self.setUpdatesEnabled(False)
+        try:
+            for part_number, delta in counts.items():
+                brick = self.current_set.get_brick_by_part_number(part_number)
+                old_count = brick.found_quantity if brick else 0
+                new_count = self._change_counter(part_number, delta)
+                if new_count is not None:
+                    changes[part_number] = new_count - old_count
+        finally:
+            self.setUpdatesEnabled(True)
         
-        # Emit signal
-        self.brick_counter_changed.emit(part_number, brick.found_quantity)
+        if changes:
+            self.brick_counters_changed.emit(changes)
+        return changes
     
-    def decrement_brick_counter(self, part_number: str) -> None:
+    def _change_counter(self, part_number: str, delta: int) -> Optional[int]:
         """
-        Decrement the found counter for a brick.
+        Move a brick's found counter by delta within [0, quantity] and refresh its row.
         
         Args:
             part_number: The brick part number
+            delta: Amount to add (negative to remove)
+            
+        Returns:
+            The new found count, or None if the counter did not change
         """
-        if not self.current_set:
-            return
+        if not self.current_set or not delta:
+            return None
         
         # Find the brick
-        brick = next((b for b in self.current_set.bricks if b.part_number == part_number), None)
+        brick = self.current_set.get_brick_by_part_number(part_number)
         if not brick:
             self.logger.warning(f"Brick {part_number} not found in current set")
-            return
-        
-        # Validate counter (min = 0)
-        if brick.found_quantity <= 0:
-            self.logger.debug(f"Brick {part_number} already at minimum count")
-            return
-        
-        # Decrement counter
-        brick.found_quantity -= 1
-        self.logger.debug(f"Decremented {part_number}: {brick.found_quantity}/{brick.quantity}")
+            return None
+        
+        # Validate counter (0 <= count <= required quantity)
+        new_count = min(max(brick.found_quantity + delta, 0), brick.quantity)
+        if new_count == brick.found_quantity:
+            limit = "maximum" if delta > 0 else "minimum"
+            self.logger.debug(f"Brick {part_number} already at {limit} count")
+            return None
+        
+        # Update counter
+        if new_count > brick.found_quantity:
+            self.current_set.mark_brick_found(part_number, new_count - brick.found_quantity)
+        else:
+            self.current_set.unmark_brick_found(part_number, brick.found_quantity - new_count)
+        self.logger.debug(f"Counter {part_number}: {brick.found_quantity}/{brick.quantity}")
         
         # Update display
         widget = self._brick_items.get(part_number)
         if widget:
             widget.update_counter_display(brick.found_quantity, brick.quantity)
         
-        # Emit signal
-        self.brick_counter_changed.emit(part_number, brick.found_quantity)
+        return brick.found_quantity
     
     def _on_manual_marked(self, part_number: str, is_marked: bool) -> None:
         """Handle manual marking checkbox change."""
@@ -273,17 +338,16 @@ class BrickListWidget(QListWidget):
             return
         
         # Find the brick
-        brick = next((b for b in self.current_set.bricks if b.part_number == part_number), None)
+        brick = self.current_set.get_brick_by_part_number(part_number)
         if not brick:
             self.logger.warning(f"Brick {part_number} not found in current set")
             return
         
         # Update brick model
+        self.current_set.set_manually_marked(part_number, is_marked)
         if is_marked:
-            brick.mark_as_manually_found()
             self.logger.info(f"Brick {part_number} marked as manually found")
         else:
-            brick.unmark_manually_found()
             self.logger.info(f"Brick {part_number} unmarked from manual")
         
         # Emit signal
@@ -298,38 +362,46 @@ class BrickListWidget(QListWidget):
             detected_part_numbers: Set of part numbers currently detected
         """
         self._state.pending_detections = detected_part_numbers
-        self.logger.debug(f"Detection update queued: {len(detected_part_numbers)} bricks")
+        if not self._update_timer.isActive():
+            self._update_timer.start()
+        self.logger.debug("Detection update queued: %d bricks", len(detected_part_numbers))
     
     def _apply_detection_updates(self) -> None:
         """Apply batched detection updates with list reordering."""
-        if not self.current_set or not self._state.pending_detections:
-            # Clear any existing detection states if no detections
-            if self._state.detected_bricks and not self._state.pending_detections:
-                self._state.detected_bricks.clear()
-                self.logger.debug("Cleared all detections")
-                self._update_detection_icons()
-                self._reorder_list()
+        if not self.current_set:
             return
         
-        # Check if detection state actually changed
-        if self._state.pending_detections == self._state.detected_bricks:
+        # Only bricks whose detection state flipped need any work
+        changed = self._state.pending_detections ^ self._state.detected_bricks
+        if not changed:
             return
         
         # Update detected bricks set
         self._state.detected_bricks = self._state.pending_detections.copy()
-        self.logger.debug(f"Applied detection updates: {len(self._state.detected_bricks)} bricks now detected")
+        self.logger.debug("Applied detection updates: %d bricks now detected", len(self._state.detected_bricks))
         
         # Reorder list (detected bricks to top) - this also updates icons
-        self._reorder_list()
+        self._reorder_list(changed)
     
-    def _update_detection_icons(self) -> None:
-        """Update detection icon visibility for all brick items."""
-        for part_number, widget in self._brick_items.items():
+    def _update_detection_icons(self, part_numbers: Optional[Set[str]] = None) -> None:
+        """Update detection icon and sort position of the given brick items (all when None)."""
+        if part_numbers is None:
+            part_numbers = self._list_items.keys()
+        for part_number in part_numbers:
             is_detected = part_number in self._state.detected_bricks
-            widget.set_detection_status(is_detected)
+            for item in self._list_items.get(part_number, ()):
+                item.set_detected(is_detected)
+                item.widget.set_detection_status(is_detected)
     
-    def _reorder_list(self) -> None:
-        """Reorder list with detected bricks at top, maintaining original order within groups."""
+    def _reorder_list(self, changed: Optional[Set[str]] = None) -> None:
+        """
+        Reorder list with detected bricks at top, maintaining original order within groups.
+        
+        Rows are sorted in place, so the item widgets are kept rather than rebuilt.
+        
+        Args:
+            changed: Part numbers whose detection state changed (all when None)
+        """
         if not self.current_set:
             return
         
@@ -340,33 +412,12 @@ class BrickListWidget(QListWidget):
             # Save scroll position
             self._state.scroll_position = self.verticalScrollBar().value()
             
-            # Create sorted brick list: detected first, then others
-            detected_bricks = []
-            non_detected_bricks = []
-            
-            for brick in self.current_set.bricks:
-                if brick.part_number in self._state.detected_bricks:
-                    detected_bricks.append(brick)
-                else:
-                    non_detected_bricks.append(brick)
-            
-            # Rebuild list
-            self.clear()
-            self._brick_items.clear()
-            
-            # Add detected bricks first
-            for brick in detected_bricks:
-                self._add_brick_item(brick)
-            
-            # Add non-detected bricks
-            for brick in non_detected_bricks:
-                self._add_brick_item(brick)
-            
-            # Update detection icons after rebuild
-            self._update_detection_icons()
+            # Re-key the changed rows, then stable-partition: detected first, original order within groups
+            self._update_detection_icons(changed)
+            self.sortItems(Qt.SortOrder.AscendingOrder)
             
             # Restore scroll position (but don't scroll if detected bricks are at top)
-            if not detected_bricks:
+            if not self._state.detected_bricks:
                 self.verticalScrollBar().setValue(self._state.scroll_position)
         
         finally:
@@ -10,9 +10,11 @@ from PyQt6.QtCore import QPoint, QThread, pyqtSignal, Qt, QTimer
 from PyQt6.QtGui import QAction, QColor
 import time
 import os
+from typing import Optional
 import numpy as np
 
 from ..utils.logger import get_logger
+from ..utils.config_manager import ConfigManager
 from .set_info_panel import SetInfoPanel
 from ..loaders.set_loader import SetLoader, SetCSVLoader
 from .camera_config_dialog import CameraConfigDialog
@@ -223,7 +225,7 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout(central_widget)
 
         # Set info panel at top
-        self.set_info_panel = SetInfoPanel()
+        self.set_info_panel = SetInfoPanel(progress_log=ConfigManager().progress_log_file)
         main_layout.addWidget(self.set_info_panel)
         # Connect detection scope toggle
         self.set_info_panel.detect_scope_changed.connect(self._on_detect_scope_changed)
@@ -238,6 +240,7 @@ class MainWindow(QMainWindow):
         # Video display on the left
         self.video_display = VideoDisplayWidget()
         self.video_display.brick_clicked.connect(self._on_brick_clicked)
+        self.video_display.screenshot_saved.connect(self._on_preview_saved)
         content_layout.addWidget(self.video_display, stretch=3)
 
         # Brick list on the right
@@ -294,6 +297,7 @@ class MainWindow(QMainWindow):
         self.brick_list_widget = BrickListWidget()
         # Connect signals to SetInfoPanel handlers
         self.brick_list_widget.brick_counter_changed.connect(self._on_brick_counter_changed)
+        self.brick_list_widget.brick_counters_changed.connect(self._on_brick_counters_changed)
         self.brick_list_widget.brick_manually_marked.connect(self._on_brick_manually_marked)
         brick_layout.addWidget(self.brick_list_widget)
         
@@ -312,6 +316,13 @@ class MainWindow(QMainWindow):
             self.set_info_panel._update_progress()
             self.logger.debug(f"Brick {part_number} counter changed to {new_count}")
     
+    def _on_brick_counters_changed(self, changes: dict):
+        """Handle a batch of counter changes from brick list with one progress refresh."""
+        if self.current_set and hasattr(self.set_info_panel, 'progress_tracker'):
+            self.set_info_panel.progress_tracker.record_count_changes(changes, method='detected')
+            self.set_info_panel._update_progress()
+            self.logger.debug(f"{len(changes)} brick counters changed")
+    
     def _on_brick_manually_marked(self, part_number: str, is_marked: bool):
         """Handle manual marking changes from brick list."""
         self.logger.info(f"Brick {part_number} manually marked: {is_marked}")
@@ -322,10 +333,7 @@ class MainWindow(QMainWindow):
             return
         
         # Filter out manually marked bricks from detection
-        filtered_detections = {
-            pn for pn in detected_part_numbers
-            if not any(b.manually_marked for b in self.current_set.bricks if b.part_number == pn)
-        }
+        filtered_detections = set(detected_part_numbers) - self.current_set.get_manually_marked_part_numbers()
         
         self.brick_list_widget.update_detection_status(filtered_detections)
 
@@ -530,7 +538,7 @@ class MainWindow(QMainWindow):
             self.start_button.setEnabled(True)
             self.stop_button.setEnabled(False)
             # Keep save button enabled if we have a frame to allow saving the tuned static image
-            has_frame = self.video_display.get_current_frame() is not None
+            has_frame = self.video_display.get_current_frame_view() is not None
             self.save_button.setEnabled(has_frame)
             self.status_bar.showMessage("Video stopped (preview frozen)" if has_frame else "Video stopped")
             self.logger.info("Video stopped")
@@ -546,13 +554,20 @@ class MainWindow(QMainWindow):
             save_dir = os.path.join(os.getcwd(), "screenshoot")
             path = self.video_display.save_screenshot_jpg(save_dir)
             if path:
-                self.status_bar.showMessage(f"Saved preview: {path}")
+                self.status_bar.showMessage(f"Saving preview: {path}")
             else:
                 self.status_bar.showMessage("No frame to save or save failed")
         except Exception as e:
             self.logger.error(f"Error while saving preview: {e}")
             QMessageBox.critical(self, "Save Error", f"Failed to save preview: {e}")
 
+    def _on_preview_saved(self, path: str, success: bool):
+        """Report the result of a background preview save."""
+        if success:
+            self.status_bar.showMessage(f"Saved preview: {path}")
+        else:
+            self.status_bar.showMessage("No frame to save or save failed")
+
     def _on_brick_clicked(self, brick_id: str, click_pos: QPoint):
         """Handle brick click from video display - toggle detection status."""
         if self.current_set:
@@ -684,27 +699,19 @@ class MainWindow(QMainWindow):
         
         try:
             # Run detection inference
-            detections = self.detection_engine.infer(frame)
-            
-            # Draw detections on frame
-            annotated_frame = self.video_display.draw_detections(frame, detections)
+            detections = self.detection_engine.infer_soa(frame)
             
-            # Update display with annotated frame
-            self._display_frame(annotated_frame)
+            # Update display with detections drawn on the frame
+            self._display_frame(frame, detections)
         except Exception as e:
             self.logger.error(f"Error processing frame for detection: {e}")
             # On error, display original frame
             self._display_frame(frame)
 
-    def _display_frame(self, frame: np.ndarray):
-        """Display a frame in the video widget."""
+    def _display_frame(self, frame: np.ndarray, detections: Optional[list] = None):
+        """Display a frame (with optional detection overlays) in the video widget."""
         try:
-            from ..vision.video_utils import convert_frame_to_qimage
-            qimage = convert_frame_to_qimage(frame)
-            if qimage is not None:
-                from PyQt6.QtGui import QPixmap
-                pixmap = QPixmap.fromImage(qimage)
-                self.video_display.video_label.setPixmap(pixmap)
+            self.video_display.display_frame(frame, detections)
         except Exception as e:
             self.logger.error(f"Error displaying frame: {e}")
 
@@ -715,7 +722,7 @@ class MainWindow(QMainWindow):
         try:
             if not hasattr(self, 'detection_engine') or self.detection_engine is None:
                 return
-            frame = self.video_display.get_current_frame()
+            frame = self.video_display.get_current_frame_view()
             if frame is None:
                 return
             
@@ -725,9 +732,8 @@ class MainWindow(QMainWindow):
                 self._display_frame(frame)
                 return
                 
-            detections = self.detection_engine.infer(frame)
-            annotated_frame = self.video_display.draw_detections(frame, detections)
-            self._display_frame(annotated_frame)
+            detections = self.detection_engine.infer_soa(frame)
+            self._display_frame(frame, detections)
         except Exception as e:
             self.logger.error(f"Failed to reprocess current frame: {e}")
 
@@ -755,5 +761,6 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle application close event."""
         self.video_display.stop_video()
+        self.set_info_panel.progress_tracker.stop_tracking()
         self.logger.info("Application closing")
         event.accept()
\ No newline at end of file
@@ -5,6 +5,7 @@ Set information display panel for Lego Brick Detection application.
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGroupBox, QProgressBar, QCheckBox
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QColor
+from pathlib import Path
 from typing import Optional
 from ..models.lego_set import LegoSet
 from ..utils.logger import get_logger
@@ -19,11 +20,11 @@ class SetInfoPanel(QWidget):
     brick_selected = pyqtSignal(str)  # Emitted when a brick is selected (brick_id)
     detect_scope_changed = pyqtSignal(bool)  # True: detect only set classes; False: detect all classes
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, progress_log: Optional[Path] = None):
         super().__init__(parent)
         self.logger = logger
         self.current_set = None
-        self.progress_tracker = ProgressTracker()
+        self.progress_tracker = ProgressTracker(log_path=progress_log)
 
         self._setup_ui()
         self.logger.info("Set info panel initialized")
@@ -85,7 +86,7 @@ class SetInfoPanel(QWidget):
         # Update set information
         self.set_name_label.setText(lego_set.name)
         total_bricks = len(lego_set.bricks)
-        total_quantity = sum(brick.quantity for brick in lego_set.bricks)
+        total_quantity = lego_set.total_quantity
         self.set_stats_label.setText(f"{total_bricks} brick types, {total_quantity} total pieces")
 
         # Update progress
@@ -119,16 +120,16 @@ class SetInfoPanel(QWidget):
         if self.current_set is None:
             return
 
-        # Find the brick in the set
-        brick = next((b for b in self.current_set.bricks if b.id == brick_id), None)
+        # Find the brick in the set (brick IDs are part numbers)
+        brick = self.current_set.get_brick_by_part_number(brick_id)
         if brick is None:
             self.logger.warning(f"Brick {brick_id} not found in current set")
             return
 
         if found:
-            brick.mark_found()
+            self.current_set.mark_brick_found(brick_id)
         else:
-            brick.unmark_found()
+            self.current_set.unmark_brick_found(brick_id)
 
         self._update_progress()
 
@@ -137,8 +138,8 @@ class SetInfoPanel(QWidget):
         if self.current_set is None:
             return
 
-        total_quantity = sum(brick.quantity for brick in self.current_set.bricks)
-        found_quantity = sum(brick.found_quantity for brick in self.current_set.bricks)
+        total_quantity = self.current_set.total_quantity
+        found_quantity = self.current_set.get_found_bricks_count()
 
         if total_quantity > 0:
             percentage = int((found_quantity / total_quantity) * 100)
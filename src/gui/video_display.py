@@ -4,24 +4,72 @@ Video display widget for Lego Brick Detection application.
 
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PyQt6.QtGui import QPixmap, QImage
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPoint, QEvent
-from typing import Optional, List
+from PyQt6.QtCore import (
+    Qt, QTimer, QElapsedTimer, pyqtSignal, QPoint, QEvent, QObject, QRunnable, QThreadPool, QReadWriteLock
+)
+from typing import Optional, List, Tuple
 import numpy as np
 import cv2
 import os
 from datetime import datetime
-from ..vision.video_utils import VideoCaptureManager, convert_frame_to_qimage, draw_bounding_box
+from ..vision.video_utils import VideoCaptureManager, convert_frame_to_qimage, draw_bounding_box, text_size
 from ..vision.color_matcher import ColorMatcher
+from ..vision.detection_engine import DetectionBatch, boxes_contain_points
 from ..utils.logger import get_logger
 
 logger = get_logger("video_display")
 
+
+def _detection_arrays(detections) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Get integer pixel boxes (N, 4), confidences (N,) and class names of a DetectionBatch or Detection list."""
+    if isinstance(detections, DetectionBatch):
+        return detections.bboxes.astype(np.int32), detections.confidences, detections.class_names
+    if not detections:
+        return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float64), []
+    boxes = np.asarray([d.bbox for d in detections], dtype=np.float64).astype(np.int32)
+    confidences = np.fromiter((d.confidence for d in detections), dtype=np.float64, count=len(detections))
+    return boxes, confidences, [d.class_name for d in detections]
+
+class ScreenshotWriterSignals(QObject):
+    """Signals emitted by ScreenshotWriter (QRunnable cannot emit signals itself)."""
+    finished = pyqtSignal(str, bool)  # Emitted when the write completes (path, success)
+
+class ScreenshotWriter(QRunnable):
+    """Encodes and writes a screenshot JPG on a thread pool worker."""
+
+    def __init__(self, qimage: QImage, path: str, quality: int = 95):
+        super().__init__()
+        self.qimage = qimage
+        self.path = path
+        self.quality = quality
+        self.signals = ScreenshotWriterSignals()
+
+    def run(self):
+        """Encode the image off the GUI thread."""
+        try:
+            success = self.qimage.save(self.path, "JPG", quality=self.quality)
+        except Exception as e:
+            logger.error(f"Error writing screenshot {self.path}: {e}")
+            success = False
+        self.signals.finished.emit(self.path, success)
+
 class VideoDisplayWidget(QWidget):
     """Widget for displaying video feed with detection overlays."""
 
     # Signals
     frame_processed = pyqtSignal(np.ndarray)  # Emitted when a frame is processed
     brick_clicked = pyqtSignal(str, QPoint)  # Emitted when a brick is clicked (brick_id, click_position)
+    screenshot_saved = pyqtSignal(str, bool)  # Emitted when a screenshot write completes (path, success)
+
+    # Detection drawing parameters
+    # Box colors by confidence tier (BGR): > 0.8 green, > 0.6 yellow, otherwise red
+    _CONFIDENCE_THRESHOLDS = np.array([0.6, 0.8], dtype=np.float32)
+    _CONFIDENCE_COLORS = ((0, 0, 255), (0, 255, 255), (0, 255, 0))
+    _BOX_THICKNESS = 2
+    _TEXT_COLOR = (255, 255, 255)  # White
+    _TEXT_THICKNESS = 1
+    _FONT = cv2.FONT_HERSHEY_SIMPLEX
+    _FONT_SCALE = 0.6
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -30,8 +78,21 @@ class VideoDisplayWidget(QWidget):
         # Video components
         self.video_manager = VideoCaptureManager()
         self.current_frame = None
+        self._frame_lock = QReadWriteLock()  # Guards swaps of current_frame
         self.is_playing = False
 
+        # Last rendered frame buffer, detections key and pixmap (skips identical re-renders)
+        self._overlay_cache_frame = None
+        self._overlay_cache_key = None
+        self._overlay_cache_pixmap = None
+
+        # Reusable display image (BGR888, reallocated only when the frame size changes)
+        self._display_qimage = None
+
+        # Detections currently shown and their (N, 4) int32 x1, y1, x2, y2 boxes for click lookup
+        self.detection_results: List = []
+        self._bbox_array = np.empty((0, 4), dtype=np.int32)
+
         # UI components
         self.video_label = QLabel("No video feed")
         self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -56,14 +117,23 @@ class VideoDisplayWidget(QWidget):
         self.status_label.move(10, 10)
         self.status_label.hide()  # Initially hidden
 
+        # Reused single-shot timer that hides the status overlay
+        self._status_clear_timer = QTimer(self)
+        self._status_clear_timer.setSingleShot(True)
+        self._status_clear_timer.timeout.connect(lambda: self.set_status_text("", False))
+
         # Layout
         layout = QVBoxLayout()
         layout.addWidget(self.video_label)
         self.setLayout(layout)
 
-        # Timer for frame updates
+        # Timer for frame updates; frames are paced by elapsed time, not by tick count
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
         self.timer.timeout.connect(self._update_frame)
+        self._frame_clock = QElapsedTimer()
+        self._frame_interval_ms = 1000.0 / 30
+        self._next_frame_time = 0.0
 
         self.logger.info("Video display widget initialized")
 
@@ -71,7 +141,11 @@ class VideoDisplayWidget(QWidget):
         """Start video capture and display."""
         if self.video_manager.open(device_id, width, height, fps):
             self.is_playing = True
-            self.timer.start(int(1000 / fps))  # Convert fps to milliseconds
+            self._frame_interval_ms = 1000.0 / fps
+            self._next_frame_time = 0.0
+            self._frame_clock.start()
+            # Tick slightly faster than the frame period; _update_frame decides when a frame is due
+            self.timer.start(max(1, int(self._frame_interval_ms) - 1))
             self.logger.info(f"Started video display at {fps} fps")
             return True
         else:
@@ -90,7 +164,7 @@ class VideoDisplayWidget(QWidget):
                 self.video_label.setPixmap(QPixmap.fromImage(qimage))
         # Provide subtle overlay feedback
         self.set_status_text("Preview frozen (video stopped)", True)
-        QTimer.singleShot(2000, lambda: self.set_status_text("", False))
+        self._status_clear_timer.start(2000)
         self.logger.info("Video display stopped (frozen last frame)")
 
     def _update_frame(self):
@@ -98,14 +172,29 @@ class VideoDisplayWidget(QWidget):
         if not self.is_playing:
             return
 
+        # Only process a frame once its scheduled time has arrived
+        elapsed = self._frame_clock.elapsed()
+        if elapsed < self._next_frame_time:
+            return
+        if elapsed - self._next_frame_time > self._frame_interval_ms:
+            # Falling behind: drop a frame without decoding it and resync instead of bursting
+            self.video_manager.grab_frame()
+            self._next_frame_time = elapsed
+        self._next_frame_time += self._frame_interval_ms
+
         # Read frame
         frame = self.video_manager.read_frame()
         if frame is None:
             self.logger.warning("No frame received")
             return
 
-        # Store current frame
-        self.current_frame = frame.copy()
+        # Store current frame (no copy: frames are never mutated in place, and
+        # get_current_frame_copy() copies for callers that need to write)
+        self._frame_lock.lockForWrite()
+        try:
+            self.current_frame = frame
+        finally:
+            self._frame_lock.unlock()
 
         # Emit signal for processing (detection will handle display if active)
         self.frame_processed.emit(frame)
@@ -113,14 +202,116 @@ class VideoDisplayWidget(QWidget):
         # Note: If detection is active, _process_frame_for_detection will update the display
         # with annotated frames. We don't display here to avoid overwriting the annotations.
 
-    def get_current_frame(self) -> Optional[np.ndarray]:
-        """Get the current video frame."""
-        return self.current_frame.copy() if self.current_frame is not None else None
+    def get_current_frame_copy(self) -> Optional[np.ndarray]:
+        """Get a private, writable copy of the current video frame."""
+        self._frame_lock.lockForRead()
+        try:
+            return self.current_frame.copy() if self.current_frame is not None else None
+        finally:
+            self._frame_lock.unlock()
+
+    # Previous name, kept for existing callers
+    get_current_frame = get_current_frame_copy
+
+    def get_current_frame_view(self) -> Optional[np.ndarray]:
+        """Get a read-only view of the current video frame without copying it."""
+        self._frame_lock.lockForRead()
+        try:
+            if self.current_frame is None:
+                return None
+            view = self.current_frame.view()
+            view.flags.writeable = False
+            return view
+        finally:
+            self._frame_lock.unlock()
+
+    def display_frame(self, frame: np.ndarray, detections: Optional[List] = None):
+        """Render a frame with optional detection overlays into the video label.
+
+        Re-displaying the same frame buffer with identical detections reuses the last pixmap.
+        """
+        self._set_detection_results(detections or [])
+
+        base = frame.base if frame.base is not None else frame
+        if isinstance(detections, DetectionBatch):
+            key = (detections.bboxes.tobytes(), np.round(detections.confidences, 3).tobytes(),
+                   tuple(detections.class_names))
+        elif detections:
+            key = tuple((d.bbox, round(d.confidence, 3), d.class_name) for d in detections)
+        else:
+            key = ()
+        if base is self._overlay_cache_frame and key == self._overlay_cache_key:
+            self.video_label.setPixmap(self._overlay_cache_pixmap)
+            return
+
+        buffer = self._display_buffer(frame)
+        if buffer is None:
+            # Unexpected frame layout: fall back to the allocating conversion path
+            annotated = self.draw_detections(frame, detections) if detections else frame
+            qimage = convert_frame_to_qimage(annotated)
+            if qimage is None:
+                return
+        else:
+            # Copy into the reusable QImage and draw overlays straight into its pixels
+            np.copyto(buffer, frame)
+            if detections:
+                self._draw_detections_in_place(buffer, detections)
+            qimage = self._display_qimage
+        pixmap = QPixmap.fromImage(qimage)
+        self.video_label.setPixmap(pixmap)
+
+        # Keep a reference to the frame buffer so its identity cannot be reused
+        self._overlay_cache_frame = base
+        self._overlay_cache_key = key
+        self._overlay_cache_pixmap = pixmap
+
+    def _display_buffer(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Get a writable (H, W, 3) view of the reusable BGR888 display QImage.
+
+        The QImage is only reallocated when the frame size changes. Returns None
+        for frames that are not 8-bit 3-channel BGR.
+        """
+        if frame.ndim != 3 or frame.shape[2] != 3 or frame.dtype != np.uint8:
+            return None
+
+        height, width = frame.shape[:2]
+        if (self._display_qimage is None or self._display_qimage.width() != width
+                or self._display_qimage.height() != height):
+            self._display_qimage = QImage(width, height, QImage.Format.Format_BGR888)
+
+        # Re-acquire bits() every frame so Qt can detach if the data is shared
+        bytes_per_line = self._display_qimage.bytesPerLine()
+        ptr = self._display_qimage.bits()
+        ptr.setsize(height * bytes_per_line)
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(height, bytes_per_line)
+        return rows[:, :width * 3].reshape(height, width, 3)
+
+    def _set_detection_results(self, detections):
+        """Store displayed detections and precompute their box array for hit testing.
+
+        A DetectionBatch is kept as is; its Detection objects are only built on a lookup.
+        """
+        self.detection_results = detections if isinstance(detections, DetectionBatch) else list(detections)
+        self._bbox_array = _detection_arrays(detections)[0]
+
+    def detection_at(self, x: int, y: int):
+        """Return the first displayed detection whose box contains (x, y) in frame pixels."""
+        boxes = self._bbox_array
+        if len(boxes) <= 8:
+            # Small lists: a plain scan beats numpy call overhead
+            for detection, (x1, y1, x2, y2) in zip(self.detection_results, boxes.tolist()):
+                if x1 <= x < x2 and y1 <= y < y2:
+                    return detection
+            return None
+        mask = boxes_contain_points(boxes, (x, y))[:, 0]
+        idx = int(np.argmax(mask))
+        return self.detection_results[idx] if mask[idx] else None
 
     def save_screenshot_jpg(self, save_dir: str = "screenshoot") -> Optional[str]:
         """Save the current displayed frame (with overlays) as a JPG in the given directory.
 
-        Returns the saved file path on success, or None if no frame.
+        JPEG encoding runs on a QThreadPool worker; screenshot_saved is emitted when done.
+        Returns the target file path once the write is queued, or None if no frame.
         """
         try:
             # Get the current displayed pixmap (includes any overlays/annotations)
@@ -128,7 +319,7 @@ class VideoDisplayWidget(QWidget):
             if pixmap is None or pixmap.isNull():
                 self.logger.warning("No frame displayed to save")
                 self.set_status_text("No frame to save", True)
-                QTimer.singleShot(1500, lambda: self.set_status_text("", False))
+                self._status_clear_timer.start(1500)
                 return None
 
             # Convert QPixmap to QImage
@@ -142,24 +333,28 @@ class VideoDisplayWidget(QWidget):
             filename = f"preview_{ts}.jpg"
             path = os.path.join(save_dir, filename)
 
-            # Save the QImage as JPG
-            success = qimage.save(path, "JPG", quality=95)
-            if success:
-                self.logger.info(f"Saved screenshot with overlays: {path}")
-                self.set_status_text(f"Saved: {filename}", True)
-                QTimer.singleShot(1500, lambda: self.set_status_text("", False))
-                return path
-            else:
-                self.logger.error(f"Failed to write screenshot: {path}")
-                self.set_status_text("Save failed", True)
-                QTimer.singleShot(1500, lambda: self.set_status_text("", False))
-                return None
+            # Encode and save the QImage as JPG off the GUI thread
+            writer = ScreenshotWriter(qimage, path, quality=95)
+            writer.signals.finished.connect(self._on_screenshot_written)
+            QThreadPool.globalInstance().start(writer)
+            return path
         except Exception as e:
             self.logger.error(f"Error saving screenshot: {e}")
             self.set_status_text("Error saving", True)
-            QTimer.singleShot(1500, lambda: self.set_status_text("", False))
+            self._status_clear_timer.start(1500)
             return None
 
+    def _on_screenshot_written(self, path: str, success: bool):
+        """Update the status overlay once a screenshot write has finished."""
+        if success:
+            self.logger.info(f"Saved screenshot with overlays: {path}")
+            self.set_status_text(f"Saved: {os.path.basename(path)}", True)
+        else:
+            self.logger.error(f"Failed to write screenshot: {path}")
+            self.set_status_text("Save failed", True)
+        self._status_clear_timer.start(1500)
+        self.screenshot_saved.emit(path, success)
+
     def set_status_text(self, text: str, visible: bool = True):
         """Set the status text overlay."""
         self.status_label.setText(text)
@@ -167,7 +362,7 @@ class VideoDisplayWidget(QWidget):
             self.status_label.show()
         else:
             self.status_label.hide()
-        self.logger.debug(f"Status text set to: '{text}' (visible: {visible})")
+        self.logger.debug("Status text set to: '%s' (visible: %s)", text, visible)
 
     def eventFilter(self, obj, event):
         """Handle events for child widgets."""
@@ -192,37 +387,38 @@ class VideoDisplayWidget(QWidget):
             return frame
         
         output_frame = frame.copy()
+        self._draw_detections_in_place(output_frame, detections)
+        return output_frame
+
+    def _draw_detections_in_place(self, output_frame: np.ndarray, detections) -> None:
+        """Draw bounding boxes and labels for detections directly onto output_frame."""
+        # Integer pixel boxes, confidences and names of all detections in one pass
+        boxes, confidences, class_names = _detection_arrays(detections)
         
-        # Drawing parameters
-        box_color = (0, 255, 0)  # Green (BGR)
-        box_thickness = 2
-        text_color = (255, 255, 255)  # White
-        text_thickness = 1
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        font_scale = 0.6
+        # Look up each box color from its confidence tier in one vectorized pass
+        tiers = np.searchsorted(self._CONFIDENCE_THRESHOLDS, confidences.astype(np.float32))
         
-        for detection in detections:
-            x1, y1, x2, y2 = [int(v) for v in detection.bbox]
+        for class_name, confidence, (x1, y1, x2, y2), tier in zip(
+                class_names, confidences.tolist(), boxes.tolist(), tiers.tolist()):
+            box_color = self._CONFIDENCE_COLORS[tier]
             
             # Draw bounding box
-            cv2.rectangle(output_frame, (x1, y1), (x2, y2), box_color, box_thickness)
+            cv2.rectangle(output_frame, (x1, y1), (x2, y2), box_color, self._BOX_THICKNESS)
             
             # Draw label with confidence
-            label = f"{detection.class_name} ({detection.confidence:.2f})"
-            label_size, _ = cv2.getTextSize(label, font, font_scale, text_thickness)
-            label_y = max(y1 - 5, label_size[1] + 5)
+            label = f"{class_name} ({confidence:.2f})"
+            label_w, label_h = text_size(label, self._FONT, self._FONT_SCALE, self._TEXT_THICKNESS)
+            label_y = max(y1 - 5, label_h + 5)
             
             # Draw label background
             cv2.rectangle(output_frame, 
-                        (x1, label_y - label_size[1] - 5),
-                        (x1 + label_size[0] + 5, label_y),
+                        (x1, label_y - label_h - 5),
+                        (x1 + label_w + 5, label_y),
                         box_color, -1)
             
             # Draw label text
             cv2.putText(output_frame, label, (x1 + 2, label_y - 5),
-                       font, font_scale, text_color, text_thickness)
-        
-        return output_frame
+                       self._FONT, self._FONT_SCALE, self._TEXT_COLOR, self._TEXT_THICKNESS)
 
     def closeEvent(self, event):
         """Handle widget close event."""
@@ -6,6 +6,7 @@ import csv
 import logging
 from pathlib import Path
 from typing import Optional
+import numpy as np
 from PyQt6.QtCore import QThread, pyqtSignal
 from ..models.lego_set import LegoSet
 from ..models.brick import Brick
@@ -78,15 +79,17 @@ class SetLoader:
             set_name = set_info.get('name', f"Set {set_info.get('set_num', 'Unknown')}")
             set_number = set_info.get('set_num', 'unknown')
             total_brick_types = len(bricks)  # Number of unique brick types
+            # Sum quantities in C rather than through a Python generator
+            total_quantity = int(np.fromiter((b.quantity for b in bricks), dtype=np.int64, count=total_brick_types).sum())
 
             lego_set = LegoSet(
                 name=set_name,
                 set_number=set_number,
-                total_bricks=total_brick_types,
-                bricks=bricks
+                bricks=bricks,
+                total_quantity=total_quantity
             )
 
-            self.logger.info(f"Loaded set '{set_name}' with {len(bricks)} brick types ({sum(b.quantity for b in bricks)} total bricks)")
+            self.logger.info(f"Loaded set '{set_name}' with {total_brick_types} brick types ({total_quantity} total bricks)")
             return lego_set
 
         except Exception as e:
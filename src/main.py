@@ -5,16 +5,27 @@ Main entry point for Lego Brick Detection application.
 import sys
 import argparse
 import time
-from PyQt6.QtWidgets import QApplication
+from pathlib import Path
+from PyQt6.QtWidgets import QApplication, QSplashScreen
 from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor
 from PyQt6.QtCore import Qt
-from .gui.main_window import MainWindow
 from .utils.logger import get_logger
 
 logger = get_logger("main")
 
+# Pre-rendered application icon (generated by _render_application_icon)
+APP_ICON_PATH = Path(__file__).parent / "gui" / "resources" / "app_icon.png"
+
 def create_application_icon():
-    """Create a simple application icon for the Lego Brick Detector."""
+    """Load the shipped application icon, rendering one in memory if it is missing."""
+    if APP_ICON_PATH.exists():
+        return QIcon(str(APP_ICON_PATH))
+
+    logger.warning(f"Application icon not found at {APP_ICON_PATH}, rendering a fallback")
+    return QIcon(_render_application_icon())
+
+def _render_application_icon() -> QPixmap:
+    """Rasterize a simple application icon for the Lego Brick Detector."""
     # Create a 64x64 pixel icon
     pixmap = QPixmap(64, 64)
     pixmap.fill(QColor(240, 240, 240))  # Light gray background
@@ -39,7 +50,7 @@ def create_application_icon():
 
     painter.end()
 
-    return QIcon(pixmap)
+    return pixmap
 
 def main():
     """Main application entry point."""
@@ -70,13 +81,22 @@ def main():
         app.setOrganizationName("Lego Detection Tools")
         logger.info("Application icon and branding set")
 
+        # Show a splash screen before the heavy GUI/vision imports
+        splash = QSplashScreen(app_icon.pixmap(64, 64))
+        splash.showMessage("Loading Lego Brick Detector...",
+                           Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter)
+        splash.show()
+        app.processEvents()
+
         # Create and show main window with optional arguments
         window_creation_time = time.time()
+        from .gui.main_window import MainWindow  # Deferred: pulls in OpenCV and the detection stack
         window = MainWindow(set_file=args.set_file, camera_index=args.camera)
         window_creation_end_time = time.time()
         logger.info(f"MainWindow creation took {window_creation_end_time - window_creation_time:.2f}s")
 
         window.show()
+        splash.finish(window)
         logger.info("Main window shown")
 
         # Force processing of events to ensure window is displayed
@@ -2,17 +2,27 @@
 Brick model for Lego Brick Detection application.
 """
 
-from dataclasses import dataclass
-from typing import Tuple
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
 
-@dataclass
+# Fields whose changes are reported to the owning LegoSet, which keeps status derived from them
+_STATUS_FIELDS = frozenset({'quantity', 'found_quantity', 'manually_marked', 'detected_in_current_frame'})
+
+@dataclass(slots=True, eq=False)
 class Brick:
-    """Represents an individual Lego brick with its specifications."""
+    """Represents an individual Lego brick with its specifications.
+
+    Bricks compare and hash by identity: they are mutable, and one part number
+    can appear several times in a set in different colors.
+    """
     part_number: str
     color: str
     quantity: int
     found_quantity: int = 0
-    dimensions: Tuple[float, float, float] = (0.0, 0.0, 0.0)  # width, length, height in studs
+    width_studs: float = 0.0
+    length_studs: float = 0.0
+    height_studs: float = 0.0
     
     # New properties for brick list interface
     manually_marked: bool = False           # User checked the "found manually" checkbox
@@ -20,6 +30,20 @@ class Brick:
     last_detected_timestamp: float = 0.0    # Timestamp of last detection
     original_list_position: int = 0         # Position before reordering
 
+    # LegoSet holding this brick; set by LegoSet so direct field changes keep its status in sync
+    _owner: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set a field, reporting status field changes to the owning set."""
+        owner = getattr(self, '_owner', None)  # Not assigned yet while __init__ runs
+        if owner is None or name not in _STATUS_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        old = getattr(self, name)
+        object.__setattr__(self, name, value)
+        if value != old:
+            owner._brick_changed(self, name, old)
+
     @property
     def id(self) -> str:
         """Get the brick ID (same as part number)."""
@@ -30,6 +54,11 @@ class Brick:
         """Get the brick name (combination of color and part number)."""
         return f"{self.color} {self.part_number}"
 
+    @property
+    def dimensions(self) -> Tuple[float, float, float]:
+        """Get the brick dimensions as (width, length, height) in studs."""
+        return (self.width_studs, self.length_studs, self.height_studs)
+
     def __post_init__(self):
         """Validate brick data after initialization."""
         if self.quantity < 1:
@@ -38,6 +67,9 @@ class Brick:
             raise ValueError("Found quantity cannot be negative")
         if self.found_quantity > self.quantity:
             raise ValueError("Found quantity cannot exceed total quantity")
+        # Part numbers and colors repeat across bricks and sets; share one string object each
+        self.part_number = sys.intern(self.part_number)
+        self.color = sys.intern(self.color)
 
     def is_fully_found(self) -> bool:
         """Check if all instances of this brick have been found."""
@@ -70,4 +102,4 @@ class Brick:
     
     def should_be_detected(self) -> bool:
         """Check if this brick should be included in detection."""
-        return not self.manually_marked and not self.is_fully_found()
\ No newline at end of file
+        return not self.manually_marked and not self.is_fully_found()
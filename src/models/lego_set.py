@@ -2,37 +2,115 @@
 Data models for Lego Brick Detection application.
 """
 
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, FrozenSet, Set, Tuple
 from dataclasses import dataclass, field
+import numpy as np
 from .brick import Brick
 
-@dataclass
+@dataclass(slots=True)
 class LegoSet:
     """Represents a complete Lego set with its component bricks."""
     name: str
     set_number: str
-    total_bricks: int
     bricks: List[Brick] = field(default_factory=list)
+    total_quantity: Optional[int] = None  # Sum of required quantities across all brick types
+
+    # Part number -> bricks with that part number (in list order), and part numbers currently detected
+    _by_part: Dict[str, List[Brick]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _detected_ids: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _marked_ids: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+
+    # Incrementally maintained status; bricks report every change to the fields it depends on
+    _found_count: int = field(default=0, init=False, repr=False, compare=False)
+    _completed_count: int = field(default=0, init=False, repr=False, compare=False)
+    _detectable: Optional[List[Brick]] = field(default=None, init=False, repr=False, compare=False)
+    _fully_found: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        """Validate set data after initialization."""
-        if self.total_bricks != len(self.bricks):
-            raise ValueError(f"Total bricks ({self.total_bricks}) doesn't match brick list length ({len(self.bricks)})")
+        """Fill derived data after initialization."""
+        if self.total_quantity is None:
+            self.total_quantity = sum(brick.quantity for brick in self.bricks)
+        for brick in self.bricks:
+            self._by_part.setdefault(brick.part_number, []).append(brick)
+            brick._owner = self
+        self.refresh_status()
+
+    @property
+    def total_bricks(self) -> int:
+        """Get the number of brick types in the set."""
+        return len(self.bricks)
+
+    def refresh_status(self) -> None:
+        """Recompute cached status from scratch.
+
+        Changes to the bricks' fields are tracked as they happen; this is only needed
+        after the bricks list itself was edited.
+        """
+        # Gather the per-brick quantities into arrays once and reduce them in numpy
+        quantity, found = self.get_quantity_arrays()
+        self._found_count = int(found.sum())
+        self._completed_count = int(np.count_nonzero(found >= quantity))
+        self._detected_ids = {brick.part_number for brick in self.bricks if brick.detected_in_current_frame}
+        self._marked_ids = {brick.part_number for brick in self.bricks if brick.manually_marked}
+        self._detectable = None
+        self._fully_found = None
+
+    def get_quantity_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get required and found quantities of all bricks as int64 arrays in list order."""
+        count = len(self.bricks)
+        quantity = np.fromiter((brick.quantity for brick in self.bricks), dtype=np.int64, count=count)
+        found = np.fromiter((brick.found_quantity for brick in self.bricks), dtype=np.int64, count=count)
+        return quantity, found
+
+    def remaining_quantities(self) -> np.ndarray:
+        """Get the quantity still needed for every brick, in list order."""
+        quantity, found = self.get_quantity_arrays()
+        return np.maximum(0, quantity - found)
+
+    def fully_found_mask(self) -> np.ndarray:
+        """Get a read-only boolean mask of the fully found bricks, in list order."""
+        # Cached until a brick completes or reopens, so per-ROI callers don't rescan the set
+        if self._fully_found is None:
+            quantity, found = self.get_quantity_arrays()
+            self._fully_found = found >= quantity
+            self._fully_found.flags.writeable = False
+        return self._fully_found
 
     def get_brick_by_part_number(self, part_number: str) -> Optional[Brick]:
         """Find a brick by its part number."""
-        for brick in self.bricks:
-            if brick.part_number == part_number:
-                return brick
-        return None
+        bricks = self._by_part.get(part_number)
+        return bricks[0] if bricks else None
 
     def get_found_bricks_count(self) -> int:
         """Get the number of bricks that have been found."""
-        return sum(brick.found_quantity for brick in self.bricks)
+        return self._found_count
 
     def is_complete(self) -> bool:
         """Check if all bricks in the set have been found."""
-        return all(brick.is_fully_found() for brick in self.bricks)
+        return self._completed_count == len(self.bricks)
+
+    def _brick_changed(self, brick: Brick, name: str, old) -> None:
+        """Update cached status after one of a brick's status fields changed from old."""
+        if name == 'found_quantity' or name == 'quantity':
+            if name == 'found_quantity':
+                self._found_count += brick.found_quantity - old
+                was_complete = old >= brick.quantity
+            else:
+                was_complete = brick.found_quantity >= old
+            if brick.is_fully_found() != was_complete:
+                self._completed_count += -1 if was_complete else 1
+                self._detectable = None
+                self._fully_found = None
+        elif name == 'manually_marked':
+            if brick.manually_marked:
+                self._marked_ids.add(brick.part_number)
+            elif not any(b.manually_marked for b in self._by_part[brick.part_number]):
+                self._marked_ids.discard(brick.part_number)
+            self._detectable = None
+        elif brick.detected_in_current_frame:
+            self._detected_ids.add(brick.part_number)
+        elif not any(b.detected_in_current_frame for b in self._by_part[brick.part_number]):
+            self._detected_ids.discard(brick.part_number)
 
     def mark_brick_found(self, part_number: str, quantity: int = 1) -> bool:
         """Mark a quantity of a specific brick as found."""
@@ -53,24 +131,59 @@ class LegoSet:
             brick.found_quantity -= quantity
             return True
         return False
+
+    def set_manually_marked(self, part_number: str, is_marked: bool) -> bool:
+        """Set or clear the manual "found" marking of a specific brick."""
+        brick = self.get_brick_by_part_number(part_number)
+        if not brick:
+            return False
+        if is_marked:
+            brick.mark_as_manually_found()
+        else:
+            brick.unmark_manually_found()
+        return True
+
+    def get_manually_marked_part_numbers(self) -> FrozenSet[str]:
+        """Get the part numbers of bricks that are manually marked as found."""
+        return frozenset(self._marked_ids)
     
-    def get_bricks_by_detection_status(self) -> Dict[str, List[Brick]]:
-        """Get bricks grouped by detection status."""
-        return {
-            'detected': [b for b in self.bricks if b.detected_in_current_frame],
-            'not_detected': [b for b in self.bricks if not b.detected_in_current_frame],
-            'manually_marked': [b for b in self.bricks if b.manually_marked],
-            'completed': [b for b in self.bricks if b.is_fully_found()]
-        }
+    def get_bricks_by_detection_status(self, which: Optional[Set[str]] = None) -> Dict[str, List[Brick]]:
+        """Get bricks grouped by detection status, optionally only the groups named in ``which``."""
+        groups = {'detected': [], 'not_detected': [], 'manually_marked': [], 'completed': []}
+        detected, not_detected = groups['detected'], groups['not_detected']
+        manually_marked, completed = groups['manually_marked'], groups['completed']
+        want_detection = which is None or 'detected' in which or 'not_detected' in which
+        want_marked = which is None or 'manually_marked' in which
+        want_completed = which is None or 'completed' in which
+
+        # Single pass over the bricks, filling every requested bucket at once
+        for b in self.bricks:
+            if want_detection:
+                (detected if b.detected_in_current_frame else not_detected).append(b)
+            if want_marked and b.manually_marked:
+                manually_marked.append(b)
+            if want_completed and b.is_fully_found():
+                completed.append(b)
+
+        if which is not None:
+            return {name: bricks for name, bricks in groups.items() if name in which}
+        return groups
     
     def update_detection_status(self, detected_part_numbers: Set[str], timestamp: float) -> None:
         """Update detection status for all bricks based on current frame."""
-        for brick in self.bricks:
-            if brick.part_number in detected_part_numbers:
-                brick.set_detected(timestamp)
-            else:
+        # Only touch bricks that were or are detected instead of sweeping the whole set;
+        # the intersection drops detected classes that aren't part of this set
+        detected_ids = self._by_part.keys() & detected_part_numbers
+        for part_number in self._detected_ids - detected_ids:
+            for brick in self._by_part[part_number]:
                 brick.clear_detected()
+
+        for part_number in detected_ids:
+            for brick in self._by_part[part_number]:
+                brick.set_detected(timestamp)
     
     def get_detectable_bricks(self) -> List[Brick]:
-        """Get list of bricks that should be detected."""
-        return [b for b in self.bricks if b.should_be_detected()]
\ No newline at end of file
+        """Get list of bricks that should be detected (cached until a brick's status changes)."""
+        if self._detectable is None:
+            self._detectable = [b for b in self.bricks if b.should_be_detected()]
+        return list(self._detectable)
\ No newline at end of file
@@ -2,7 +2,8 @@
 Video source model for Lego Brick Detection application.
 """
 
-from dataclasses import dataclass
+import copy
+from dataclasses import dataclass, fields
 from typing import Dict, Any, Tuple
 from enum import Enum
 
@@ -11,7 +12,7 @@ class VideoSourceType(Enum):
     WEBCAM = "webcam"
     KINECT = "kinect"
 
-@dataclass
+@dataclass(slots=True)
 class VideoSource:
     """Represents a camera or video input device configuration."""
     type: VideoSourceType
@@ -31,6 +32,13 @@ class VideoSource:
         if self.calibration_data is None:
             self.calibration_data = {}
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the configuration as a JSON-serializable dictionary keyed by field name."""
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
+        data['type'] = self.type.value
+        data['calibration_data'] = copy.deepcopy(self.calibration_data)
+        return data
+
     def get_opencv_device_id(self) -> int:
         """Get the device ID for OpenCV VideoCapture."""
         return self.device_id
@@ -41,4 +49,7 @@ class VideoSource:
             return f"Webcam {self.device_id}"
         elif self.type == VideoSourceType.KINECT:
             return f"Kinect {self.device_id}"
-        return f"Unknown {self.device_id}"
\ No newline at end of file
+        return f"Unknown {self.device_id}"
+
+# Field names computed once for to_dict() instead of on every call
+_FIELD_NAMES = tuple(f.name for f in fields(VideoSource))
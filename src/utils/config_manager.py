@@ -5,16 +5,28 @@ Handles persistence of user preferences
 to maintain settings across application sessions.
 """
 
+import copy
 import json
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
-from ..models.video_source import VideoSource
+from ..models.video_source import VideoSource, VideoSourceType
 from ..utils.logger import get_logger
 
+try:
+    import orjson  # Optional C-accelerated JSON; stdlib json is used without it
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
+# Platform-specific app data directory, resolved once at import
+if os.name == 'nt':  # Windows
+    _DEFAULT_CONFIG_DIR = Path.home() / 'AppData' / 'Local' / 'LegoBrickInventory'
+else:  # Linux/Mac
+    _DEFAULT_CONFIG_DIR = Path.home() / '.config' / 'lego_brick_inventory'
+
 
 class ConfigManager:
     """
@@ -32,23 +44,75 @@ class ConfigManager:
             config_dir: Directory to store configuration files.
                        Defaults to user's app data directory.
         """
-        if config_dir is None:
-            # Use platform-specific app data directory
-            home = Path.home()
-            if os.name == 'nt':  # Windows
-                config_dir = home / 'AppData' / 'Local' / 'LegoBrickInventory'
-            else:  # Linux/Mac
-                config_dir = home / '.config' / 'lego_brick_inventory'
-
-        self.config_dir = Path(config_dir)
+        self.config_dir = Path(config_dir) if config_dir is not None else _DEFAULT_CONFIG_DIR
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
         # Configuration file paths
         self.video_source_file = self.config_dir / 'video_source.json'
         self.app_settings_file = self.config_dir / 'app_settings.json'
+        self.detection_params_file = self.config_dir / 'detection_params.json'
+        self.progress_log_file = self.config_dir / 'progress.log'
+
+        # Parsed file contents keyed by path, tagged with the file's st_mtime_ns
+        self._json_cache: Dict[Path, Tuple[int, Any]] = {}
 
         logger.info(f"ConfigManager initialized with directory: {self.config_dir}")
 
+    def _read_json(self, path: Path) -> Any:
+        """
+        Read and parse a JSON file, reusing the last parse while the file is unchanged.
+
+        Args:
+            path: JSON file to read
+
+        Returns:
+            Parsed JSON data, a copy the caller may modify
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._json_cache.get(path)
+        if cached is not None and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
+
+        if orjson is not None:
+            data = orjson.loads(path.read_bytes())
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        self._json_cache[path] = (mtime_ns, data)
+        return copy.deepcopy(data)
+
+    def _atomic_write(self, path: Path, data: Any) -> None:
+        """
+        Serialize data as JSON and replace the file in one step.
+
+        The document is written to a temporary file next to the target,
+        flushed to disk and moved over it with os.replace, so neither a crash
+        mid-write nor a power loss leaves a truncated config behind.
+
+        Args:
+            path: Destination JSON file
+            data: JSON-serializable object to write
+        """
+        # Serialize up front so the file receives the whole document in a single write
+        if orjson is not None:
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(data, indent=2).encode('utf-8')
+        tmp_path = path.with_suffix('.json.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._json_cache.pop(path, None)
+
     def save_video_source(self, video_source: VideoSource) -> bool:
         """
         Save video source configuration to disk.
@@ -60,16 +124,9 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            data = {
-                'type': video_source.type,
-                'device_id': video_source.device_id,
-                'resolution': video_source.resolution,
-                'frame_rate': video_source.frame_rate,
-                'calibration_data': video_source.calibration_data
-            }
+            data = video_source.to_dict()
 
-            with open(self.video_source_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._atomic_write(self.video_source_file, data)
 
             logger.info("Video source configuration saved successfully")
             return True
@@ -89,11 +146,10 @@ class ConfigManager:
                 logger.info("Video source configuration file does not exist")
                 return None
 
-            with open(self.video_source_file, 'r') as f:
-                data = json.load(f)
+            data = self._read_json(self.video_source_file)
 
             video_source = VideoSource(
-                type=data.get('type', 'webcam'),
+                type=VideoSourceType(data.get('type', VideoSourceType.WEBCAM.value)),
                 device_id=data.get('device_id', 0),
                 resolution=tuple(data.get('resolution', [640, 480])),
                 frame_rate=data.get('frame_rate', 30),
@@ -117,8 +173,7 @@ class ConfigManager:
             True if successful, False otherwise
         """
         try:
-            with open(self.app_settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
+            self._atomic_write(self.app_settings_file, settings)
             logger.info("Application settings saved successfully")
             return True
         except Exception as e:
@@ -137,8 +192,7 @@ class ConfigManager:
                 logger.info("Application settings file does not exist")
                 return {}
 
-            with open(self.app_settings_file, 'r') as f:
-                settings = json.load(f)
+            settings = self._read_json(self.app_settings_file)
 
             logger.info("Application settings loaded successfully")
             return settings
@@ -153,11 +207,15 @@ class ConfigManager:
         Returns:
             Dictionary with configuration file paths and existence status
         """
+        # One directory listing instead of a stat() per configuration file
+        with os.scandir(self.config_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+
         return {
             'config_directory': str(self.config_dir),
-            'detection_params_exists': self.detection_params_file.exists(),
-            'video_source_exists': self.video_source_file.exists(),
-            'app_settings_exists': self.app_settings_file.exists(),
+            'detection_params_exists': self.detection_params_file.name in present,
+            'video_source_exists': self.video_source_file.name in present,
+            'app_settings_exists': self.app_settings_file.name in present,
             'detection_params_path': str(self.detection_params_file),
             'video_source_path': str(self.video_source_file),
             'app_settings_path': str(self.app_settings_file)
@@ -171,14 +229,9 @@ class ConfigManager:
             True if all files deleted successfully
         """
         try:
-            files_to_delete = [
-                self.video_source_file,
-                self.app_settings_file
-            ]
-
-            for file_path in files_to_delete:
-                if file_path.exists():
-                    file_path.unlink()
+            for file_path in (self.video_source_file, self.app_settings_file):
+                file_path.unlink(missing_ok=True)
+                self._json_cache.pop(file_path, None)
 
             logger.info("All configuration files reset to defaults")
             return True
@@ -3,13 +3,62 @@ Image cache for brick preview images.
 Implements LRU caching with lazy loading and placeholder generation.
 """
 
+import os
+import zlib
 from pathlib import Path
 from collections import OrderedDict
-from typing import Tuple, Optional
-from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont
-from PyQt6.QtCore import Qt
+from typing import Dict, Tuple, Optional
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont, QImage, QImageReader
+from PyQt6.QtCore import Qt, QSize, QObject, QRunnable, QThreadPool, pyqtSignal
 from PIL import Image
-import hashlib
+
+# Supported preview extensions, in lookup priority order
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG')
+
+
+def _placeholder_hue(part_number: str) -> int:
+    """Get the consistent placeholder hue for a part number."""
+    return zlib.crc32(part_number.encode()) % 360
+
+
+def _draw_placeholder_text(device, part_number: str) -> None:
+    """Paint the part number centered on a placeholder (QPixmap or QImage)."""
+    painter = QPainter(device)
+    painter.setPen(QColor(0, 0, 0, 180))
+    
+    # Use smaller font for longer part numbers
+    font_size = 8 if len(part_number) > 6 else 10
+    font = QFont("Arial", font_size, QFont.Weight.Bold)
+    painter.setFont(font)
+    
+    painter.drawText(
+        device.rect(),
+        Qt.AlignmentFlag.AlignCenter,
+        part_number
+    )
+    painter.end()
+
+
+class PlaceholderJobSignals(QObject):
+    """Signals emitted by PlaceholderJob (QRunnable cannot emit signals itself)."""
+    finished = pyqtSignal(str, QImage)  # Emitted when the placeholder is drawn (part_number, image)
+
+
+class PlaceholderJob(QRunnable):
+    """Draws a placeholder into a QImage on a thread pool worker (QPixmap is GUI-thread only)."""
+    
+    def __init__(self, part_number: str, image_size: Tuple[int, int]):
+        super().__init__()
+        self.part_number = part_number
+        self.image_size = image_size
+        self.signals = PlaceholderJobSignals()
+    
+    def run(self):
+        """Render the placeholder off the GUI thread."""
+        image = QImage(self.image_size[0], self.image_size[1], QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor.fromHsv(_placeholder_hue(self.part_number), 100, 200))
+        _draw_placeholder_text(image, self.part_number)
+        self.signals.finished.emit(self.part_number, image)
 
 
 class ImageCache:
@@ -34,6 +83,9 @@ class ImageCache:
         self._image_size = image_size
         self._cache: OrderedDict[str, QPixmap] = OrderedDict()
         self._placeholder_cache: OrderedDict[str, QPixmap] = OrderedDict()
+        self._placeholder_max_size = max_size * 2
+        self._background_cache: Dict[int, QPixmap] = {}  # hue -> filled background tile
+        self._index: Optional[Dict[str, Path]] = None  # part number -> image path, built on first miss
         
     def get_image(self, part_number: str) -> QPixmap:
         """
@@ -45,11 +97,12 @@ class ImageCache:
         Returns:
             QPixmap containing the brick image or a placeholder
         """
-        # Check cache first
-        if part_number in self._cache:
+        # Check cache first (one lookup on a hit)
+        pixmap = self._cache.get(part_number)
+        if pixmap is not None:
             # Move to end (most recently used)
             self._cache.move_to_end(part_number)
-            return self._cache[part_number]
+            return pixmap
         
         # Try to load from disk
         pixmap = self._load_image(part_number)
@@ -78,21 +131,65 @@ class ImageCache:
         Returns:
             QPixmap if successful, None otherwise
         """
-        # Try common image extensions
-        for ext in ['.png', '.jpg', '.jpeg', '.PNG', '.JPG', '.JPEG']:
-            image_path = self._image_dir / f"{part_number}{ext}"
-            if image_path.exists():
-                pixmap = QPixmap(str(image_path))
-                if not pixmap.isNull():
-                    # Scale to target size while maintaining aspect ratio
-                    return pixmap.scaled(
-                        self._image_size[0],
-                        self._image_size[1],
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-        
-        return None
+        if self._index is None:
+            self._index = self._build_index()
+        
+        image_path = self._index.get(part_number)
+        if image_path is None:
+            return None
+        
+        # Let the decoder scale while reading instead of decoding the full
+        # image and shrinking it afterwards
+        reader = QImageReader(str(image_path))
+        source_size = reader.size()
+        if source_size.isValid():
+            # Scale to target size while maintaining aspect ratio
+            reader.setScaledSize(source_size.scaled(
+                QSize(self._image_size[0], self._image_size[1]),
+                Qt.AspectRatioMode.KeepAspectRatio
+            ))
+        image = reader.read()
+        if image.isNull():
+            return None
+        
+        pixmap = QPixmap.fromImage(image)
+        if not source_size.isValid():
+            # Size unknown until decoded (format without a header size)
+            pixmap = pixmap.scaled(
+                self._image_size[0],
+                self._image_size[1],
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        return pixmap
+    
+    def _build_index(self) -> Dict[str, Path]:
+        """
+        Map part numbers to image files with a single directory listing.
+        
+        Returns:
+            Dictionary of part number to image path, preferring extensions
+            earlier in _IMAGE_EXTENSIONS when several files share a name
+        """
+        rank = {ext: i for i, ext in enumerate(_IMAGE_EXTENSIONS)}
+        index: Dict[str, Path] = {}
+        best_rank: Dict[str, int] = {}
+        
+        try:
+            with os.scandir(self._image_dir) as entries:
+                for entry in entries:
+                    stem, ext = os.path.splitext(entry.name)
+                    ext_rank = rank.get(ext)
+                    if ext_rank is None or not entry.is_file():
+                        continue
+                    if ext_rank < best_rank.get(stem, len(rank)):
+                        best_rank[stem] = ext_rank
+                        index[stem] = Path(entry.path)
+        except OSError:
+            # Missing or unreadable directory: every brick gets a placeholder
+            pass
+        
+        return index
     
     def _get_placeholder(self, part_number: str) -> QPixmap:
         """
@@ -106,40 +203,39 @@ class ImageCache:
         """
         # Check placeholder cache
         if part_number in self._placeholder_cache:
+            self._placeholder_cache.move_to_end(part_number)
             return self._placeholder_cache[part_number]
         
         # Generate consistent color from part number hash
-        hash_val = int(hashlib.md5(part_number.encode()).hexdigest()[:6], 16)
-        hue = hash_val % 360
+        hue = _placeholder_hue(part_number)
         
-        # Create pixmap
-        pixmap = QPixmap(self._image_size[0], self._image_size[1])
-        
-        # Fill with color
-        color = QColor.fromHsv(hue, 100, 200)
-        pixmap.fill(color)
+        # Start from the shared background tile for this hue (at most 360 of them);
+        # the copy detaches from the tile when the text is painted
+        background = self._background_cache.get(hue)
+        if background is None:
+            background = QPixmap(self._image_size[0], self._image_size[1])
+            background.fill(QColor.fromHsv(hue, 100, 200))
+            self._background_cache[hue] = background
+        pixmap = QPixmap(background)
         
         # Draw part number text
-        painter = QPainter(pixmap)
-        painter.setPen(QColor(0, 0, 0, 180))
-        
-        # Use smaller font for longer part numbers
-        font_size = 8 if len(part_number) > 6 else 10
-        font = QFont("Arial", font_size, QFont.Weight.Bold)
-        painter.setFont(font)
-        
-        painter.drawText(
-            pixmap.rect(),
-            Qt.AlignmentFlag.AlignCenter,
-            part_number
-        )
-        painter.end()
-        
-        # Cache placeholder
-        self._placeholder_cache[part_number] = pixmap
+        _draw_placeholder_text(pixmap, part_number)
         
+        self._store_placeholder(part_number, pixmap)
         return pixmap
     
+    def _store_placeholder(self, part_number: str, pixmap: QPixmap) -> None:
+        """Cache a placeholder (LRU-bounded like the main cache)."""
+        self._placeholder_cache[part_number] = pixmap
+        if len(self._placeholder_cache) > self._placeholder_max_size:
+            self._placeholder_cache.popitem(last=False)
+    
+    def _install_placeholder(self, part_number: str, image: QImage) -> None:
+        """Cache a placeholder drawn by a PlaceholderJob (runs on the GUI thread)."""
+        # get_image may have drawn it synchronously in the meantime
+        if part_number not in self._placeholder_cache:
+            self._store_placeholder(part_number, QPixmap.fromImage(image))
+    
     def preload_images(self, part_numbers: list[str]) -> None:
         """
         Preload images for the given part numbers (foreground operation).
@@ -151,10 +247,33 @@ class ImageCache:
             if part_number not in self._cache:
                 self.get_image(part_number)
     
+    def preload_images_async(self, part_numbers: list[str]) -> None:
+        """
+        Draw placeholders for part numbers without an image on the global thread pool.
+        
+        Each placeholder is added to the placeholder cache once its job finishes and
+        the event loop delivers the result; get_image draws synchronously until then.
+        
+        Args:
+            part_numbers: List of part numbers to preload
+        """
+        if self._index is None:
+            self._index = self._build_index()
+        
+        pool = QThreadPool.globalInstance()
+        for part_number in dict.fromkeys(part_numbers):
+            if part_number in self._index or part_number in self._placeholder_cache:
+                continue
+            job = PlaceholderJob(part_number, self._image_size)
+            job.signals.finished.connect(self._install_placeholder)
+            pool.start(job)
+    
     def clear_cache(self) -> None:
-        """Clear all cached images."""
+        """Clear all cached images and rescan the image directory on next use."""
         self._cache.clear()
         self._placeholder_cache.clear()
+        self._background_cache.clear()
+        self._index = None
     
     def get_cache_size(self) -> int:
         """
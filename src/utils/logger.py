@@ -3,26 +3,48 @@ Logging configuration for Lego Brick Detection application.
 """
 
 import logging
+import logging.handlers
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-# Create logs directory if it doesn't exist
 logs_dir = Path(__file__).parent.parent.parent / "logs"
-logs_dir.mkdir(exist_ok=True)
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(logs_dir / "lego_detector.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 
 # Create logger for the application
 logger = logging.getLogger("lego_detector")
 
+_configured = False
+
+
+def _configure_once() -> None:
+    """Set up the log handlers on first use, unless the host already configured logging."""
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    # An embedding application (or test runner) that set up logging keeps its handlers
+    if logging.getLogger().handlers:
+        return
+
+    # Create logs directory if it doesn't exist
+    logs_dir.mkdir(exist_ok=True)
+
+    # Configure logging; the file is rotated so it cannot grow without bound
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.handlers.RotatingFileHandler(
+                logs_dir / "lego_detector.log", maxBytes=5_000_000, backupCount=3
+            ),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
-    return logging.getLogger(f"lego_detector.{name}")
\ No newline at end of file
+    _configure_once()
+    return logging.getLogger(f"lego_detector.{name}")
@@ -2,30 +2,74 @@
 Progress tracking system for Lego Brick Detection application.
 """
 
+import bisect
+import json
+import os
+import time
+from collections import Counter
+import numpy as np
+from pathlib import Path
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from ..models.lego_set import LegoSet
 from ..models.brick import Brick
 from ..utils.logger import get_logger
 
+try:
+    import orjson  # Optional C-accelerated JSON; stdlib json is used without it
+except ImportError:
+    orjson = None
+
 logger = get_logger("progress_tracker")
 
+
+def _dumps_line(data: Dict) -> bytes:
+    """Serialize one log record as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return json.dumps(data).encode('utf-8') + b'\n'
+
+
 class ProgressTracker:
     """Tracks progress of finding bricks in a Lego set."""
 
-    def __init__(self):
+    def __init__(self, log_path: Optional[Path] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            log_path: Append-only file used to persist found_history across
+                      sessions. Progress is kept in memory only when None.
+        """
         self.logger = logger
+        self.log_path = Path(log_path) if log_path is not None else None
+        self._log_file = None
         self.current_set = None
         self.start_time = None
-        self.last_activity = None
-        self.found_history = []  # List of (timestamp, brick_id, method) tuples where method is 'manual' or 'detected'
+        # List of (timestamp, brick_id, method) tuples where method is 'manual' or 'detected'.
+        # Timestamps are raw time.time() seconds; datetimes are only built when displayed.
+        self.found_history = []
+        # Finds per method, kept in step with found_history so stats never rescan it
+        self._method_counts: Counter = Counter()
+
+    @property
+    def last_activity(self) -> Optional[datetime]:
+        """Time of the most recent find, or the tracking start if nothing was found yet."""
+        if not self.start_time:
+            return None
+        if self.found_history:
+            return datetime.fromtimestamp(self.found_history[-1][0])
+        return self.start_time
 
     def start_tracking(self, lego_set: LegoSet):
         """Start tracking progress for a Lego set."""
+        self._close_log()
         self.current_set = lego_set
         self.start_time = datetime.now()
-        self.last_activity = self.start_time
         self.found_history.clear()
+        self._method_counts.clear()
+        if self.log_path is not None:
+            self._open_log(lego_set)
         self.logger.info(f"Started tracking progress for set: {lego_set.name}")
 
     def stop_tracking(self):
@@ -33,9 +77,9 @@ class ProgressTracker:
         if self.start_time:
             duration = datetime.now() - self.start_time
             self.logger.info(f"Stopped tracking after {duration}")
+        self._close_log()
         self.current_set = None
         self.start_time = None
-        self.last_activity = None
 
     def record_brick_found(self, brick_id: str, method: str = 'detected'):
         """
@@ -48,11 +92,95 @@ class ProgressTracker:
         if not self.current_set:
             return
 
-        timestamp = datetime.now()
+        timestamp = time.time()
         self.found_history.append((timestamp, brick_id, method))
-        self.last_activity = timestamp
+        self._method_counts[method] += 1
+
+        if self._log_file is not None:
+            try:
+                # Buffered; the file is only fsynced when the session ends
+                self._log_file.write(_dumps_line({'t': timestamp, 'id': brick_id, 'm': method}))
+            except OSError as e:
+                self.logger.error(f"Failed to write progress log, persistence disabled: {e}")
+                self._close_log()
+
+        self.logger.debug("Recorded brick found: %s (%s)", brick_id, method)
+
+    def record_count_changes(self, changes: Dict[str, int], method: str = 'detected'):
+        """
+        Record the finds in a batch of found-counter changes.
 
-        self.logger.debug(f"Recorded brick found: {brick_id} ({method})")
+        Args:
+            changes: Brick ID -> change applied to its found count; each unit gained
+                     is one find, decreases are not finds
+            method: How the bricks were found - 'manual' or 'detected'
+        """
+        for brick_id, delta in changes.items():
+            for _ in range(delta):
+                self.record_brick_found(brick_id, method)
+
+    def _open_log(self, lego_set: LegoSet):
+        """
+        Replay the progress log if it belongs to this set, then open it for appending.
+
+        The first line records the set number; a log written for another
+        set is discarded and started over.
+        """
+        header = {'set': lego_set.set_number}
+        try:
+            replayed = self._replay_log(header)
+            self._log_file = open(self.log_path, 'ab' if replayed else 'wb', buffering=4096)
+            if not replayed:
+                self._log_file.write(_dumps_line(header))
+        except OSError as e:
+            self.logger.error(f"Failed to open progress log {self.log_path}: {e}")
+            self._log_file = None
+
+    def _replay_log(self, header: Dict) -> bool:
+        """
+        Load found_history from the progress log.
+
+        Returns:
+            True if the log exists and was written for the given set
+        """
+        try:
+            with open(self.log_path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+
+        loads = orjson.loads if orjson is not None else json.loads
+        try:
+            if not lines or loads(lines[0]) != header:
+                return False
+        except ValueError:
+            return False
+
+        for line in lines[1:]:
+            try:
+                entry = loads(line)
+                record = (float(entry['t']), entry['id'], entry['m'])
+            except (ValueError, KeyError, TypeError):
+                # A crash can leave a torn last line; skip anything unreadable
+                continue
+            self.found_history.append(record)
+            self._method_counts[record[2]] += 1
+
+        self.logger.info(f"Restored {len(self.found_history)} progress entries from {self.log_path}")
+        return True
+
+    def _close_log(self):
+        """Flush, fsync and close the progress log if it is open."""
+        if self._log_file is None:
+            return
+        try:
+            self._log_file.flush()
+            os.fsync(self._log_file.fileno())
+        except OSError as e:
+            self.logger.error(f"Failed to sync progress log: {e}")
+        finally:
+            self._log_file.close()
+            self._log_file = None
 
     def get_progress_stats(self) -> Dict:
         """Get current progress statistics."""
@@ -62,10 +190,6 @@ class ProgressTracker:
         total_bricks = self.current_set.total_bricks
         found_bricks = self.current_set.get_found_bricks_count()
         completion_percentage = (found_bricks / total_bricks * 100) if total_bricks > 0 else 0
-        
-        # Count manual vs detected finds
-        manual_finds = sum(1 for entry in self.found_history if len(entry) > 2 and entry[2] == 'manual')
-        detected_finds = sum(1 for entry in self.found_history if len(entry) > 2 and entry[2] == 'detected')
 
         stats = {
             'total_bricks': total_bricks,
@@ -73,12 +197,12 @@ class ProgressTracker:
             'remaining_bricks': total_bricks - found_bricks,
             'completion_percentage': completion_percentage,
             'is_complete': self.current_set.is_complete(),
-            'manual_finds': manual_finds,
-            'detected_finds': detected_finds,
+            'manual_finds': self._method_counts['manual'],
+            'detected_finds': self._method_counts['detected'],
             'bricks_found_today': self._get_bricks_found_in_last_24h(),
             'average_bricks_per_hour': self._get_average_bricks_per_hour(),
             'time_elapsed': self._get_time_elapsed(),
-            'estimated_completion_time': self._get_estimated_completion_time()
+            'estimated_completion_time': self._get_estimated_completion_time(found_bricks)
         }
 
         return stats
@@ -88,16 +212,22 @@ class ProgressTracker:
         if not self.current_set:
             return []
 
+        # Derive the per-brick figures for the whole set in a few array operations
+        quantity, found = self.current_set.get_quantity_arrays()
+        remaining = np.maximum(0, quantity - found).tolist()
+        complete = (found >= quantity).tolist()
+        percentage = (found / quantity * 100).tolist()
+
         progress = []
-        for brick in self.current_set.bricks:
+        for i, brick in enumerate(self.current_set.bricks):
             brick_stats = {
                 'id': brick.part_number,
                 'name': brick.name if hasattr(brick, 'name') else f"Brick {brick.part_number}",
                 'quantity': brick.quantity,
                 'found_quantity': brick.found_quantity,
-                'remaining_quantity': brick.get_remaining_quantity(),
-                'is_complete': brick.is_fully_found(),
-                'progress_percentage': (brick.found_quantity / brick.quantity * 100) if brick.quantity > 0 else 0
+                'remaining_quantity': remaining[i],
+                'is_complete': complete[i],
+                'progress_percentage': percentage[i]
             }
             progress.append(brick_stats)
 
@@ -108,9 +238,10 @@ class ProgressTracker:
         if not self.found_history:
             return 0
 
-        cutoff = datetime.now() - timedelta(hours=24)
-        recent_finds = [f for f in self.found_history if f[0] >= cutoff]
-        return len(recent_finds)
+        # found_history is appended in time order, so the cutoff can be bisected
+        cutoff = time.time() - 24 * 3600
+        start = bisect.bisect_left(self.found_history, cutoff, key=lambda entry: entry[0])
+        return len(self.found_history) - start
 
     def _get_average_bricks_per_hour(self) -> float:
         """Calculate average bricks found per hour."""
@@ -133,12 +264,14 @@ class ProgressTracker:
         minutes, seconds = divmod(remainder, 60)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-    def _get_estimated_completion_time(self) -> Optional[str]:
+    def _get_estimated_completion_time(self, found_bricks: Optional[int] = None) -> Optional[str]:
         """Estimate time to completion based on current rate."""
         if not self.current_set or not self.found_history:
             return None
 
-        remaining_bricks = self.current_set.total_bricks - self.current_set.get_found_bricks_count()
+        if found_bricks is None:
+            found_bricks = self.current_set.get_found_bricks_count()
+        remaining_bricks = self.current_set.total_bricks - found_bricks
         if remaining_bricks <= 0:
             return "Complete"
 
@@ -162,7 +295,7 @@ class ProgressTracker:
         activity = []
 
         for entry in recent:
-            timestamp, brick_id = entry[0], entry[1]
+            timestamp, brick_id = datetime.fromtimestamp(entry[0]), entry[1]
             method = entry[2] if len(entry) > 2 else 'detected'  # Default to 'detected' for backward compatibility
             
             activity.append({
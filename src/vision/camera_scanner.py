@@ -3,13 +3,75 @@ Camera device scanning functionality for Lego Brick Detection application.
 """
 
 import cv2
-from typing import List, Dict, Optional
+import glob
+import os
+import re
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from PyQt6.QtCore import QThread, pyqtSignal
 from ..models.video_source import VideoSource, VideoSourceType
+from .video_utils import CAPTURE_BACKEND
 from ..utils.logger import get_logger
 
+try:
+    import fcntl  # POSIX only; V4L2 enumeration is skipped without it
+except ImportError:
+    fcntl = None
+
 logger = get_logger("camera_scanner")
 
+# Conventional device indices on the capture rig; anything else is a plain webcam
+_DEVICE_TYPES = {
+    0: VideoSourceType.WEBCAM,
+    1: VideoSourceType.KINECT,
+}
+
+# struct v4l2_capability: driver[16], card[32], bus_info[32], version, capabilities, device_caps, reserved[3]
+_V4L2_CAPABILITY = struct.Struct('16s32s32sIII12x')
+_VIDIOC_QUERYCAP = (2 << 30) | (_V4L2_CAPABILITY.size << 16) | (ord('V') << 8) | 0  # _IOR('V', 0, ...)
+_V4L2_CAP_VIDEO_CAPTURE = 0x00000001
+_V4L2_CAP_DEVICE_CAPS = 0x80000000
+
+
+def _list_v4l2_devices() -> Optional[List[Tuple[int, str]]]:
+    """
+    List video capture nodes through V4L2 without opening an OpenCV capture.
+
+    Returns:
+        Sorted (index, card name) pairs for /dev/videoN nodes that can capture
+        video, or None when V4L2 enumeration is not available on this platform
+    """
+    if fcntl is None or not sys.platform.startswith('linux') or not os.path.isdir('/dev'):
+        return None
+
+    devices = []
+    for path in glob.glob('/dev/video*'):
+        match = re.fullmatch(r'/dev/video(\d+)', path)
+        if not match:
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            continue
+        try:
+            buf = bytearray(_V4L2_CAPABILITY.size)
+            fcntl.ioctl(fd, _VIDIOC_QUERYCAP, buf)
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
+
+        _driver, card, _bus, _version, capabilities, device_caps = _V4L2_CAPABILITY.unpack(buf)
+        # Metadata nodes share the driver's capabilities; device_caps describes this node
+        caps = device_caps if capabilities & _V4L2_CAP_DEVICE_CAPS else capabilities
+        if caps & _V4L2_CAP_VIDEO_CAPTURE:
+            devices.append((int(match.group(1)), card.split(b'\0', 1)[0].decode('utf-8', 'replace')))
+
+    return sorted(devices)
+
+
 class VideoSourceConfigurator(QThread):
     """Threaded configurator for video sources (cameras)."""
     
@@ -55,26 +117,30 @@ class CameraScanner:
 
     def scan_devices(self, max_devices: int = 2) -> List[VideoSource]:
         """Scan for available camera devices."""
-        devices = []
-
         self.logger.info(f"Scanning for camera devices (max {max_devices})...")
+        if max_devices <= 0:
+            return []
 
-        # For now, assume common devices exist to avoid slow scanning
-        # TODO: Implement faster device detection
-        potential_devices = [
-            (0, VideoSourceType.WEBCAM, "Webcam"),
-            (1, VideoSourceType.KINECT, "Kinect"),
-        ]
-        
-        for device_id, device_type, name in potential_devices[:max_devices]:
-            # Quick check - just assume devices exist for now
-            device = VideoSource(
-                type=device_type,
-                device_id=device_id,
-                resolution=(640, 480),
-                frame_rate=30
-            )
-            devices.append(device)
+        # On Linux, ask V4L2 which nodes capture video instead of opening each one
+        v4l2_devices = _list_v4l2_devices()
+        if v4l2_devices is not None:
+            devices = [
+                VideoSource(
+                    type=VideoSourceType.KINECT if 'kinect' in card.lower() else VideoSourceType.WEBCAM,
+                    device_id=index,
+                    resolution=(640, 480),  # Default resolution
+                    frame_rate=30  # Default FPS
+                )
+                for index, card in v4l2_devices[:max_devices]
+            ]
+        else:
+            # Opening a capture blocks on the driver, so probe every index at once;
+            # map() keeps results in device order
+            with ThreadPoolExecutor(max_workers=max_devices) as executor:
+                results = list(executor.map(self._test_device, range(max_devices)))
+            devices = [device for device in results if device is not None]
+
+        for device in devices:
             self.logger.info(f"Found device: {device.get_display_name()}")
 
         self.logger.info(f"Scan complete. Found {len(devices)} devices")
@@ -83,20 +149,22 @@ class CameraScanner:
     def _test_device(self, device_id: int) -> Optional[VideoSource]:
         """Test if a camera device is available and get its properties."""
         try:
-            cap = cv2.VideoCapture(device_id)
-            if cap.isOpened():
+            cap = cv2.VideoCapture(device_id, CAPTURE_BACKEND)
+            try:
+                if not cap.isOpened():
+                    return None
+            finally:
                 cap.release()
-                
-                # Create a basic device - properties will be determined later
-                device = VideoSource(
-                    type=VideoSourceType.WEBCAM,
-                    device_id=device_id,
-                    resolution=(640, 480),  # Default resolution
-                    frame_rate=30  # Default FPS
-                )
-                return device
-        except Exception:
-            pass
+
+            # Create a basic device - properties will be determined later
+            return VideoSource(
+                type=_DEVICE_TYPES.get(device_id, VideoSourceType.WEBCAM),
+                device_id=device_id,
+                resolution=(640, 480),  # Default resolution
+                frame_rate=30  # Default FPS
+            )
+        except Exception as e:
+            self.logger.debug("Probe of device %d failed: %s", device_id, e)
         return None
 
     def get_device_info(self, device_id: int) -> Optional[Dict]:
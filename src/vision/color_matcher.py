@@ -2,8 +2,10 @@
 Color matching and brick identification for Lego Brick Detection application.
 """
 
+import re
 import cv2
 import numpy as np
+from functools import lru_cache
 from typing import List, Optional, Dict, NamedTuple, Tuple
 from ..models.lego_set import LegoSet
 from ..models.brick import Brick
@@ -11,6 +13,36 @@ from ..utils.logger import get_logger
 
 logger = get_logger("color_matcher")
 
+# Color keywords in priority order (the first one present in a name wins), and their LEGO_COLORS key
+_COLOR_KEYWORDS = (
+    ('black', 'black'),
+    ('white', 'white'),
+    ('red', 'red'),
+    ('blue', 'blue'),
+    ('green', 'green'),
+    ('yellow', 'yellow'),
+    ('orange', 'orange'),
+    ('gray', 'gray'),
+    ('grey', 'gray'),
+)
+# A lookahead finds every keyword occurrence, overlapping ones included, in a single scan
+_COLOR_RE = re.compile('(?=(' + '|'.join(keyword for keyword, _ in _COLOR_KEYWORDS) + '))')
+
+@lru_cache(maxsize=256)
+def _color_name_from_brick_name(brick_name: str) -> str:
+    """Map a brick name to a LEGO_COLORS key (memoized, names repeat for every ROI)."""
+    # Simple keyword matching
+    found = set(_COLOR_RE.findall(brick_name.lower()))
+    for keyword, color_name in _COLOR_KEYWORDS:
+        if keyword in found:
+            return color_name
+
+    # Default to red for unknown colors
+    return 'red'
+
+# Label lookup table entry for colors too far from every scored color to vote
+_NO_VOTE = 255
+
 class ColorMatch(NamedTuple):
     """Result of a color matching operation."""
     brick_id: str
@@ -46,15 +78,45 @@ class ColorMatcher:
 
     def __init__(self):
         self.logger = logger
+        self.current_set: Optional[LegoSet] = None
         self.current_bricks = []  # List of bricks in current set
-        self.color_cache = {}  # Cache for color distance calculations
         self.color_threshold = 50  # Default color matching threshold
+        self.min_vote_share = 0.5  # Share of the ROI's pixels that must vote for the matched color
         self.saturation_boost = 1.2  # Default saturation boost
 
+        # LEGO_COLORS as a (C, 3) CIE LAB table so all candidates are scored in one array
+        # operation, in a space where distance tracks perceived color difference
+        self._palette_names = list(self.LEGO_COLORS.keys())
+        palette_rgb = np.array(list(self.LEGO_COLORS.values()), dtype=np.uint8).reshape(-1, 1, 3)
+        self._palette_lab = cv2.cvtColor(palette_rgb, cv2.COLOR_RGB2LAB).reshape(-1, 3).astype(np.float32)
+        self._palette_rgb = palette_rgb.reshape(-1, 3).astype(np.float32)
+        self._brick_color_names: List[str] = []  # LEGO_COLORS key per brick, resolved once per set
+        self._matchable = np.empty(0, dtype=np.intp)  # indices of bricks whose color is in the palette
+        self._matchable_labels = np.empty(0, dtype=np.intp)  # label (set color) per matchable brick
+        self._set_rows = np.empty(0, dtype=np.intp)  # palette row per set color label
+        self._lut_cache: Dict[Tuple[bytes, float], np.ndarray] = {}  # label LUTs per scored color subset
+
     def set_brick_colors(self, lego_set: LegoSet):
         """Set the brick colors for the current Lego set."""
+        self.current_set = lego_set
         self.current_bricks = lego_set.bricks
-        self.color_cache.clear()  # Clear cache when set changes
+        # Brick names do not change while a set is loaded, so resolve colors here
+        # and keep bricks with unknown colors out of the per-ROI path entirely
+        self._brick_color_names = [self._get_brick_color_name(b) for b in self.current_bricks]
+        palette_index = {name: i for i, name in enumerate(self._palette_names)}
+        palette_rows = np.array(
+            [palette_index.get(name, -1) for name in self._brick_color_names],
+            dtype=np.intp
+        )
+        self._matchable = np.flatnonzero(palette_rows >= 0)
+
+        # Colors used by the set are numbered as labels; ROIs are classified by table
+        # lookup against the labels of the bricks being scored
+        self._set_rows = np.unique(palette_rows[self._matchable])
+        self._matchable_labels = np.searchsorted(self._set_rows, palette_rows[self._matchable])
+        self._lut_cache.clear()
+        if self._set_rows.size:
+            self._label_lut(np.arange(self._set_rows.size))  # Warm the table for the full set
         self.logger.info(f"Set brick colors for {len(self.current_bricks)} bricks")
 
     def match_brick_color(self, roi: np.ndarray) -> Optional[ColorMatch]:
@@ -64,163 +126,105 @@ class ColorMatcher:
             if roi.size < 100:  # Less than 10x10 pixels
                 return None
 
-            # Extract dominant color from ROI
-            dominant_color = self._extract_dominant_color(roi)
+            if self.current_set is None:
+                return None
 
-            # Find best matching brick (limit to bricks that aren't fully found)
-            best_match = None
-            best_confidence = 0.0
+            if roi.ndim != 3 or roi.shape[2] != 3:
+                self.logger.warning(f"ROI has unexpected shape: {roi.shape}, skipping color match")
+                return None
 
             # Performance: only check bricks that still need to be found
-            bricks_to_check = [b for b in self.current_bricks if not b.is_fully_found()]
-            if not bricks_to_check:
+            candidates = np.flatnonzero(~self.current_set.fully_found_mask()[self._matchable])
+            if candidates.size == 0:
                 return None  # All bricks found
-
-            for brick in bricks_to_check[:20]:  # Limit bricks to check for performance
-                brick_color_name = self._get_brick_color_name(brick)
-                if brick_color_name in self.LEGO_COLORS:
-                    target_color = self.LEGO_COLORS[brick_color_name]
-                    confidence = self._calculate_color_similarity(dominant_color, target_color)
-
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_match = ColorMatch(
-                            brick_id=brick.id,
-                            color_name=brick_color_name,
-                            confidence=confidence,
-                            rgb_values=target_color
-                        )
-
-            # Only return matches above threshold
-            threshold_confidence = self.color_threshold / 255.0  # Convert to 0-1 scale
-            if best_match and best_match.confidence > threshold_confidence:
-                return best_match
-            else:
+            candidates = candidates[:20]  # Limit bricks to check for performance
+
+            # ~1000 votes are plenty, so large ROIs are area-averaged to a thumbnail first
+            if roi.shape[0] * roi.shape[1] > 4096:
+                roi = cv2.resize(roi, (32, 32), interpolation=cv2.INTER_AREA)
+
+            # Each pixel votes for the nearest (in LAB space) color among the scored bricks,
+            # if it passes the color threshold for that color
+            labels = np.unique(self._matchable_labels[candidates])
+            lut_index = (
+                ((roi[:, :, 0] >> 3).astype(np.intp) << 10)
+                | ((roi[:, :, 1] >> 3).astype(np.intp) << 5)
+                | (roi[:, :, 2] >> 3)
+            )
+            votes = np.bincount(self._label_lut(labels)[lut_index].ravel(), minlength=256)
+            candidate_votes = votes[np.searchsorted(labels, self._matchable_labels[candidates])]
+            best = int(candidate_votes.argmax())  # First of equally voted bricks
+
+            # Share of the ROI showing the winning brick's color
+            confidence = float(candidate_votes[best]) / lut_index.size
+
+            # Only return colors shown by enough of the ROI
+            if confidence < self.min_vote_share or confidence == 0.0:
                 return None
 
+            brick_index = self._matchable[candidates[best]]
+            color_name = self._brick_color_names[brick_index]
+            return ColorMatch(
+                brick_id=self.current_bricks[brick_index].id,
+                color_name=color_name,
+                confidence=confidence,
+                rgb_values=self.LEGO_COLORS[color_name]
+            )
+
         except Exception as e:
             self.logger.error(f"Error matching brick color: {e}")
             return None
 
-    def _extract_dominant_color(self, roi: np.ndarray) -> Tuple[int, int, int]:
-        """Extract the dominant color from a region of interest."""
-        try:
-            # Performance optimization: use mean color for small ROIs
-            if roi.size < 1000:  # Less than ~30x30 pixels
-                avg_color = cv2.mean(roi)[:3]
-                return (int(avg_color[0]), int(avg_color[1]), int(avg_color[2]))
-
-            # Ensure roi is a proper 3D array
-            if len(roi.shape) != 3 or roi.shape[2] != 3:
-                self.logger.warning(f"ROI has unexpected shape: {roi.shape}, using mean color")
-                avg_color = cv2.mean(roi)[:3]
-                return (int(avg_color[0]), int(avg_color[1]), int(avg_color[2]))
-
-            # Convert to HSV for better color analysis
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
-
-            # Verify HSV conversion worked
-            if len(hsv.shape) != 3 or hsv.shape[2] != 3:
-                self.logger.warning(f"HSV conversion failed, shape: {hsv.shape}, using mean color")
-                avg_color = cv2.mean(roi)[:3]
-                return (int(avg_color[0]), int(avg_color[1]), int(avg_color[2]))
-
-            # Use k-means clustering for better color extraction (but limit clusters for performance)
-            pixels = hsv.reshape(-1, 3).astype(np.float32)
-
-            # Sample pixels for performance (every 4th pixel)
-            if len(pixels) > 1000:
-                pixels = pixels[::4]
-
-            # Simple approach: use the most frequent hue
-            hist = cv2.calcHist([hsv], [0], None, [12], [0, 180])  # 12 hue bins
-            dominant_hue_bin = np.argmax(hist)
-
-            # Get average saturation and value for this hue range
-            try:
-                mask = (hsv[:, :, 0] >= dominant_hue_bin * 15) & (hsv[:, :, 0] < (dominant_hue_bin + 1) * 15)
-                hue_pixels = hsv[mask]  # This gives us (N, 3) array of pixels
-                if len(hue_pixels) > 0:
-                    avg_s = np.mean(hue_pixels[:, 1])  # Saturation is column 1
-                    avg_v = np.mean(hue_pixels[:, 2])  # Value is column 2
-                    dominant_hsv = [dominant_hue_bin * 15, avg_s, avg_v]
-                else:
-                    # Fallback to average
-                    dominant_hsv = cv2.mean(hsv)[:3]
-            except Exception as mask_error:
-                self.logger.warning(f"Error in hue range calculation: {mask_error}, using average")
-                dominant_hsv = cv2.mean(hsv)[:3]
-
-            # Convert back to BGR
-            bgr = cv2.cvtColor(np.uint8([[[dominant_hsv[0], dominant_hsv[1], dominant_hsv[2]]]]), cv2.COLOR_HSV2BGR)[0][0]
-
-            return (int(bgr[0]), int(bgr[1]), int(bgr[2]))
-
-        except Exception as e:
-            self.logger.error(f"Error extracting dominant color: {e}")
-            # Return average color as fallback
-            avg_color = cv2.mean(roi)[:3]
-            return (int(avg_color[0]), int(avg_color[1]), int(avg_color[2]))
-
-    def _calculate_color_similarity(self, color1: Tuple[int, int, int],
-                                  color2: Tuple[int, int, int]) -> float:
-        """Calculate color similarity using Euclidean distance in RGB space."""
-        # Use cache for repeated calculations
-        cache_key = (color1, color2)
-        if cache_key in self.color_cache:
-            return self.color_cache[cache_key]
-
-        # Calculate Euclidean distance
-        distance = np.sqrt(
-            (color1[0] - color2[0]) ** 2 +
-            (color1[1] - color2[1]) ** 2 +
-            (color1[2] - color2[2]) ** 2
-        )
-
-        # Normalize to 0-1 scale (255 * sqrt(3) is max distance)
-        max_distance = 255 * np.sqrt(3)
-        similarity = 1.0 - (distance / max_distance)
-
-        self.color_cache[cache_key] = similarity
-        return similarity
+    def _label_lut(self, labels: np.ndarray) -> np.ndarray:
+        """Get the lookup table voting for the given set color labels, cached per label subset."""
+        key = (labels.tobytes(), self.color_threshold)
+        lut = self._lut_cache.get(key)
+        if lut is None:
+            if len(self._lut_cache) >= 32:  # Subsets only shrink as bricks are found; stay bounded anyway
+                self._lut_cache.clear()
+            rows = self._set_rows[labels]
+            lut = self._lut_cache[key] = self._build_label_lut(
+                self._palette_lab[rows], self._palette_rgb[rows], self.color_threshold / 255.0
+            )
+        return lut
+
+    @staticmethod
+    def _build_label_lut(colors_lab: np.ndarray, colors_rgb: np.ndarray, min_similarity: float) -> np.ndarray:
+        """Map every 5-bit-per-channel BGR color to the index of the nearest LAB color.
+
+        Index layout is (B >> 3) << 10 | (G >> 3) << 5 | (R >> 3); each entry is
+        classified at its bin center. Entries whose RGB similarity to that color
+        (1 - distance / (255 * sqrt(3))) is not above min_similarity abstain with
+        _NO_VOTE.
+        """
+        levels = np.arange(32, dtype=np.uint8) * 8 + 4
+        b, g, r = np.meshgrid(levels, levels, levels, indexing='ij')
+        bgr = np.stack([b, g, r], axis=-1).reshape(-1, 1, 3)
+        lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB).reshape(-1, 3).astype(np.float32)
+        diff = lab[:, None, :] - colors_lab[None, :, :]
+        nearest = np.einsum('ijk,ijk->ij', diff, diff).argmin(axis=1)
+        distance = np.linalg.norm(bgr.reshape(-1, 3)[:, ::-1] - colors_rgb[nearest], axis=1)
+        similarity = 1.0 - distance / (255 * np.sqrt(3))
+        return np.where(similarity > min_similarity, nearest, _NO_VOTE).astype(np.uint8)
 
     def _get_brick_color_name(self, brick: Brick) -> str:
         """Get the color name for a brick (placeholder implementation)."""
         # In a real implementation, this would come from the brick data
         # For now, we'll use a simple mapping based on brick ID or name
-
-        brick_name_lower = brick.name.lower()
-
-        # Simple keyword matching
-        if 'black' in brick_name_lower:
-            return 'black'
-        elif 'white' in brick_name_lower:
-            return 'white'
-        elif 'red' in brick_name_lower:
-            return 'red'
-        elif 'blue' in brick_name_lower:
-            return 'blue'
-        elif 'green' in brick_name_lower:
-            return 'green'
-        elif 'yellow' in brick_name_lower:
-            return 'yellow'
-        elif 'orange' in brick_name_lower:
-            return 'orange'
-        elif 'gray' in brick_name_lower or 'grey' in brick_name_lower:
-            return 'gray'
-        else:
-            # Default to red for unknown colors
-            return 'red'
+        return _color_name_from_brick_name(brick.name)
 
     def get_available_colors(self) -> List[str]:
         """Get list of available Lego colors."""
         return list(self.LEGO_COLORS.keys())
 
     def visualize_color_match(self, frame: np.ndarray, match: ColorMatch,
-                            bbox: Tuple[int, int, int, int]) -> np.ndarray:
-        """Visualize a color match on a frame."""
+                            bbox: Tuple[int, int, int, int], inplace: bool = False) -> np.ndarray:
+        """Visualize a color match on a frame (drawn on a copy unless inplace is set).
+
+        Pass inplace=True with a canvas copied once per frame to overlay several matches.
+        """
         try:
-            result = frame.copy()
+            result = frame if inplace else frame.copy()
             x, y, w, h = bbox
 
             # Draw color swatch
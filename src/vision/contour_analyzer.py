@@ -4,11 +4,25 @@ Contour detection and shape analysis for Lego Brick Detection application.
 
 import cv2
 import numpy as np
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Dict
 from ..utils.logger import get_logger
 
 logger = get_logger("contour_analyzer")
 
+# Closing kernel for noisy edge maps, built once instead of on every frame
+_CLOSE_KERNEL = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+
+@dataclass(slots=True)
+class ContourBatch:
+    """Brick-like contours with their geometry stored as parallel arrays."""
+    contours: List[np.ndarray] = field(default_factory=list)
+    bboxes: np.ndarray = field(default_factory=lambda: np.empty((0, 4), dtype=np.int32))  # (N, 4) x, y, w, h
+    areas: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))  # (N,) contour areas
+
+    def __len__(self) -> int:
+        return len(self.contours)
+
 class ContourAnalyzer:
     """Analyzes image contours to find potential Lego brick shapes."""
 
@@ -19,25 +33,65 @@ class ContourAnalyzer:
         self.max_area = 100000
         self.approx_epsilon = 0.02  # For polygon approximation
         self.edge_threshold = 50
+        self.adaptive_edge_threshold = False  # Derive the Canny thresholds from each frame's mean brightness
+        self.max_candidates = 100  # Largest prefiltered contours given the full shape checks
+        self.max_results = 50  # Stop once this many brick-like contours are found
+        self.use_opencl = False  # Keep the edge pipeline in a UMat so OpenCV can run it through OpenCL
+        self.pyramid_levels = 0  # Halve the grayscale frame this many times before edge detection
+        self._buffers: List[Optional[np.ndarray]] = [None, None, None]  # gray, blurred, edges
+        self._overlay: Optional[np.ndarray] = None  # Canvas for draw_contours(reuse=True)
 
     def find_brick_contours(self, frame: np.ndarray) -> List[np.ndarray]:
         """Find contours that could be Lego bricks."""
+        return self.find_brick_contour_batch(frame).contours
+
+    def find_brick_contour_batch(self, frame: np.ndarray) -> ContourBatch:
+        """Find contours that could be Lego bricks, with their bounding boxes and areas."""
         try:
+            # With OpenCL the grayscale/blur/edge intermediates stay on the device and only the
+            # final edge map is downloaded for findContours. On the CPU the intermediates are
+            # written into buffers reused across frames.
+            opencl = self.use_opencl
+
             # Convert to grayscale
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            if opencl:
+                gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            else:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._get_buffer(0, frame.shape[:2]))
+
+            # Optionally detect on a smaller pyramid level; contours are scaled back below
+            height, width = frame.shape[:2]
+            for _ in range(self.pyramid_levels):
+                gray = cv2.pyrDown(gray)
+                height, width = (height + 1) // 2, (width + 1) // 2
+            blurred_buf = None if opencl else self._get_buffer(1, (height, width))
+            edges_buf = None if opencl else self._get_buffer(2, (height, width))
 
             # Apply Gaussian blur to reduce noise (smaller kernel for performance)
-            blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+            blurred = cv2.GaussianBlur(gray, (3, 3), 0, dst=blurred_buf)
 
             # Edge detection with optimized thresholds
-            edges = cv2.Canny(blurred, self.edge_threshold, self.edge_threshold * 2)
+            if self.adaptive_edge_threshold:
+                mean = cv2.mean(blurred)[0]
+                low, high = max(0, int(0.66 * mean)), min(255, int(1.33 * mean))
+            else:
+                low, high = self.edge_threshold, self.edge_threshold * 2
+            edges = cv2.Canny(blurred, low, high, edges=edges_buf)
+
+            # A brick-like contour is at least 50 px long, so it covers at least 50 / sqrt(2)
+            # edge pixels; frames with fewer (empty or featureless scenes) skip the rest
+            edge_count = cv2.countNonZero(edges)
+            if edge_count < (35 >> self.pyramid_levels):
+                return ContourBatch()
 
             # Skip morphological operations if not needed for performance
             # Only apply if edges are noisy
-            edge_density = np.count_nonzero(edges) / edges.size
+            edge_density = edge_count / (height * width)
             if edge_density > 0.1:  # If more than 10% edges, clean up
-                kernel = np.ones((2, 2), np.uint8)  # Smaller kernel for performance
-                edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+                edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, _CLOSE_KERNEL)
+
+            if isinstance(edges, cv2.UMat):
+                edges = edges.get()
 
             # Find contours with optimized parameters
             contours, hierarchy = cv2.findContours(
@@ -45,78 +99,84 @@ class ContourAnalyzer:
             )
 
             if not contours:
-                return []
-
-            # Performance optimization: sort contours by area (largest first)
-            # and limit processing to top candidates
-            contours = sorted(contours, key=cv2.contourArea, reverse=True)[:100]
+                return ContourBatch()
+
+            if self.pyramid_levels > 0:
+                scale = 1 << self.pyramid_levels
+                contours = [contour * scale for contour in contours]
+
+            # Measure every contour once and reject on area, aspect ratio and bbox solidity with array masks,
+            # so most noise contours never reach the per-contour checks below
+            areas = np.fromiter((cv2.contourArea(c) for c in contours), dtype=np.float64, count=len(contours))
+            rects = np.array([cv2.boundingRect(c) for c in contours], dtype=np.int32).reshape(-1, 4)
+            aspect_ratios = rects[:, 2] / np.maximum(rects[:, 3], 1)
+            solidities = areas / np.maximum(rects[:, 2] * rects[:, 3], 1)
+            candidates = np.flatnonzero(
+                (areas >= self.min_area) & (areas <= self.max_area) &
+                (aspect_ratios >= 0.3) & (aspect_ratios <= 5.0) &
+                (solidities >= 0.5)
+            )
 
-            # Filter contours based on brick-like properties
-            brick_contours = []
-            for contour in contours:
-                if self._is_brick_like(contour):
-                    brick_contours.append(contour)
-                    if len(brick_contours) >= 50:  # Limit results for performance
+            # Performance optimization: limit processing to the largest candidates,
+            # selected in linear time before sorting only those by area (largest first)
+            candidates = self._select_largest(candidates, areas[candidates], self.max_candidates)
+            candidates = candidates[np.argsort(-areas[candidates], kind='stable')]
+
+            # Perimeter and convexity checks as masks over the remaining candidates. The hull
+            # lies inside the bounding box, so convexity is never below solidity and hulls
+            # are only needed where solidity is low.
+            perimeters = np.fromiter((cv2.arcLength(contours[i], True) for i in candidates),
+                                     dtype=np.float64, count=len(candidates))
+            passed = perimeters >= 50
+            needs_hull = np.flatnonzero(passed & (solidities[candidates] < 0.8))
+            hull_areas = np.fromiter((cv2.contourArea(cv2.convexHull(contours[i])) for i in candidates[needs_hull]),
+                                     dtype=np.float64, count=len(needs_hull))
+            convexities = areas[candidates[needs_hull]] / np.where(hull_areas > 0, hull_areas, np.inf)
+            passed[needs_hull] = convexities >= 0.8
+
+            # Polygon approximation is the costliest check, so it only runs on the survivors
+            kept = []
+            epsilons = (self.approx_epsilon * perimeters[passed]).tolist()
+            for i, epsilon in zip(candidates[passed], epsilons):
+                approx = cv2.approxPolyDP(contours[i], epsilon, True)
+                if 4 <= len(approx) <= 12:
+                    kept.append(i)
+                    if len(kept) >= self.max_results:  # Limit results for performance
                         break
 
-            self.logger.debug(f"Found {len(brick_contours)} potential brick contours")
-            return brick_contours
+            self.logger.debug("Found %d potential brick contours", len(kept))
+            kept = np.asarray(kept, dtype=np.intp)
+            return ContourBatch(
+                contours=[contours[i] for i in kept],
+                bboxes=rects[kept],
+                areas=areas[kept]
+            )
 
         except Exception as e:
             self.logger.error(f"Error in contour detection: {e}")
-            return []
-
-    def _is_brick_like(self, contour: np.ndarray) -> bool:
-        """Check if a contour has brick-like properties."""
-        try:
-            # Basic area check
-            area = cv2.contourArea(contour)
-            if area < self.min_area or area > self.max_area:
-                return False
-
-            # Perimeter check
-            perimeter = cv2.arcLength(contour, True)
-            if perimeter < 50:  # Too small perimeter
-                return False
-
-            # Approximate the contour to a polygon
-            approx = cv2.approxPolyDP(contour, self.approx_epsilon * perimeter, True)
-            num_vertices = len(approx)
-
-            # Lego bricks typically have 4-8 vertices (rectangular with possible studs)
-            if not (4 <= num_vertices <= 12):
-                return False
-
-            # Check aspect ratio
-            x, y, w, h = cv2.boundingRect(contour)
-            aspect_ratio = float(w) / h if h > 0 else 0
-
-            # Bricks are usually rectangular (not too elongated)
-            if not (0.3 <= aspect_ratio <= 5.0):
-                return False
-
-            # Check solidity (ratio of contour area to bounding box area)
-            bounding_area = w * h
-            solidity = area / bounding_area if bounding_area > 0 else 0
-
-            # Bricks should fill their bounding box reasonably well
-            if solidity < 0.5:
-                return False
-
-            # Check convexity
-            hull = cv2.convexHull(contour)
-            hull_area = cv2.contourArea(hull)
-            convexity = area / hull_area if hull_area > 0 else 0
-
-            # Bricks are mostly convex
-            if convexity < 0.8:
-                return False
-
-            return True
-
-        except Exception as e:
-            self.logger.debug(f"Error checking contour properties: {e}")
-            return False
+            return ContourBatch()
+
+    def _get_buffer(self, slot: int, shape: Tuple[int, int]) -> np.ndarray:
+        """Get a reusable single-channel image buffer, reallocating it when the size changes."""
+        buffer = self._buffers[slot]
+        if buffer is None or buffer.shape != shape:
+            buffer = self._buffers[slot] = np.empty(shape, dtype=np.uint8)
+        return buffer
+
+    @staticmethod
+    def _select_largest(indices: np.ndarray, values: np.ndarray, k: int) -> np.ndarray:
+        """Keep the k indices with the largest values, in their original order (earlier wins ties)."""
+        if len(indices) <= k:
+            return indices
+        if k <= 0:
+            return indices[:0]
+        # k-th largest value via an O(n) partition; everything above it is kept,
+        # and ties at the threshold are filled in index order as a stable sort would
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        keep = values > kth
+        ties = np.flatnonzero(values == kth)[:k - np.count_nonzero(keep)]
+        keep[ties] = True
+        return indices[keep]
 
     def get_contour_properties(self, contour: np.ndarray) -> Dict:
         """Get detailed properties of a contour."""
@@ -150,10 +210,23 @@ class ContourAnalyzer:
             self.logger.error(f"Error getting contour properties: {e}")
             return {}
 
-    def draw_contours(self, frame: np.ndarray, contours: List[np.ndarray]) -> np.ndarray:
-        """Draw contours on a frame for debugging."""
+    def draw_contours(self, frame: np.ndarray, contours: List[np.ndarray],
+                      inplace: bool = False, reuse: bool = False) -> np.ndarray:
+        """Draw contours on a frame for debugging (on a fresh copy unless inplace is set).
+
+        With reuse set, the copy is a canvas shared with the next reuse call instead;
+        copy the result to keep it longer.
+        """
         try:
-            result = frame.copy()
+            if inplace:
+                result = frame
+            elif not reuse:
+                result = frame.copy()
+            else:
+                if self._overlay is None or self._overlay.shape != frame.shape or self._overlay.dtype != frame.dtype:
+                    self._overlay = np.empty_like(frame)
+                np.copyto(self._overlay, frame)
+                result = self._overlay
             cv2.drawContours(result, contours, -1, (0, 255, 0), 2)
 
             # Draw bounding boxes
@@ -1,16 +1,36 @@
 """YOLOv8 brick detection engine wrapper."""
 
+import importlib.util
 import os
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Optional, Tuple
 from numpy.typing import NDArray
 import numpy as np
-import torch
 from ..utils.logger import get_logger
 from .detection_state import DetectionState, DetectionStateManager
 
 logger = get_logger("detection_engine")
 
 
+def boxes_contain_points(boxes: NDArray, points: NDArray) -> NDArray[np.bool_]:
+    """Test many points against many boxes in one broadcast comparison.
+
+    Args:
+        boxes: (M, 4) array of (x1, y1, x2, y2) boxes
+        points: (K, 2) array of (x, y) points
+
+    Returns:
+        (M, K) boolean mask, True where point k lies inside box m
+        (left/top edges inclusive, right/bottom edges exclusive)
+    """
+    boxes = np.asarray(boxes).reshape(-1, 4)
+    points = np.asarray(points).reshape(-1, 2)
+    px, py = points[:, 0], points[:, 1]
+    return ((boxes[:, 0:1] <= px) & (px < boxes[:, 2:3]) &
+            (boxes[:, 1:2] <= py) & (py < boxes[:, 3:4]))
+
+
 class Detection:
     """Represents a single brick detection result."""
 
@@ -29,9 +49,75 @@ class Detection:
         self.class_name = class_name
         self.confidence = confidence
 
+    @cached_property
+    def center_point(self) -> Tuple[int, int]:
+        """Integer center of the bounding box, computed on first access."""
+        x1, y1, x2, y2 = self.bbox
+        return (int(x1 + x2) >> 1, int(y1 + y2) >> 1)
+
     def __repr__(self) -> str:
         return f"Detection({self.class_name}, conf={self.confidence:.2f})@{self.bbox}"
 
+    @staticmethod
+    def contains_points_batch(detections: List["Detection"], points: NDArray) -> NDArray[np.bool_]:
+        """Hit-test K points against M detections at once.
+
+        Args:
+            detections: Detections to test
+            points: (K, 2) array of (x, y) pixel coordinates
+
+        Returns:
+            (M, K) boolean mask, True where point k lies inside detection m's bbox
+        """
+        boxes = np.asarray([d.bbox for d in detections], dtype=np.float64)
+        return boxes_contain_points(boxes, points)
+
+
+@dataclass(slots=True)
+class DetectionBatch:
+    """Detections of one frame stored as parallel arrays.
+
+    Detection objects are only built when the batch is indexed or iterated,
+    so consumers that work on the arrays never allocate them.
+    """
+    bboxes: NDArray[np.float64] = field(default_factory=lambda: np.empty((0, 4), dtype=np.float64))  # (N, 4) x1, y1, x2, y2
+    confidences: NDArray[np.float64] = field(default_factory=lambda: np.empty(0, dtype=np.float64))  # (N,)
+    class_ids: NDArray[np.int64] = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # (N,)
+    class_names: List[str] = field(default_factory=list)
+    _detections: Optional[List[Detection]] = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.class_names)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def to_list(self) -> List[Detection]:
+        """Get the detections as Detection objects (built once, then shared)."""
+        if self._detections is None:
+            self._detections = [
+                Detection(bbox=tuple(bbox), class_id=class_id, class_name=class_name, confidence=confidence)
+                for bbox, class_id, class_name, confidence in zip(
+                    self.bboxes.tolist(), self.class_ids.tolist(), self.class_names, self.confidences.tolist()
+                )
+            ]
+        return self._detections
+
+
+def _backend_for_path(model_path: str) -> str:
+    """Name the runtime ultralytics uses for a model file."""
+    path = model_path.rstrip("/\\")
+    if path.endswith(".engine"):
+        return "tensorrt"
+    if path.endswith("_openvino_model"):
+        return "openvino"
+    if path.endswith(".onnx"):
+        return "onnx"
+    return "torch"
+
 
 class YOLOv8Engine:
     """YOLOv8 brick detection engine."""
@@ -46,13 +132,23 @@ class YOLOv8Engine:
         self.model = None
         self.confidence_threshold = confidence_threshold
         self.state_manager = DetectionStateManager()
-        self.last_detections: List[Detection] = []
+        self.last_batch = DetectionBatch()  # Results of the last inferred frame
         self.allowed_class_names: Optional[set[str]] = None  # If set, restrict detections to these names/tokens
+        self._allowed_ids: Optional[NDArray[np.bool_]] = None  # allowed_class_names resolved per class ID
+        self.precision = "fp32"  # Numeric precision of the loaded model, for logging
+        self.backend = "torch"  # Runtime of the loaded model: torch, tensorrt, openvino or onnx
         # Auto-select device: prefer CUDA if available
         if device:
             self.device = device
         else:
+            import torch  # Deferred: torch import is slow and only needed here
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.half = self.device == "cuda"  # FP16 inference runs on the GPU's Tensor Cores
+        self.imgsz = 640  # Long side of the network input
+        self.max_det = 100  # Most boxes kept by NMS per frame
+        self.compile_model = False  # Opt-in: run the network through torch.compile after loading
+        self.export_cpu_model = False  # Opt-in: run .pt models on the CPU from an OpenVINO/ONNX export
+        self._pinned = None  # Page-locked staging tensor for frame uploads (CUDA only)
         self._fallback_attempted = False  # Track CUDA→CPU fallback attempts
         logger.info(f"YOLOv8Engine initialized (threshold={confidence_threshold}, device={self.device})")
 
@@ -83,9 +179,27 @@ class YOLOv8Engine:
                 # Normalize to lowercase tokens for robust matching
                 self.allowed_class_names = {str(n).strip().lower() for n in names if str(n).strip()}
                 logger.info(f"Detection class filter enabled for {len(self.allowed_class_names)} names/tokens")
+            self._allowed_ids = self._build_allowed_ids()
         except Exception as e:
             logger.error(f"Failed to set allowed class names: {e}")
 
+    def _build_allowed_ids(self) -> Optional[NDArray[np.bool_]]:
+        """Resolve the class filter against the model's class names.
+
+        Returns:
+            Boolean mask indexed by class ID, True for classes whose lowercased name
+            equals or contains an allowed name/token; None if there is no filter or no model
+        """
+        if not self.allowed_class_names or self.model is None:
+            return None
+        names = self.model.names
+        allowed = np.zeros(max(names, default=-1) + 1, dtype=bool)
+        for class_id, class_name in names.items():
+            name_lower = class_name.lower()
+            allowed[class_id] = (name_lower in self.allowed_class_names or
+                                 any(token in name_lower for token in self.allowed_class_names))
+        return allowed
+
     def load_model(self, model_path: str) -> bool:
         """Load YOLOv8 model from file.
         
@@ -112,19 +226,39 @@ class YOLOv8Engine:
                 self.state_manager.set_state(DetectionState.ERROR, error_msg)
                 return False
 
-            logger.info(f"Loading YOLOv8 model from {model_path}")
+            if self.device == "cuda":
+                model_path = self._resolve_int8_engine(model_path, YOLO)
+            elif self.export_cpu_model:
+                model_path = self._resolve_cpu_export(model_path, YOLO)
+            self.backend = _backend_for_path(model_path)
+            if self.backend == "tensorrt":
+                self.precision = "int8"
+            else:
+                self.precision = "fp16" if self.half and self.backend == "torch" else "fp32"
+
+            logger.info(f"Loading YOLOv8 model from {model_path} ({self.backend}, {self.precision})")
             self.model = YOLO(model_path)
 
             # Force model to the preferred device (default CPU). This avoids CUDA NMS issues on systems
-            # without properly built torchvision ops.
-            try:
-                self.model.to(self.device)
-                logger.info(f"Model moved to device: {self.device}")
-            except Exception as move_err:
-                logger.warning(f"Could not move model to {self.device}: {move_err}. Falling back to CPU.")
-                self.model.to("cpu")
-                self.device = "cpu"
+            # without properly built torchvision ops. Exported backends (TensorRT engines, OpenVINO,
+            # ONNX) are not PyTorch modules and reject .to(); they only get the device through _predict.
+            if self.backend == "torch":
+                try:
+                    self.model.to(self.device)
+                    logger.info(f"Model moved to device: {self.device}")
+                except Exception as move_err:
+                    logger.warning(f"Could not move model to {self.device}: {move_err}. Falling back to CPU.")
+                    self.model.to("cpu")
+                    self.device = "cpu"
+                    self.half = False
+                    self.precision = "fp32"
+
+            if self.device == "cuda":
+                self._tune_cuda_backend()
+            if self.compile_model and self.backend == "torch":
+                self._compile_network()
 
+            self._allowed_ids = self._build_allowed_ids()
             self.state_manager.set_state(DetectionState.READY)
             logger.info("Model loaded successfully")
             return True
@@ -135,6 +269,124 @@ class YOLOv8Engine:
             self.state_manager.set_state(DetectionState.ERROR, error_msg)
             return False
 
+    def _tune_cuda_backend(self) -> None:
+        """Enable cuDNN autotuning, TF32 and channels-last weights for CUDA inference."""
+        import torch  # Deferred like in __init__
+
+        # Frames keep one size, so cuDNN can pick the fastest conv algorithms once
+        torch.backends.cudnn.benchmark = True
+        # Let the ops that stay in FP32 use TF32 Tensor Core math
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cudnn.allow_tf32 = True
+        enabled = ["cudnn.benchmark", "tf32"]
+
+        # Tensor Core convolutions expect NHWC; exported engines manage their own layout
+        if self.backend == "torch":
+            try:
+                self.model.model.to(memory_format=torch.channels_last)
+                enabled.append("channels_last")
+            except Exception as e:
+                logger.debug(f"Channels-last weights unavailable: {e}")
+        logger.info(f"CUDA optimizations enabled: {', '.join(enabled)}")
+
+    def _compile_network(self) -> None:
+        """Compile the network with torch.compile and warm it up, staying eager on failure."""
+        import torch  # Deferred like in __init__
+
+        warmup = np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8)
+        backend = original = None
+        try:
+            # The predictor builds its backend on the first call; compile the module that backend runs
+            self._predict(warmup)
+            backend = self.model.predictor.model
+            original = backend.model
+            mode = "reduce-overhead" if self.device == "cuda" else "default"
+            backend.model = torch.compile(original, mode=mode, dynamic=False)
+            # Pay the compilation cost now rather than on the first real frame
+            self._predict(warmup)
+            logger.info(f"Model compiled with torch.compile (mode={mode})")
+        except Exception as e:
+            if original is not None:
+                backend.model = original
+            logger.warning(f"torch.compile unavailable, running the model eagerly: {e}")
+
+    def _resolve_int8_engine(self, model_path: str, yolo_cls) -> str:
+        """Get the TensorRT INT8 engine to use in place of a .pt model, if one is available.
+
+        A sibling ``<name>_int8.engine`` is used as is. Otherwise, if a ``calibration.yaml``
+        dataset description sits next to the weights, the engine is exported once from
+        the .pt model (INT8 calibration over that dataset) and saved under that name.
+
+        Args:
+            model_path: Path to the .pt model file
+            yolo_cls: The ultralytics YOLO class
+
+        Returns:
+            Path of the INT8 engine, or model_path when no engine can be used
+        """
+        if not model_path.endswith(".pt"):
+            return model_path
+
+        engine_path = model_path[:-len(".pt")] + "_int8.engine"
+        if os.path.exists(engine_path):
+            return engine_path
+
+        calib_path = os.path.join(os.path.dirname(model_path), "calibration.yaml")
+        if not os.path.exists(calib_path):
+            return model_path
+
+        try:
+            logger.info(f"Exporting TensorRT INT8 engine (calibration data: {calib_path})")
+            exported = yolo_cls(model_path).export(
+                format="engine", int8=True, dynamic=False, batch=1,
+                imgsz=self.imgsz, data=calib_path, workspace=4
+            )
+            os.replace(exported, engine_path)
+            return engine_path
+        except Exception as e:
+            logger.warning(f"TensorRT INT8 export failed, using the PyTorch model: {e}")
+            return model_path
+
+    def _resolve_cpu_export(self, model_path: str, yolo_cls) -> str:
+        """Get an OpenVINO or ONNX export to use in place of a .pt model on the CPU, if possible.
+
+        Only used when export_cpu_model is set. An export cached next to the weights
+        (``<name>_openvino_model/`` or ``<name>.onnx``) is used as is. Otherwise one is
+        exported once, to OpenVINO if the openvino package is installed, else to ONNX if
+        onnxruntime is; the model directory must be writable. The export has a static
+        batch size of 1, so infer_batch runs one model call per frame on it.
+
+        Args:
+            model_path: Path to the .pt model file
+            yolo_cls: The ultralytics YOLO class
+
+        Returns:
+            Path of the export, or model_path when PyTorch has to run the model
+        """
+        if not model_path.endswith(".pt"):
+            return model_path
+
+        stem = model_path[:-len(".pt")]
+        for cached in (stem + "_openvino_model", stem + ".onnx"):
+            if os.path.exists(cached):
+                return cached
+
+        if importlib.util.find_spec("openvino") is not None:
+            export_format = "openvino"
+        elif importlib.util.find_spec("onnxruntime") is not None:
+            export_format = "onnx"
+        else:
+            return model_path
+
+        try:
+            logger.info(f"Exporting model to {export_format} for CPU inference")
+            return str(yolo_cls(model_path).export(
+                format=export_format, dynamic=False, batch=1, imgsz=self.imgsz, half=False
+            ))
+        except Exception as e:
+            logger.warning(f"{export_format} export failed, using the PyTorch model: {e}")
+            return model_path
+
     def infer(self, frame: NDArray[np.uint8]) -> List[Detection]:
         """Run inference on a frame.
         
@@ -144,49 +396,54 @@ class YOLOv8Engine:
         Returns:
             List of Detection objects
         """
+        return self.infer_soa(frame).to_list()
+
+    def infer_soa(self, frame: NDArray[np.uint8]) -> DetectionBatch:
+        """Run inference on a frame, keeping the results as arrays.
+        
+        Args:
+            frame: Input frame (BGR format)
+            
+        Returns:
+            DetectionBatch for the frame (empty if inference failed)
+        """
+        batch = self.infer_batch([frame])
+        return batch[0] if batch else DetectionBatch()
+
+    def infer_batch(self, frames: List[NDArray[np.uint8]]) -> List[DetectionBatch]:
+        """Run inference on several frames with a single model call.
+
+        Preprocessing, transfer to the device and NMS are batched, so the
+        per-call overhead is paid once for all frames.
+
+        Args:
+            frames: Input frames (BGR format)
+
+        Returns:
+            One DetectionBatch per frame, in input order
+            (empty if the model is not loaded or inference failed)
+        """
         if self.model is None:
             logger.warning("Model not loaded, skipping inference")
             return []
+        if not frames:
+            return []
 
         try:
-            # Run YOLOv8 inference
-            results = self.model(frame, verbose=False, device=self.device)
-            detections = []
-
-            for result in results:
-                if result.boxes is None:
-                    continue
-
-                for box in result.boxes:
-                    confidence = float(box.conf[0])
-                    
-                    # Filter by confidence threshold
-                    if confidence < self.confidence_threshold:
-                        continue
-
-                    # Extract bounding box coordinates
-                    x1, y1, x2, y2 = [float(v) for v in box.xyxy[0]]
-                    class_id = int(box.cls[0])
-                    
-                    # Get class name (use generic if not available)
-                    class_name = self.model.names.get(class_id, f"Class {class_id}")
-
-                    # Optional filtering by allowed class names/tokens
-                    if self.allowed_class_names:
-                        name_lower = class_name.lower()
-                        if (name_lower not in self.allowed_class_names) and not any(token in name_lower for token in self.allowed_class_names):
-                            continue
-                    
-                    detection = Detection(
-                        bbox=(x1, y1, x2, y2),
-                        class_id=class_id,
-                        class_name=class_name,
-                        confidence=confidence
-                    )
-                    detections.append(detection)
-
-            self.last_detections = detections
-            return detections
+            # Run YOLOv8 inference; exported models have a static batch size of 1
+            scale = 1.0
+            if self.backend != "torch":
+                results = [r for frame in frames for r in self._predict(frame)]
+            elif self.device == "cuda" and all(f.shape == frames[0].shape for f in frames):
+                # Letterbox on the GPU and feed the tensor directly, so the CPU only copies raw frames
+                tensor, scale = self._frames_to_device(frames)
+                results = self._predict(tensor)
+            else:
+                results = self._predict(list(frames))
+
+            batch = [self._parse_result(result, scale) for result in results]
+            self.last_batch = batch[-1]
+            return batch
 
         except Exception as e:
             err_msg = str(e)
@@ -196,8 +453,9 @@ class YOLOv8Engine:
                 try:
                     self.model.to("cpu")
                     self.device = "cpu"
+                    self.half = False
                     self._fallback_attempted = True
-                    return self.infer(frame)
+                    return self.infer_batch(frames)
                 except Exception as fallback_err:
                     logger.error(f"CPU fallback failed: {fallback_err}")
                     return []
@@ -205,13 +463,101 @@ class YOLOv8Engine:
             logger.error(f"Inference failed: {err_msg}")
             return []
 
+    def _predict(self, source):
+        """Call the model with the engine's prediction arguments.
+
+        device is passed on every call because ultralytics picks its own device
+        (CUDA when present) when setting up the predictor without it.
+        """
+        return self.model(source, verbose=False, device=self.device, half=self.half, max_det=self.max_det)
+
+    def _frames_to_device(self, frames: List[NDArray[np.uint8]]):
+        """Upload same-sized BGR frames and letterbox them into a normalized RGB batch on the GPU.
+
+        Frames are staged in a reused page-locked buffer and transferred with one
+        asynchronous copy; color swap, layout change, scaling and padding run on the device.
+
+        Args:
+            frames: Input frames (BGR format), all with the same shape
+
+        Returns:
+            Tuple of the (B, 3, H, W) float tensor in [0, 1] and the factor that
+            maps frame coordinates to tensor coordinates
+        """
+        import torch  # Deferred like in __init__
+        import torch.nn.functional as F
+
+        shape = (len(frames),) + frames[0].shape
+        if self._pinned is None or tuple(self._pinned.shape) != shape:
+            self._pinned = torch.empty(shape, dtype=torch.uint8, pin_memory=True)
+        for i, frame in enumerate(frames):
+            self._pinned[i].copy_(torch.from_numpy(frame))
+
+        batch = self._pinned.to(self.device, non_blocking=True)
+        batch = batch.permute(0, 3, 1, 2).flip(1)  # BHWC BGR -> BCHW RGB
+        batch = (batch.half() if self.half else batch.float()) / 255
+
+        # Same geometry as ultralytics' letterbox, but padded on the bottom/right only
+        # so that boxes map back to the frame with a single scale factor
+        height, width = shape[1:3]
+        scale = self.imgsz / max(height, width)
+        new_h, new_w = round(height * scale), round(width * scale)
+        if (new_h, new_w) != (height, width):
+            batch = F.interpolate(batch, size=(new_h, new_w), mode="bilinear", align_corners=False)
+        return F.pad(batch, (0, -new_w % 32, 0, -new_h % 32), value=114 / 255), scale
+
+    def _parse_result(self, result, scale: float = 1.0) -> DetectionBatch:
+        """Convert one ultralytics result into a filtered DetectionBatch.
+
+        Args:
+            result: ultralytics result for one frame
+            scale: Factor mapping frame coordinates to the result's coordinates
+        """
+        if result.boxes is None:
+            return DetectionBatch()
+
+        # One device-to-host copy per result, then filter by confidence threshold in bulk
+        boxes = result.boxes.cpu().numpy()
+        class_ids = boxes.cls.astype(np.int64)
+        mask = boxes.conf >= self.confidence_threshold
+
+        # Optional filtering by allowed class names/tokens, as one lookup per box
+        if self.allowed_class_names:
+            if self._allowed_ids is None:
+                self._allowed_ids = self._build_allowed_ids()
+            in_range = class_ids < len(self._allowed_ids)
+            mask &= in_range
+            mask[in_range] &= self._allowed_ids[class_ids[in_range]]
+
+        keep = np.flatnonzero(mask)
+        if keep.size == 0:
+            return DetectionBatch()
+        class_ids = class_ids[keep]
+
+        # Get class names (use generic if not available)
+        names = self.model.names
+        return DetectionBatch(
+            bboxes=boxes.xyxy[keep].astype(np.float64) / scale,
+            confidences=boxes.conf[keep].astype(np.float64),
+            class_ids=class_ids,
+            class_names=[names.get(class_id, f"Class {class_id}") for class_id in class_ids.tolist()]
+        )
+
     def get_detections(self) -> List[Detection]:
         """Get last inference results.
         
         Returns:
             List of Detection objects from last inference
         """
-        return self.last_detections.copy()
+        return list(self.last_batch)
+
+    def get_detections_soa(self) -> DetectionBatch:
+        """Get last inference results as parallel arrays.
+        
+        Returns:
+            DetectionBatch from last inference
+        """
+        return self.last_batch
 
     def unload_model(self) -> None:
         """Unload model and free memory."""
@@ -219,6 +565,7 @@ class YOLOv8Engine:
             if self.model is not None:
                 del self.model
                 self.model = None
+                self._pinned = None
                 self.state_manager.set_state(DetectionState.OFF)
                 logger.info("Model unloaded")
         except Exception as e:
@@ -44,8 +44,9 @@ class DetectionStateManager:
 
     def get_state(self) -> DetectionState:
         """Get current detection state (thread-safe)."""
-        with self._lock:
-            return self._state
+        # Polled every frame. _state is a single reference assignment, which is atomic,
+        # so reads need no lock; the lock only keeps state and error message paired.
+        return self._state
 
     def get_error_message(self) -> Optional[str]:
         """Get error message if state is ERROR (thread-safe)."""
@@ -54,16 +55,16 @@ class DetectionStateManager:
 
     def is_loading(self) -> bool:
         """Check if model is currently loading."""
-        return self.get_state() == DetectionState.LOADING
+        return self._state is DetectionState.LOADING
 
     def is_ready(self) -> bool:
         """Check if model is loaded and detection is available."""
-        return self.get_state() == DetectionState.READY
+        return self._state is DetectionState.READY
 
     def is_active(self) -> bool:
         """Check if detection is currently active."""
-        return self.get_state() == DetectionState.ACTIVE
+        return self._state is DetectionState.ACTIVE
 
     def is_error(self) -> bool:
         """Check if an error occurred."""
-        return self.get_state() == DetectionState.ERROR
+        return self._state is DetectionState.ERROR
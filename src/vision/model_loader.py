@@ -2,6 +2,7 @@
 
 from PyQt6.QtCore import QThread, pyqtSignal
 import time
+import numpy as np
 from .detection_engine import YOLOv8Engine
 from .detection_state import DetectionState
 from ..utils.logger import get_logger
@@ -41,6 +42,14 @@ class ModelLoaderThread(QThread):
             
             if success:
                 self.logger.info(f"Model loaded successfully in {elapsed_time:.2f}s")
+
+                # Run one inference here so kernel compilation and cuDNN autotuning
+                # happen off the UI thread instead of on the first detected frame
+                self.progress.emit("Warming up model...")
+                warmup_start = time.time()
+                self.engine.infer(np.zeros((480, 640, 3), dtype=np.uint8))  # Default capture resolution
+                self.logger.info(f"Model warm-up took {time.time() - warmup_start:.2f}s")
+
                 self.progress.emit(f"Model loaded ({elapsed_time:.1f}s)")
                 self.finished.emit(True)
             else:
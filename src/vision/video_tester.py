@@ -3,7 +3,10 @@ Video stream testing functionality for Lego Brick Detection application.
 """
 
 import cv2
+import queue
+import threading
 import time
+import numpy as np
 from typing import Dict, Optional, Tuple
 from ..models.video_source import VideoSource
 from ..vision.video_utils import VideoCaptureManager
@@ -11,14 +14,77 @@ from ..utils.logger import get_logger
 
 logger = get_logger("video_tester")
 
+# BT.601 luma weights in BGR order, as used by cv2.COLOR_BGR2GRAY
+_LUMA_WEIGHTS_BGR = np.array([0.114, 0.587, 0.299])
+
+class _CaptureThread(threading.Thread):
+    """Grabs frames into a small queue so analysis never delays the next grab.
+
+    Every frame is grabbed for timing, but only every sample_every-th one is decoded.
+    """
+
+    def __init__(self, manager: VideoCaptureManager, sample_every: int = 5, maxsize: int = 2):
+        super().__init__(daemon=True)
+        self.manager = manager
+        self.sample_every = sample_every
+        self.frames: "queue.Queue[Tuple[float, bool, Optional[np.ndarray]]]" = queue.Queue(maxsize=maxsize)
+        self.stop_event = threading.Event()
+
+    def run(self):
+        """Queue (grab timestamp, grabbed, decoded frame or None) until stopped or a grab fails."""
+        index = 0
+        while not self.stop_event.is_set():
+            grabbed = self.manager.grab_frame()
+            timestamp = time.time()
+            frame = None
+            if grabbed and index % self.sample_every == 0:
+                frame = self.manager.retrieve_frame()
+            index += 1
+            item = (timestamp, grabbed, frame)
+            # Blocking put gives back-pressure; the timeout lets a stop request through
+            while not self.stop_event.is_set():
+                try:
+                    self.frames.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if not grabbed:
+                return
+
+    def stop(self):
+        """Stop capturing and wait for the thread to exit."""
+        self.stop_event.set()
+        self.join()
+
+
 class VideoTester:
     """Tests video streams and provides quality metrics."""
 
+    # Seconds of capture before a running FPS estimate is trusted for early stopping
+    EARLY_STOP_AFTER = 0.5
+    # Seconds a quick_test result is reused before the device is probed again
+    ACCESS_CACHE_TTL = 5.0
+
     def __init__(self):
         self.logger = logger
+        self._accessible: Dict[int, Tuple[float, bool]] = {}  # (probe time, quick_test result) by device_id
+
+    def test_stream(self, video_source: VideoSource, test_duration: float = 5.0,
+                    score_to_beat: Optional[float] = None, require_mode: bool = False) -> Dict:
+        """
+        Test a video stream and return quality metrics.
+
+        Args:
+            video_source: Source to open
+            test_duration: Capture time in seconds
+            score_to_beat: When set, the test stops early once the stream cannot reach
+                an FPS x stability score above this value
+            require_mode: Fail right after opening if the driver reports a different
+                resolution, or a different frame rate when it reports one at all
 
-    def test_stream(self, video_source: VideoSource, test_duration: float = 5.0) -> Dict:
-        """Test a video stream and return quality metrics."""
+        Returns:
+            Dictionary of results; 'error' says why the test failed
+        """
         results = {
             'success': False,
             'error': None,
@@ -39,55 +105,88 @@ class VideoTester:
                 results['error'] = "Failed to open video stream"
                 return results
 
+            if require_mode:
+                # Many drivers report 0 FPS (or a fractional rate); only a reported rate is compared
+                width, height, fps = manager.get_mode()
+                if ((width, height) != (video_source.width, video_source.height)
+                        or (fps > 0 and round(fps) != video_source.fps)):
+                    manager.close()
+                    results['error'] = f"Device applied {width}x{height}@{fps:g}fps instead"
+                    return results
+
             self.logger.info(f"Testing stream: {video_source.get_display_name()} for {test_duration}s")
 
-            # Test parameters
-            frames = []
-            timestamps = []
+            # Test parameters; frames are measured as they arrive and not kept
+            first_shape = None
+            frame_count = 0
+            sample_count = 0
+            brightness_sum = 0.0
+            brightness_sq_sum = 0.0
+            first_timestamp = last_timestamp = None
             start_time = time.time()
 
-            # Capture frames for test duration
-            while time.time() - start_time < test_duration:
-                frame = manager.read_frame()
-                if frame is not None:
-                    frames.append(frame)
-                    timestamps.append(time.time())
-                else:
-                    self.logger.warning("Failed to capture frame during test")
-                    break
+            # Capture on a separate thread and analyze frames here as they arrive
+            capture = _CaptureThread(manager)
+            capture.start()
+            try:
+                while True:
+                    remaining = test_duration - (time.time() - start_time)
+                    if remaining <= 0:
+                        break
+                    try:
+                        timestamp, grabbed, frame = capture.frames.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if not grabbed:
+                        self.logger.warning("Failed to capture frame during test")
+                        break
 
-                # Small delay to prevent overwhelming
-                time.sleep(0.01)
+                    if first_timestamp is None:
+                        first_timestamp = timestamp
+                    last_timestamp = timestamp
+                    frame_count += 1
 
-            manager.close()
+                    # Stability is at most 100%, so the score can never exceed the FPS
+                    elapsed = timestamp - first_timestamp
+                    if (score_to_beat is not None and elapsed >= self.EARLY_STOP_AFTER
+                            and (frame_count - 1) / elapsed <= score_to_beat):
+                        self.logger.info(f"Stopping stream test early: {(frame_count - 1) / elapsed:.1f} FPS "
+                                         f"cannot beat score {score_to_beat:.1f}")
+                        break
+                    if frame is not None:
+                        # Brightness is sampled from the decoded frames only
+                        if first_shape is None:
+                            first_shape = frame.shape
+                        # The mean gray level is the luma-weighted sum of the channel means,
+                        # so no grayscale image is built; cv2.mean is a single SIMD pass
+                        brightness = float(np.dot(cv2.mean(frame)[:3], _LUMA_WEIGHTS_BGR))
+                        sample_count += 1
+                        brightness_sum += brightness
+                        brightness_sq_sum += brightness * brightness
+            finally:
+                capture.stop()
+                manager.close()
 
-            if not frames:
+            if sample_count == 0:
                 results['error'] = "No frames captured during test"
                 return results
 
             # Calculate metrics
             results['success'] = True
-            results['frames_captured'] = len(frames)
-            results['resolution'] = (frames[0].shape[1], frames[0].shape[0])  # width, height
+            results['frames_captured'] = frame_count
+            results['resolution'] = (first_shape[1], first_shape[0])  # width, height
 
-            # FPS calculation
-            if len(timestamps) > 1:
-                time_diffs = [timestamps[i] - timestamps[i-1] for i in range(1, len(timestamps))]
-                avg_frame_time = sum(time_diffs) / len(time_diffs)
+            # FPS calculation; the mean frame interval telescopes to (last - first) / (n - 1)
+            if frame_count > 1:
+                avg_frame_time = (last_timestamp - first_timestamp) / (frame_count - 1)
                 results['avg_fps'] = 1.0 / avg_frame_time if avg_frame_time > 0 else 0
 
             # Brightness analysis
-            brightness_values = []
-            for frame in frames:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                brightness = gray.mean()
-                brightness_values.append(brightness)
-
-            results['brightness'] = sum(brightness_values) / len(brightness_values)
+            results['brightness'] = brightness_sum / sample_count
 
             # Stability score (lower variance = more stable)
-            if len(brightness_values) > 1:
-                variance = sum((x - results['brightness']) ** 2 for x in brightness_values) / len(brightness_values)
+            if sample_count > 1:
+                variance = max(0.0, brightness_sq_sum / sample_count - results['brightness'] ** 2)
                 # Normalize to 0-100 scale (lower variance = higher score)
                 results['stability_score'] = max(0, 100 - (variance / 10))  # Arbitrary scaling
 
@@ -102,7 +201,22 @@ class VideoTester:
             return results
 
     def quick_test(self, device_id: int) -> bool:
-        """Quick test to check if a device is accessible."""
+        """Quick test to check if a device is accessible (cached per device for ACCESS_CACHE_TTL seconds)."""
+        now = time.monotonic()
+        cached = self._accessible.get(device_id)
+        if cached is None or now - cached[0] > self.ACCESS_CACHE_TTL:
+            cached = self._accessible[device_id] = (now, self._quick_test(device_id))
+        return cached[1]
+
+    def clear_access_cache(self, device_id: Optional[int] = None):
+        """Forget cached quick_test results, e.g. after a camera is plugged in or removed."""
+        if device_id is None:
+            self._accessible.clear()
+        else:
+            self._accessible.pop(device_id, None)
+
+    def _quick_test(self, device_id: int) -> bool:
+        """Open the device and try to read one frame."""
         try:
             manager = VideoCaptureManager()
             success = manager.open(device_id, 640, 480, 30)
@@ -132,7 +246,14 @@ class VideoTester:
         best_config = None
         best_score = 0
 
+        if not self.quick_test(video_source.device_id):
+            test_configs = []
+
         for width, height, fps in test_configs:
+            # Even a perfectly stable stream scores at most its frame rate
+            if fps <= best_score:
+                continue
+
             test_source = VideoSource(
                 device_id=video_source.device_id,
                 name=video_source.name,
@@ -142,7 +263,12 @@ class VideoTester:
                 fps=fps
             )
 
-            results = self.test_stream(test_source, test_duration=2.0)
+            # The first working mode is always measured in full; later probes stop early when
+            # they cannot win and are rejected when the driver falls back to another mode
+            probing = best_config is not None
+            results = self.test_stream(test_source, test_duration=2.0,
+                                       score_to_beat=best_score if probing else None,
+                                       require_mode=probing)
             if results['success']:
                 # Score based on FPS and stability
                 score = results['avg_fps'] * (results['stability_score'] / 100)
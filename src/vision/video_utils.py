@@ -2,13 +2,24 @@
 Video processing utilities for Lego Brick Detection application.
 """
 
+import platform
+from functools import lru_cache
 import cv2
 import numpy as np
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 from ..utils.logger import get_logger
 
+try:
+    from PyQt6.QtGui import QImage
+except ImportError:
+    QImage = None
+
 logger = get_logger("video_utils")
 
+# DirectShow opens cameras much faster than the default backend on Windows;
+# elsewhere let OpenCV pick (DirectShow does not exist there)
+CAPTURE_BACKEND = cv2.CAP_DSHOW if platform.system() == "Windows" else cv2.CAP_ANY
+
 class VideoCaptureManager:
     """Manages video capture from various sources."""
 
@@ -17,21 +28,22 @@ class VideoCaptureManager:
         self.is_opened = False
         self.logger = logger
 
-    def open(self, device_id: int, width: int = 640, height: int = 480, fps: int = 30) -> bool:
+    def open(self, device_id: int, width: int = 640, height: int = 480, fps: int = 30,
+             buffersize: int = 1) -> bool:
         """Open video capture device, forcing DirectShow backend on Windows for fast startup."""
-        import platform
         try:
             self.logger.info(f"Attempting to open video device {device_id} (width={width}, height={height}, fps={fps})...")
-            # Force DirectShow backend on Windows for fast startup
-            if platform.system() == "Windows":
-                self.capture = cv2.VideoCapture(device_id, cv2.CAP_DSHOW)
-            else:
-                self.capture = cv2.VideoCapture(device_id)
+            self.capture = cv2.VideoCapture(device_id, CAPTURE_BACKEND)
             self.logger.info(f"cv2.VideoCapture() call returned, checking isOpened...")
             if not self.capture.isOpened():
                 self.logger.error(f"Failed to open video device {device_id}")
                 return False
 
+            # A one-frame driver buffer keeps reads current instead of several frames stale;
+            # pass a larger buffersize for bursty capture
+            if not self.capture.set(cv2.CAP_PROP_BUFFERSIZE, buffersize):
+                self.logger.warning("Failed to reduce capture buffer size. Latency will be higher!")
+
             # Set properties
             self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
             self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
@@ -61,6 +73,37 @@ class VideoCaptureManager:
             self.logger.error(f"Error reading frame: {e}")
             return None
 
+    def grab_frame(self) -> bool:
+        """Grab the next frame without decoding it (used to drop frames)."""
+        if not self.is_opened or self.capture is None:
+            return False
+
+        try:
+            return self.capture.grab()
+        except Exception as e:
+            self.logger.error(f"Error grabbing frame: {e}")
+            return False
+
+    def retrieve_frame(self) -> Optional[np.ndarray]:
+        """Decode the frame taken by the last successful grab_frame()."""
+        if not self.is_opened or self.capture is None:
+            return None
+
+        try:
+            ret, frame = self.capture.retrieve()
+            return frame if ret else None
+        except Exception as e:
+            self.logger.error(f"Error retrieving frame: {e}")
+            return None
+
+    def get_mode(self) -> Tuple[int, int, float]:
+        """Get the (width, height, fps) the driver actually applied."""
+        if not self.is_opened or self.capture is None:
+            return (0, 0, 0.0)
+        return (int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                self.capture.get(cv2.CAP_PROP_FPS))
+
     def close(self):
         """Close video capture device."""
         if self.capture is not None:
@@ -70,25 +113,26 @@ class VideoCaptureManager:
         self.logger.info("Video capture closed")
 
     def isOpened(self) -> bool:
-        """Check if video capture is opened."""
-        return self.is_opened and self.capture is not None and self.capture.isOpened()
+        """Check if video capture is opened.
+
+        Uses the state kept by open()/close() rather than asking the driver; a device
+        that disappears shows up as read_frame() returning None.
+        """
+        return self.is_opened and self.capture is not None
 
-def convert_frame_to_qimage(frame: np.ndarray) -> 'QImage':
+def convert_frame_to_qimage(frame: np.ndarray) -> Optional['QImage']:
     """Convert OpenCV frame to PyQt QImage."""
     try:
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
         # Get dimensions
-        height, width, channel = rgb_frame.shape
-        bytes_per_line = 3 * width
+        height, width, channel = frame.shape
 
-        # Import here to avoid circular imports
-        from PyQt6.QtGui import QImage
-        from PyQt6.QtCore import Qt
+        # QImage wraps the buffer as is, so views (crops, strided slices) are packed first
+        if not frame.flags.c_contiguous:
+            frame = np.ascontiguousarray(frame)
+        bytes_per_line = channel * width
 
-        # Create QImage
-        qimage = QImage(rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
+        # Create QImage straight over the BGR pixels; no RGB copy is made
+        qimage = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_BGR888)
         return qimage
 
     except Exception as e:
@@ -96,27 +140,54 @@ def convert_frame_to_qimage(frame: np.ndarray) -> 'QImage':
         return None
 
 def resize_frame(frame: np.ndarray, width: int, height: int) -> np.ndarray:
-    """Resize frame to specified dimensions."""
+    """Resize frame to specified dimensions, area-averaging when shrinking."""
     try:
-        return cv2.resize(frame, (width, height))
+        frame_height, frame_width = frame.shape[:2]
+        if (frame_width, frame_height) == (width, height):
+            return frame
+        shrinking = width * height < frame_width * frame_height
+        return cv2.resize(frame, (width, height),
+                          interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
     except Exception as e:
         logger.error(f"Error resizing frame: {e}")
         return frame
 
+@lru_cache(maxsize=512)
+def text_size(label: str, font: int, font_scale: float, thickness: int = 1) -> Tuple[int, int]:
+    """Get the rendered (width, height) of a label, cached per label string."""
+    return cv2.getTextSize(label, font, font_scale, thickness)[0]
+
+@lru_cache(maxsize=64)
+def make_box_drawer(color: Tuple[int, int, int] = (0, 255, 0), font: int = cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale: float = 0.5, thickness: int = 2
+                    ) -> Callable[[np.ndarray, Tuple[int, int, int, int], str], np.ndarray]:
+    """
+    Build a box-drawing function with its color and font bound in.
+
+    Create one drawer per class outside the frame loop and call it per box. Unlike
+    draw_bounding_box, errors propagate to the caller. Drawers are cached per
+    argument combination.
+    """
+    text_color = (255, 255, 255)
+    rectangle, put_text, label_size = cv2.rectangle, cv2.putText, text_size
+
+    def draw(frame: np.ndarray, bbox: Tuple[int, int, int, int], label: str = "") -> np.ndarray:
+        x, y, w, h = bbox
+        rectangle(frame, (x, y), (x + w, y + h), color, thickness)
+        if label:
+            # Label background sized to the rendered text
+            text_w, text_h = label_size(label, font, font_scale)
+            rectangle(frame, (x, y - text_h - 10), (x + text_w + 4, y), color, -1)
+            put_text(frame, label, (x, y - 5), font, font_scale, text_color, 1)
+        return frame
+
+    return draw
+
 def draw_bounding_box(frame: np.ndarray, bbox: Tuple[int, int, int, int],
                      label: str = "", color: Tuple[int, int, int] = (0, 255, 0)) -> np.ndarray:
     """Draw bounding box on frame."""
     try:
-        x, y, w, h = bbox
-        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-
-        if label:
-            # Draw label background
-            cv2.rectangle(frame, (x, y - 25), (x + len(label) * 12, y), color, -1)
-            # Draw label text
-            cv2.putText(frame, label, (x, y - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-
-        return frame
+        return make_box_drawer(tuple(color))(frame, bbox, label)
     except Exception as e:
         logger.error(f"Error drawing bounding box: {e}")
-        return frame
\ No newline at end of file
+        return frame
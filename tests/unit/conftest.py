@@ -0,0 +1,15 @@
+"""
+Shared pytest fixtures for the unit tests.
+"""
+
+import sys
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Create the QApplication once for every test that builds Qt widgets."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    yield app
@@ -9,14 +9,16 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import pytest
 from PyQt6.QtWidgets import QApplication
 from src.models.brick import Brick
 from src.models.lego_set import LegoSet
 from src.gui.brick_list_widget import BrickListWidget
+from src.utils.progress_tracker import ProgressTracker
 
 
-# Create QApplication instance (required for Qt widgets)
-app = QApplication(sys.argv)
+# Qt widgets need a QApplication; the session fixture creates it on first use
+pytestmark = pytest.mark.usefixtures("qapp")
 
 
 def test_increment_counter_basic():
@@ -27,7 +29,7 @@ def test_increment_counter_basic():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -47,7 +49,7 @@ def test_increment_counter_max_limit():
         quantity=2,
         found_quantity=2  # Already at max
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -67,7 +69,7 @@ def test_decrement_counter_basic():
         quantity=5,
         found_quantity=3
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -87,7 +89,7 @@ def test_decrement_counter_min_limit():
         quantity=5,
         found_quantity=0  # Already at min
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -107,7 +109,7 @@ def test_counter_signal_emission():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -133,7 +135,7 @@ def test_get_current_progress():
         Brick(part_number="3004", color="Blue", quantity=10, found_quantity=7),
         Brick(part_number="3003", color="Green", quantity=3, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=3, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -153,7 +155,7 @@ def test_multiple_increments():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -174,7 +176,7 @@ def test_increment_decrement_sequence():
         quantity=5,
         found_quantity=2
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -198,7 +200,7 @@ def test_nonexistent_brick():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -224,8 +226,56 @@ def test_counter_with_empty_set():
     print("✓ test_counter_with_empty_set passed")
 
 
+def test_apply_detection_counts_batched():
+    """Test a batch of counter changes is clamped and reported by one signal."""
+    bricks = [
+        Brick(part_number="3005", color="Red", quantity=5, found_quantity=1),
+        Brick(part_number="3004", color="Blue", quantity=2, found_quantity=2),
+        Brick(part_number="3003", color="Green", quantity=3, found_quantity=1),
+    ]
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
+    
+    widget = BrickListWidget()
+    widget.load_set(lego_set)
+    
+    batches, singles = [], []
+    widget.brick_counters_changed.connect(batches.append)
+    widget.brick_counter_changed.connect(lambda pn, count: singles.append(pn))
+    
+    changes = widget.apply_detection_counts({"3005": 2, "3004": 1, "3003": -5, "9999": 1})
+    
+    assert changes == {"3005": 2, "3003": -1}, f"Unexpected changes {changes}"
+    assert batches == [changes], f"Expected one batch signal, got {batches}"
+    assert singles == [], f"Expected no per-brick signals, got {singles}"
+    assert widget.get_current_progress() == (5, 10)
+    print("✓ test_apply_detection_counts_batched passed")
+
+
+def test_batch_records_one_detected_find_per_unit():
+    """Test a batch signal connected to a ProgressTracker records each brick gained as one detected find."""
+    bricks = [
+        Brick(part_number="3005", color="Red", quantity=5, found_quantity=1),
+        Brick(part_number="3003", color="Green", quantity=3, found_quantity=1),
+    ]
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
+    
+    widget = BrickListWidget()
+    widget.load_set(lego_set)
+    tracker = ProgressTracker()
+    tracker.start_tracking(lego_set)
+    widget.brick_counters_changed.connect(tracker.record_count_changes)
+    
+    widget.apply_detection_counts({"3005": 2, "3003": -1})
+    
+    finds = [(brick_id, method) for _, brick_id, method in tracker.found_history]
+    assert finds == [("3005", "detected"), ("3005", "detected")], f"Unexpected finds {finds}"
+    assert tracker.get_progress_stats()['detected_finds'] == 2
+    print("✓ test_batch_records_one_detected_find_per_unit passed")
+
+
 if __name__ == "__main__":
     print("Running BrickListWidget counter logic tests...\n")
+    app = QApplication(sys.argv)
     
     test_increment_counter_basic()
     test_increment_counter_max_limit()
@@ -237,5 +287,7 @@ if __name__ == "__main__":
     test_increment_decrement_sequence()
     test_nonexistent_brick()
     test_counter_with_empty_set()
+    test_apply_detection_counts_batched()
+    test_batch_records_one_detected_find_per_unit()
     
     print("\n✅ All tests passed!")
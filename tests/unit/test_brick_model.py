@@ -109,3 +109,39 @@ class TestBrickModelExtensions:
         brick.original_list_position = 10
         
         assert brick.original_list_position == 10
+    
+    def test_dimensions_property(self):
+        """Test dimensions are exposed as a (width, length, height) tuple."""
+        brick = Brick(part_number="3001", color="Red", quantity=1,
+                      width_studs=2.0, length_studs=4.0, height_studs=1.0)
+        
+        assert brick.dimensions == (2.0, 4.0, 1.0)
+        assert not hasattr(brick, '__dict__')
+    
+    def test_invalid_quantities_rejected(self):
+        """Test validation rejects inconsistent quantities."""
+        with pytest.raises(ValueError, match="Quantity must be positive"):
+            Brick(part_number="3005", color="Red", quantity=0)
+        with pytest.raises(ValueError, match="cannot be negative"):
+            Brick(part_number="3005", color="Red", quantity=1, found_quantity=-1)
+        with pytest.raises(ValueError, match="cannot exceed"):
+            Brick(part_number="3005", color="Red", quantity=1, found_quantity=2)
+    
+    def test_strings_are_interned(self):
+        """Test equal part numbers and colors share one string object."""
+        first = Brick(part_number="".join(["30", "05"]), color="".join(["R", "ed"]), quantity=1)
+        second = Brick(part_number="".join(["300", "5"]), color="".join(["Re", "d"]), quantity=1)
+        
+        assert first.part_number is second.part_number
+        assert first.color is second.color
+    
+    def test_bricks_are_hashable_by_identity(self):
+        """Test bricks can be used in sets without merging same-part bricks of other colors."""
+        red = Brick(part_number="3005", color="Red", quantity=1)
+        blue = Brick(part_number="3005", color="Blue", quantity=1)
+        
+        detected = {red, blue, red}
+        red.found_quantity = 1
+        
+        assert len(detected) == 2
+        assert red in detected
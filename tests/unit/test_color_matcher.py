@@ -0,0 +1,106 @@
+"""
+Unit tests for ColorMatcher.
+"""
+
+import numpy as np
+import pytest
+from src.models.brick import Brick
+from src.models.lego_set import LegoSet
+from src.vision.color_matcher import ColorMatcher
+
+
+class TestColorMatcher:
+    """Test matching ROI colors against the loaded set."""
+    
+    @pytest.fixture
+    def lego_set(self):
+        """Create a set with a black, a white and a gray brick."""
+        return LegoSet(
+            name="Test Set",
+            set_number="12345",
+            bricks=[
+                Brick(part_number="3005", color="Black", quantity=1),
+                Brick(part_number="3001", color="White", quantity=1),
+                Brick(part_number="3004", color="Gray", quantity=1),
+            ],
+        )
+    
+    @pytest.fixture
+    def matcher(self, lego_set):
+        """Create a matcher loaded with the test set."""
+        matcher = ColorMatcher()
+        matcher.set_brick_colors(lego_set)
+        return matcher
+    
+    def test_matches_closest_brick(self, matcher):
+        """Test the brick whose color the ROI pixels are nearest to is returned."""
+        roi = np.full((10, 10, 3), 250, dtype=np.uint8)
+        
+        match = matcher.match_brick_color(roi)
+        
+        assert match.brick_id == "3001"
+        assert match.color_name == 'white'
+        assert match.rgb_values == (255, 255, 255)
+        assert match.confidence == 1.0
+    
+    def test_confidence_is_share_of_votes(self, matcher):
+        """Test confidence is the fraction of pixels voting for the winning color."""
+        roi = np.full((20, 20, 3), 250, dtype=np.uint8)
+        roi[:8, :] = (125, 125, 125)  # gray band, 40% of the ROI
+        
+        match = matcher.match_brick_color(roi)
+        
+        assert match.brick_id == "3001"
+        assert match.confidence == pytest.approx(0.6)
+    
+    def test_minimum_vote_share(self, matcher):
+        """Test a color shown by less than min_vote_share of the ROI is not matched."""
+        roi = np.full((20, 20, 3), 250, dtype=np.uint8)  # white, 40% of the ROI
+        roi[8:14, :] = 0  # black, 30%
+        roi[14:, :] = (125, 125, 125)  # gray, 30%
+        
+        assert matcher.match_brick_color(roi) is None
+        
+        matcher.min_vote_share = 0.3
+        match = matcher.match_brick_color(roi)
+        assert match.brick_id == "3001"
+        assert match.confidence == pytest.approx(0.4)
+    
+    def test_compares_bgr_roi_with_rgb_palette(self):
+        """Test a BGR red ROI matches the red brick rather than the blue one."""
+        lego_set = LegoSet(
+            name="Test Set",
+            set_number="12345",
+            bricks=[
+                Brick(part_number="3005", color="Blue", quantity=1),
+                Brick(part_number="3001", color="Red", quantity=1),
+            ],
+        )
+        matcher = ColorMatcher()
+        matcher.set_brick_colors(lego_set)
+        roi = np.zeros((10, 10, 3), dtype=np.uint8)
+        roi[:, :] = (0, 0, 220)  # BGR red
+        
+        assert matcher.match_brick_color(roi).brick_id == "3001"
+    
+    def test_skips_fully_found_bricks(self, matcher, lego_set):
+        """Test bricks already fully found are not matched."""
+        roi = np.full((20, 20, 3), 250, dtype=np.uint8)
+        roi[:8, :] = (125, 125, 125)
+        lego_set.mark_brick_found("3001")
+        
+        assert matcher.match_brick_color(roi).brick_id == "3004"
+        
+        lego_set.mark_brick_found("3004")
+        assert matcher.match_brick_color(roi) is None  # Only the black brick is left
+    
+    def test_no_set_or_tiny_roi(self, matcher):
+        """Test matching is skipped for tiny ROIs and without a set."""
+        assert matcher.match_brick_color(np.zeros((3, 3, 3), dtype=np.uint8)) is None
+        assert ColorMatcher().match_brick_color(np.zeros((10, 10, 3), dtype=np.uint8)) is None
+    
+    def test_color_name_keyword_priority(self, matcher):
+        """Test the first keyword in priority order wins, not the first in the name."""
+        assert matcher._get_brick_color_name(Brick(part_number="1", color="Red Black", quantity=1)) == 'black'
+        assert matcher._get_brick_color_name(Brick(part_number="1", color="Light Bluish Grey", quantity=1)) == 'gray'
+        assert matcher._get_brick_color_name(Brick(part_number="1", color="Tan", quantity=1)) == 'red'
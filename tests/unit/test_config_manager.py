@@ -0,0 +1,110 @@
+"""
+Unit tests for ConfigManager persistence.
+"""
+
+import json
+import os
+import pytest
+from src.models.video_source import VideoSource, VideoSourceType
+from src.utils.config_manager import ConfigManager
+
+
+class TestConfigManager:
+    """Test saving and loading configuration files."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Create a ConfigManager writing into a temporary directory."""
+        return ConfigManager(config_dir=str(tmp_path))
+    
+    def test_app_settings_round_trip(self, manager):
+        """Test settings saved to disk load back unchanged."""
+        assert manager.save_app_settings({'theme': 'dark', 'fps': 30})
+        
+        assert manager.load_app_settings() == {'theme': 'dark', 'fps': 30}
+    
+    def test_missing_app_settings_returns_empty(self, manager):
+        """Test loading without a settings file returns an empty dict."""
+        assert manager.load_app_settings() == {}
+    
+    def test_external_change_is_reloaded(self, manager):
+        """Test a file rewritten on disk is parsed again instead of served from cache."""
+        manager.save_app_settings({'theme': 'dark'})
+        assert manager.load_app_settings() == {'theme': 'dark'}
+        
+        path = manager.app_settings_file
+        path.write_text(json.dumps({'theme': 'light'}))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert manager.load_app_settings() == {'theme': 'light'}
+    
+    def test_loaded_settings_are_independent_copies(self, manager):
+        """Test mutating loaded settings, nested values included, does not affect later loads."""
+        manager.save_app_settings({'theme': 'dark', 'window': {'size': [800, 600]}})
+        
+        settings = manager.load_app_settings()
+        settings['theme'] = 'changed'
+        settings['window']['size'].append(1)
+        
+        assert manager.load_app_settings() == {'theme': 'dark', 'window': {'size': [800, 600]}}
+    
+    def test_failed_save_keeps_previous_file(self, manager):
+        """Test a save that cannot serialize leaves the existing settings intact."""
+        manager.save_app_settings({'theme': 'dark'})
+        
+        assert not manager.save_app_settings({'theme': object()})
+        
+        assert manager.load_app_settings() == {'theme': 'dark'}
+        assert not manager.app_settings_file.with_suffix('.json.tmp').exists()
+    
+    def test_video_source_round_trip(self, manager):
+        """Test the source type is stored as its value and restored as the enum."""
+        source = VideoSource(type=VideoSourceType.KINECT, device_id=1, resolution=(1280, 720), frame_rate=15)
+        
+        assert manager.save_video_source(source)
+        assert json.loads(manager.video_source_file.read_text())['type'] == 'kinect'
+        
+        loaded = manager.load_video_source()
+        assert loaded == source
+        assert loaded.type is VideoSourceType.KINECT
+    
+    def test_loaded_video_sources_do_not_share_calibration(self, manager):
+        """Test each load gets its own calibration data."""
+        manager.save_video_source(VideoSource(type=VideoSourceType.WEBCAM, device_id=0,
+                                              calibration_data={'offset': [1, 2]}))
+        
+        manager.load_video_source().calibration_data['offset'].append(3)
+        
+        assert manager.load_video_source().calibration_data == {'offset': [1, 2]}
+    
+    def test_video_source_dict_is_independent(self):
+        """Test the dict from to_dict does not share calibration data with the source."""
+        source = VideoSource(type=VideoSourceType.WEBCAM, device_id=0, calibration_data={'offset': [1, 2]})
+        
+        data = source.to_dict()
+        data['calibration_data']['offset'].append(3)
+        
+        assert data['type'] == 'webcam'
+        assert source.calibration_data == {'offset': [1, 2]}
+    
+    def test_config_info_reports_existing_files(self, manager):
+        """Test config info reflects which configuration files are on disk."""
+        assert not manager.get_config_info()['app_settings_exists']
+        
+        manager.save_app_settings({'theme': 'dark'})
+        info = manager.get_config_info()
+        
+        assert info['app_settings_exists']
+        assert not info['video_source_exists']
+        assert not info['detection_params_exists']
+        assert info['detection_params_path'].endswith('detection_params.json')
+    
+    def test_reset_all_configs(self, manager):
+        """Test reset removes saved files and tolerates missing ones."""
+        manager.save_app_settings({'theme': 'dark'})
+        
+        assert manager.reset_all_configs()
+        
+        assert not manager.app_settings_file.exists()
+        assert manager.load_app_settings() == {}
@@ -0,0 +1,124 @@
+"""
+Unit tests for ContourAnalyzer.
+"""
+
+import cv2
+import numpy as np
+from src.vision.contour_analyzer import ContourAnalyzer
+
+
+def make_frame() -> np.ndarray:
+    """Frame with two brick-sized rectangles, a thin bar and a speck of noise."""
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    cv2.rectangle(frame, (20, 20), (100, 60), (0, 0, 255), -1)     # 2x4-like brick
+    cv2.rectangle(frame, (150, 100), (190, 140), (255, 0, 0), -1)  # square brick
+    cv2.rectangle(frame, (20, 200), (300, 204), (0, 255, 0), -1)   # too elongated
+    cv2.rectangle(frame, (250, 20), (254, 24), (255, 255, 255), -1)  # too small
+    return frame
+
+
+class TestContourAnalyzer:
+    """Test brick contour detection."""
+    
+    def test_finds_only_brick_like_contours(self):
+        """Test rectangles of brick proportions are kept and outliers rejected."""
+        contours = ContourAnalyzer().find_brick_contours(make_frame())
+        
+        boxes = sorted(cv2.boundingRect(c) for c in contours)
+        assert len(boxes) == 2
+        assert boxes[0][:2] == (19, 19)  # Edges sit one pixel outside the fill
+        assert boxes[1][:2] == (149, 99)
+    
+    def test_largest_contours_first(self):
+        """Test contours are returned largest first."""
+        contours = ContourAnalyzer().find_brick_contours(make_frame())
+        
+        areas = [cv2.contourArea(c) for c in contours]
+        assert areas == sorted(areas, reverse=True)
+    
+    def test_blank_frame(self):
+        """Test a frame without edges yields no contours."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        
+        assert ContourAnalyzer().find_brick_contours(frame) == []
+    
+    def test_max_results_caps_output(self):
+        """Test the result cap keeps only the largest brick-like contours."""
+        analyzer = ContourAnalyzer()
+        analyzer.max_results = 1
+        
+        contours = analyzer.find_brick_contours(make_frame())
+        
+        assert len(contours) == 1
+        assert cv2.boundingRect(contours[0])[:2] == (19, 19)
+    
+    def test_batch_geometry_matches_contours(self):
+        """Test the batch arrays line up with the returned contours."""
+        batch = ContourAnalyzer().find_brick_contour_batch(make_frame())
+        
+        assert len(batch) == 2
+        assert batch.bboxes.shape == (2, 4)
+        for contour, bbox, area in zip(batch.contours, batch.bboxes, batch.areas):
+            assert tuple(bbox) == cv2.boundingRect(contour)
+            assert area == cv2.contourArea(contour)
+    
+    def test_blank_frame_batch(self):
+        """Test an empty batch still has correctly shaped arrays."""
+        batch = ContourAnalyzer().find_brick_contour_batch(np.zeros((120, 160, 3), dtype=np.uint8))
+        
+        assert len(batch) == 0
+        assert batch.bboxes.shape == (0, 4)
+    
+    def test_select_largest_matches_stable_sort(self):
+        """Test top-k selection keeps the same indices as a stable sort, ties included."""
+        values = np.array([5.0, 9.0, 5.0, 1.0, 9.0, 5.0, 7.0])
+        indices = np.arange(len(values))
+        
+        for k in range(len(values) + 2):
+            expected = sorted(indices[np.argsort(-values, kind='stable')][:k])
+            assert list(ContourAnalyzer._select_largest(indices, values, k)) == expected
+    
+    def test_opencl_path_matches_cpu(self):
+        """Test the UMat pipeline finds the same contours (it falls back to CPU without OpenCL)."""
+        analyzer = ContourAnalyzer()
+        expected = [c.tolist() for c in analyzer.find_brick_contours(make_frame())]
+        
+        analyzer.use_opencl = True
+        
+        assert [c.tolist() for c in analyzer.find_brick_contours(make_frame())] == expected
+    
+    def test_pyramid_level_in_frame_coordinates(self):
+        """Test detection on a downsampled level reports contours at full resolution."""
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (20, 20), (100, 60), (255, 255, 255), -1)
+        cv2.rectangle(frame, (150, 100), (190, 140), (255, 255, 255), -1)
+        analyzer = ContourAnalyzer()
+        analyzer.pyramid_levels = 1
+        
+        contours = analyzer.find_brick_contours(frame)
+        
+        boxes = sorted(cv2.boundingRect(c) for c in contours)
+        assert len(boxes) == 2
+        for box, expected in zip(boxes, [(19, 19, 83, 43), (149, 99, 43, 43)]):
+            assert np.allclose(box, expected, atol=2)
+    
+    def test_draw_contours_copy_or_inplace(self):
+        """Test drawing copies the frame by default, reuses a canvas on request and can draw in place."""
+        analyzer = ContourAnalyzer()
+        frame = make_frame()
+        contours = analyzer.find_brick_contours(frame)
+        original = frame.copy()
+        
+        result = analyzer.draw_contours(frame, contours)
+        assert result is not frame
+        assert np.array_equal(frame, original)
+        assert analyzer.draw_contours(frame, contours) is not result  # Fresh copy per call
+        
+        canvas = analyzer.draw_contours(frame, contours, reuse=True)
+        assert canvas is not frame
+        assert np.array_equal(canvas, result)
+        assert analyzer.draw_contours(frame, contours, reuse=True) is canvas  # Canvas is reused
+        
+        result = analyzer.draw_contours(frame, contours, inplace=True)
+        assert result is frame
+        assert not np.array_equal(frame, original)
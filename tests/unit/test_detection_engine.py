@@ -0,0 +1,191 @@
+"""
+Unit tests for Detection helpers and YOLOv8Engine result handling.
+"""
+
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from src.vision.detection_engine import Detection, DetectionBatch, DetectionState, YOLOv8Engine
+
+
+class _FakeBoxes:
+    """Minimal stand-in for ultralytics' Boxes, already holding NumPy columns."""
+
+    def __init__(self, rows):
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, 6)
+        self.xyxy, self.conf, self.cls = rows[:, :4], rows[:, 4], rows[:, 5]
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+
+class _FakeModel:
+    """Callable model returning one result per input frame, keyed by the frame's first pixel."""
+
+    names = {0: "3001 Brick 2 x 4", 1: "3005 Brick 1 x 1"}
+
+    def __init__(self, boxes_by_pixel):
+        self.boxes_by_pixel = boxes_by_pixel
+        self.calls = 0
+
+    def __call__(self, source, **kwargs):
+        self.calls += 1
+        frames = source if isinstance(source, list) else [source]
+        return [SimpleNamespace(boxes=_FakeBoxes(self.boxes_by_pixel[int(f[0, 0, 0])])) for f in frames]
+
+
+class _FakeExportedYOLO:
+    """Stand-in for a YOLO wrapping an exported model, which rejects .to() like ultralytics does."""
+
+    names = {0: "3001 Brick 2 x 4"}
+
+    def __init__(self, path):
+        self.path = path
+
+    def to(self, device):
+        raise TypeError(f"model='{self.path}' should be a *.pt PyTorch model to run this method")
+
+
+class _FakeTorchYOLO:
+    """Stand-in for a YOLO wrapping a .pt model, recording device moves."""
+
+    names = {0: "3001 Brick 2 x 4"}
+
+    def __init__(self, path):
+        self.path = path
+        self.devices = []
+
+    def to(self, device):
+        self.devices.append(device)
+        return self
+
+
+class TestDetection:
+    """Test batch hit-testing of detections."""
+    
+    def test_contains_points_batch(self):
+        """Test the mask has one row per detection and one column per point."""
+        detections = [
+            Detection(bbox=(0, 0, 10, 10), class_id=0, class_name="3001", confidence=0.9),
+            Detection(bbox=(5, 5, 20, 20), class_id=1, class_name="3005", confidence=0.8),
+        ]
+        points = np.array([[2, 2], [7, 7], [10, 10], [30, 30]])
+        
+        mask = Detection.contains_points_batch(detections, points)
+        
+        assert mask.tolist() == [
+            [True, True, False, False],
+            [False, True, True, False],
+        ]
+    
+    def test_center_point(self):
+        """Test the center point is the integer middle of the box."""
+        detection = Detection(bbox=(10.0, 20.0, 31.0, 40.0), class_id=0, class_name="3001", confidence=0.9)
+        
+        assert detection.center_point == (20, 30)
+
+
+class TestYOLOv8EngineInference:
+    """Test result parsing and batching with a fake model."""
+
+    @pytest.fixture
+    def engine(self):
+        """Create a CPU engine with a fake model answering per frame."""
+        engine = YOLOv8Engine(confidence_threshold=0.5, device="cpu")
+        engine.model = _FakeModel({
+            1: [[0, 0, 10, 10, 0.9, 0], [5, 5, 20, 20, 0.3, 1]],
+            2: [[1, 2, 3, 4, 0.8, 1]],
+            3: [],
+        })
+        return engine
+
+    @staticmethod
+    def _frame(value):
+        return np.full((8, 8, 3), value, dtype=np.uint8)
+
+    def test_infer_batch_single_call(self, engine):
+        """Test one model call yields one filtered detection list per frame, in order."""
+        batch = engine.infer_batch([self._frame(2), self._frame(1), self._frame(3)])
+
+        assert engine.model.calls == 1
+        assert [[d.class_name for d in dets] for dets in batch] == [
+            ["3005 Brick 1 x 1"], ["3001 Brick 2 x 4"], []
+        ]
+        assert batch[1][0].bbox == (0.0, 0.0, 10.0, 10.0)
+        assert batch[1][0].class_id == 0
+        assert engine.get_detections() == []
+
+    def test_infer_matches_batch(self, engine):
+        """Test single-frame inference returns that frame's detections."""
+        detections = engine.infer(self._frame(1))
+
+        assert [(d.class_id, round(d.confidence, 2)) for d in detections] == [(0, 0.9)]
+        assert engine.get_detections() == detections
+
+    def test_allowed_class_tokens(self, engine):
+        """Test the class filter accepts exact names and substring tokens."""
+        engine.set_allowed_class_names({"3005"})
+        assert engine.infer_batch([self._frame(1), self._frame(2)])[1][0].class_id == 1
+        assert engine.infer(self._frame(1)) == []
+
+    def test_class_filter_set_before_model(self, engine):
+        """Test a filter set before the model is loaded is resolved on first use."""
+        model = engine.model
+        engine.model = None
+        engine.set_allowed_class_names({"brick 2 x 4"})
+        engine.model = model
+
+        assert [d.class_id for d in engine.infer(self._frame(1))] == [0]
+        assert engine.infer(self._frame(2)) == []
+        assert engine._allowed_ids.tolist() == [True, False]
+
+    def test_infer_soa_arrays(self, engine):
+        """Test the array results line up and Detection objects are built once on demand."""
+        batch = engine.infer_soa(self._frame(2))
+
+        assert isinstance(batch, DetectionBatch)
+        assert batch.bboxes.tolist() == [[1.0, 2.0, 3.0, 4.0]]
+        assert batch.class_ids.tolist() == [1]
+        assert batch.class_names == ["3005 Brick 1 x 1"]
+        assert batch._detections is None
+        assert batch[0] is batch.to_list()[0]
+        assert engine.get_detections_soa() is batch
+
+
+class TestYOLOv8EngineLoad:
+    """Test model loading with a fake ultralytics package."""
+
+    def test_load_exported_model_skips_device_move(self, tmp_path, monkeypatch):
+        """Test an ONNX export loads without .to() and keeps the requested device."""
+        monkeypatch.setitem(sys.modules, "ultralytics", SimpleNamespace(YOLO=_FakeExportedYOLO))
+        model_path = tmp_path / "lego.onnx"
+        model_path.write_bytes(b"")
+        engine = YOLOv8Engine(confidence_threshold=0.5, device="cpu")
+
+        assert engine.load_model(str(model_path))
+        assert engine.get_state() == DetectionState.READY
+        assert engine.backend == "onnx"
+        assert engine.device == "cpu"
+        assert engine.model.path == str(model_path)
+
+    def test_cpu_export_is_opt_in(self, tmp_path, monkeypatch):
+        """Test a cached ONNX export next to the weights is only used once export_cpu_model is set."""
+        monkeypatch.setitem(sys.modules, "ultralytics", SimpleNamespace(YOLO=_FakeTorchYOLO))
+        model_path = tmp_path / "lego.pt"
+        model_path.write_bytes(b"")
+        (tmp_path / "lego.onnx").write_bytes(b"")
+        engine = YOLOv8Engine(confidence_threshold=0.5, device="cpu")
+
+        assert engine.load_model(str(model_path))
+        assert engine.backend == "torch"
+        assert engine.model.devices == ["cpu"]
+
+        engine.export_cpu_model = True
+        assert engine.load_model(str(model_path))
+        assert engine.backend == "onnx"
+        assert engine.model.devices == []
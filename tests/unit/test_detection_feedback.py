@@ -9,14 +9,22 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import pytest
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
 from src.models.brick import Brick
 from src.models.lego_set import LegoSet
 from src.gui.brick_list_widget import BrickListWidget
 
 
-# Create QApplication instance (required for Qt widgets)
-app = QApplication(sys.argv)
+# Qt widgets need a QApplication; the session fixture creates it on first use
+pytestmark = pytest.mark.usefixtures("qapp")
+
+
+def show_offscreen(widget):
+    """Show a widget for visibility checks without mapping a window on screen."""
+    widget.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+    widget.show()
 
 
 def test_detection_icon_shows_when_detected():
@@ -27,11 +35,11 @@ def test_detection_icon_shows_when_detected():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()  # Show widget to enable visibility checks
+    show_offscreen(widget)  # Show widget to enable visibility checks
     
     # Get the brick list item
     brick_item = widget._brick_items.get("3005")
@@ -57,11 +65,11 @@ def test_detection_icon_hides_when_not_detected():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     brick_item = widget._brick_items.get("3005")
     
@@ -82,11 +90,11 @@ def test_update_detection_status():
         Brick(part_number="3005", color="Red", quantity=5, found_quantity=0),
         Brick(part_number="3004", color="Blue", quantity=3, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=2, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Update detection status
     widget.update_detection_status({"3005"})
@@ -110,11 +118,11 @@ def test_list_reordering_detected_to_top():
         Brick(part_number="3004", color="Blue", quantity=3, found_quantity=0),
         Brick(part_number="3003", color="Green", quantity=2, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=3, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Detect middle brick (3004)
     widget.update_detection_status({"3004"})
@@ -135,11 +143,11 @@ def test_multiple_detections_reordering():
         Brick(part_number="3003", color="Green", quantity=2, found_quantity=0),
         Brick(part_number="3002", color="Yellow", quantity=1, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=4, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Detect first and third bricks
     widget.update_detection_status({"3005", "3003"})
@@ -164,11 +172,11 @@ def test_detection_cleared_restores_order():
         Brick(part_number="3004", color="Blue", quantity=3, found_quantity=0),
         Brick(part_number="3003", color="Green", quantity=2, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=3, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Detect then clear
     widget.update_detection_status({"3004"})
@@ -184,6 +192,40 @@ def test_detection_cleared_restores_order():
     print("[OK] test_detection_cleared_restores_order passed")
 
 
+def test_reordering_keeps_item_widgets():
+    """Test that reordering moves the existing rows instead of rebuilding them."""
+    bricks = [
+        Brick(part_number="3005", color="Red", quantity=5, found_quantity=0),
+        Brick(part_number="3004", color="Blue", quantity=3, found_quantity=0),
+        Brick(part_number="3003", color="Green", quantity=2, found_quantity=0),
+        Brick(part_number="3002", color="Yellow", quantity=1, found_quantity=0),
+    ]
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
+    
+    widget = BrickListWidget()
+    widget.load_set(lego_set)
+    show_offscreen(widget)
+    original_widgets = dict(widget._brick_items)
+    
+    def order():
+        return [widget.itemWidget(widget.item(row)).get_brick_id() for row in range(widget.count())]
+    
+    widget.update_detection_status({"3002", "3004"})
+    widget._apply_detection_updates()
+    assert order() == ["3004", "3002", "3005", "3003"], f"Unexpected order {order()}"
+    
+    widget.update_detection_status({"3002"})
+    widget._apply_detection_updates()
+    assert order() == ["3002", "3005", "3004", "3003"], f"Unexpected order {order()}"
+    assert not original_widgets["3004"]._is_detected, "3004 should no longer be detected"
+    
+    widget.update_detection_status(set())
+    widget._apply_detection_updates()
+    assert order() == ["3005", "3004", "3003", "3002"], f"Unexpected order {order()}"
+    assert widget._brick_items == original_widgets, "Item widgets should be reused"
+    print("[OK] test_reordering_keeps_item_widgets passed")
+
+
 def test_batched_updates_prevent_flicker():
     """Test that detection updates are batched via timer."""
     brick = Brick(
@@ -192,21 +234,23 @@ def test_batched_updates_prevent_flicker():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Update detection status (should be pending)
     widget.update_detection_status({"3005"})
     
     # Check that it's in pending state
     assert "3005" in widget._state.pending_detections, "Should be in pending detections"
+    assert "3005" not in widget._state.detected_bricks, "Should not be applied before the timer fires"
+    assert widget._update_timer.isActive(), "Batching timer should be armed"
     
-    # Note: In real usage, timer would trigger _apply_detection_updates()
-    # For testing, we manually call it
-    widget._apply_detection_updates()
+    # Fire the single-shot timer's timeout directly instead of waiting on the clock
+    widget._update_timer.stop()
+    widget._update_timer.timeout.emit()
     
     # Get fresh reference after reordering
     brick_item = widget._brick_items.get("3005")
@@ -222,11 +266,11 @@ def test_detection_state_persistence():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Set detection and apply
     widget.update_detection_status({"3005"})
@@ -252,11 +296,11 @@ def test_detection_with_manual_marking():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     brick_item = widget._brick_items.get("3005")
     
@@ -285,11 +329,11 @@ def test_empty_detection_set():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
-    widget.show()
+    show_offscreen(widget)
     
     # Update with empty set (should not crash)
     widget.update_detection_status(set())
@@ -302,6 +346,7 @@ def test_empty_detection_set():
 
 if __name__ == "__main__":
     print("Running detection feedback tests...\n")
+    app = QApplication(sys.argv)
     
     test_detection_icon_shows_when_detected()
     test_detection_icon_hides_when_not_detected()
@@ -309,6 +354,7 @@ if __name__ == "__main__":
     test_list_reordering_detected_to_top()
     test_multiple_detections_reordering()
     test_detection_cleared_restores_order()
+    test_reordering_keeps_item_widgets()
     test_batched_updates_prevent_flicker()
     test_detection_state_persistence()
     test_detection_with_manual_marking()
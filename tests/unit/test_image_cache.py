@@ -7,6 +7,9 @@ from pathlib import Path
 from PyQt6.QtGui import QPixmap
 from src.utils.image_cache import ImageCache
 
+# QPixmap needs a QApplication; the session fixture creates it on first use
+pytestmark = pytest.mark.usefixtures("qapp")
+
 
 class TestImageCache:
     """Test image caching functionality."""
@@ -127,3 +130,54 @@ class TestImageCache:
         assert cache.get_cache_size() == 2
         # Placeholders are also cached but in separate dict
         assert len(cache._placeholder_cache) == 2
+    
+    def test_loads_image_from_directory(self, cache, temp_image_dir):
+        """Test an existing image is loaded and scaled instead of a placeholder."""
+        from PIL import Image
+        Image.new("RGB", (96, 48), (255, 0, 0)).save(temp_image_dir / "3005.png")
+        Image.new("RGB", (10, 10), (0, 0, 255)).save(temp_image_dir / "3005.jpg")
+        
+        pixmap = cache.get_image("3005")
+        
+        assert (pixmap.width(), pixmap.height()) == (48, 24)  # .png preferred over .jpg
+        assert "3005" not in cache._placeholder_cache
+    
+    def test_missing_image_directory(self, tmp_path):
+        """Test a missing image directory falls back to placeholders."""
+        cache = ImageCache(tmp_path / "missing", max_size=10, image_size=(48, 48))
+        
+        assert not cache.get_image("3005").isNull()
+        assert "3005" in cache._placeholder_cache
+    
+    def test_placeholder_cache_is_bounded(self, cache):
+        """Test placeholder cache evicts least recently used entries beyond twice max_size."""
+        for i in range(25):
+            cache.get_image(f"part_{i}")
+        
+        assert len(cache._placeholder_cache) == 20
+        assert "part_0" not in cache._placeholder_cache
+        assert "part_24" in cache._placeholder_cache
+    
+    def test_placeholder_text_does_not_alter_shared_background(self, cache):
+        """Test placeholders sharing a hue reuse one background tile left unpainted."""
+        cache.get_image("3005")
+        background = next(iter(cache._background_cache.values()))
+        
+        image = background.toImage()
+        
+        assert len({image.pixel(x, y) for x in range(48) for y in range(48)}) == 1
+    
+    def test_preload_images_async(self, cache, qapp):
+        """Test placeholders drawn on the thread pool match the synchronous ones."""
+        from PyQt6.QtCore import QThreadPool
+        
+        cache.preload_images_async(["3005", "3001", "3005"])
+        QThreadPool.globalInstance().waitForDone()
+        qapp.processEvents()
+        
+        assert set(cache._placeholder_cache) == {"3005", "3001"}
+        assert len(cache._cache) == 0
+        async_image = cache._placeholder_cache["3005"].toImage()
+        cache.clear_cache()
+        sync_image = cache.get_image("3005").toImage()
+        assert async_image.convertToFormat(sync_image.format()) == sync_image
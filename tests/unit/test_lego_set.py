@@ -0,0 +1,171 @@
+"""
+Unit tests for LegoSet model.
+"""
+
+import pytest
+from src.models.brick import Brick
+from src.models.lego_set import LegoSet
+
+
+def make_set(*bricks: Brick) -> LegoSet:
+    """Build a LegoSet around the given bricks."""
+    return LegoSet(name="Test Set", set_number="12345", bricks=list(bricks))
+
+
+class TestLegoSet:
+    """Test LegoSet lookups and detection bookkeeping."""
+    
+    def test_get_brick_by_part_number(self):
+        """Test lookup returns the first brick with a part number."""
+        red = Brick(part_number="3005", color="Red", quantity=2)
+        blue = Brick(part_number="3005", color="Blue", quantity=1)
+        lego_set = make_set(red, blue, Brick(part_number="3001", color="Red", quantity=1))
+        
+        assert lego_set.get_brick_by_part_number("3005") is red
+        assert lego_set.get_brick_by_part_number("9999") is None
+    
+    def test_mark_and_unmark_brick_found(self):
+        """Test marking uses the part number index and respects quantity."""
+        brick = Brick(part_number="3005", color="Red", quantity=1)
+        lego_set = make_set(brick)
+        
+        assert lego_set.mark_brick_found("3005") is True
+        assert lego_set.mark_brick_found("3005") is False
+        assert brick.found_quantity == 1
+        assert lego_set.unmark_brick_found("3005") is True
+        assert brick.found_quantity == 0
+    
+    def test_update_detection_status(self):
+        """Test detection flags are set and cleared across updates."""
+        red = Brick(part_number="3005", color="Red", quantity=2)
+        blue = Brick(part_number="3005", color="Blue", quantity=1)
+        other = Brick(part_number="3001", color="Red", quantity=1)
+        lego_set = make_set(red, blue, other)
+        
+        lego_set.update_detection_status({"3005", "unknown"}, 10.0)
+        assert red.detected_in_current_frame and blue.detected_in_current_frame
+        assert not other.detected_in_current_frame
+        assert red.last_detected_timestamp == 10.0
+        
+        lego_set.update_detection_status({"3001"}, 11.0)
+        assert not red.detected_in_current_frame and not blue.detected_in_current_frame
+        assert other.detected_in_current_frame
+    
+    def test_total_bricks_counts_brick_types(self):
+        """Test total_bricks is derived from the brick list."""
+        lego_set = make_set(Brick(part_number="3005", color="Red", quantity=3),
+                            Brick(part_number="3001", color="Red", quantity=1))
+        
+        assert lego_set.total_bricks == 2
+    
+    def test_cached_status_tracks_mutations(self):
+        """Test found count, completion and detectable list follow LegoSet mutators."""
+        first = Brick(part_number="3005", color="Red", quantity=1)
+        second = Brick(part_number="3001", color="Red", quantity=2, found_quantity=1)
+        lego_set = make_set(first, second)
+        
+        assert lego_set.get_found_bricks_count() == 1
+        assert lego_set.get_detectable_bricks() == [first, second]
+        
+        lego_set.mark_brick_found("3005")
+        assert lego_set.get_found_bricks_count() == 2
+        assert lego_set.get_detectable_bricks() == [second]
+        assert not lego_set.is_complete()
+        
+        lego_set.set_manually_marked("3001", True)
+        assert lego_set.get_detectable_bricks() == []
+        
+        lego_set.mark_brick_found("3001")
+        assert lego_set.is_complete()
+        
+        lego_set.unmark_brick_found("3005")
+        assert not lego_set.is_complete()
+        assert lego_set.get_found_bricks_count() == 2
+    
+    def test_direct_brick_changes_update_status(self):
+        """Test assigning brick fields directly keeps the cached status in sync."""
+        brick = Brick(part_number="3005", color="Red", quantity=2)
+        lego_set = make_set(brick)
+        assert lego_set.get_detectable_bricks() == [brick]
+        
+        brick.found_quantity = 2
+        
+        assert lego_set.get_found_bricks_count() == 2
+        assert lego_set.is_complete()
+        assert lego_set.get_detectable_bricks() == []
+        assert lego_set.fully_found_mask().tolist() == [True]
+        
+        brick.quantity = 3
+        assert not lego_set.is_complete()
+        assert lego_set.get_detectable_bricks() == [brick]
+        
+        brick.manually_marked = True
+        assert lego_set.get_manually_marked_part_numbers() == {"3005"}
+        assert lego_set.get_detectable_bricks() == []
+    
+    def test_status_accessors_return_copies(self):
+        """Test changing returned collections does not affect the set's cached status."""
+        brick = Brick(part_number="3005", color="Red", quantity=1)
+        lego_set = make_set(brick)
+        lego_set.set_manually_marked("3005", True)
+        
+        lego_set.get_detectable_bricks().append(brick)
+        
+        assert lego_set.get_detectable_bricks() == []
+        assert isinstance(lego_set.get_manually_marked_part_numbers(), frozenset)
+    
+    def test_bricks_by_detection_status(self):
+        """Test bricks are grouped into every status bucket they belong to."""
+        detected = Brick(part_number="3005", color="Red", quantity=1, found_quantity=1)
+        detected.set_detected(1.0)
+        marked = Brick(part_number="3001", color="Blue", quantity=2)
+        marked.mark_as_manually_found()
+        lego_set = make_set(detected, marked)
+        
+        groups = lego_set.get_bricks_by_detection_status()
+        
+        assert groups == {
+            'detected': [detected],
+            'not_detected': [marked],
+            'manually_marked': [marked],
+            'completed': [detected],
+        }
+        assert lego_set.get_bricks_by_detection_status(which={'completed'}) == {'completed': [detected]}
+    
+    def test_manually_marked_part_numbers(self):
+        """Test the marked part numbers follow set_manually_marked across duplicate parts."""
+        red = Brick(part_number="3005", color="Red", quantity=1)
+        blue = Brick(part_number="3005", color="Blue", quantity=1)
+        lego_set = make_set(red, blue)
+        
+        lego_set.set_manually_marked("3005", True)
+        assert lego_set.get_manually_marked_part_numbers() == {"3005"}
+        
+        blue.mark_as_manually_found()
+        lego_set.set_manually_marked("3005", False)
+        assert lego_set.get_manually_marked_part_numbers() == {"3005"}
+        
+        blue.unmark_manually_found()
+        assert lego_set.get_manually_marked_part_numbers() == set()
+    
+    def test_batch_quantity_reducers(self):
+        """Test remaining quantities and the fully-found mask cover every brick in order."""
+        lego_set = make_set(Brick(part_number="3005", color="Red", quantity=3, found_quantity=1),
+                            Brick(part_number="3001", color="Red", quantity=2, found_quantity=2))
+        
+        assert lego_set.remaining_quantities().tolist() == [2, 0]
+        assert lego_set.fully_found_mask().tolist() == [False, True]
+    
+    def test_fully_found_mask_follows_mutators(self):
+        """Test the cached fully-found mask is refreshed when a brick completes or reopens."""
+        lego_set = make_set(Brick(part_number="3005", color="Red", quantity=1),
+                            Brick(part_number="3001", color="Red", quantity=2))
+        
+        assert lego_set.fully_found_mask().tolist() == [False, False]
+        lego_set.mark_brick_found("3001")
+        assert lego_set.fully_found_mask().tolist() == [False, False]
+        lego_set.mark_brick_found("3001")
+        assert lego_set.fully_found_mask().tolist() == [False, True]
+        lego_set.unmark_brick_found("3001")
+        assert lego_set.fully_found_mask().tolist() == [False, False]
+        assert not lego_set.fully_found_mask().flags.writeable
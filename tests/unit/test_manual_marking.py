@@ -9,14 +9,15 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+import pytest
 from PyQt6.QtWidgets import QApplication
 from src.models.brick import Brick
 from src.models.lego_set import LegoSet
 from src.gui.brick_list_widget import BrickListWidget
 
 
-# Create QApplication instance (required for Qt widgets)
-app = QApplication(sys.argv)
+# Qt widgets need a QApplication; the session fixture creates it on first use
+pytestmark = pytest.mark.usefixtures("qapp")
 
 
 def test_checkbox_marks_brick():
@@ -27,7 +28,7 @@ def test_checkbox_marks_brick():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -55,7 +56,7 @@ def test_checkbox_unmarks_brick():
     # Mark as manually found initially
     brick.mark_as_manually_found()
     
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -82,7 +83,7 @@ def test_manual_marking_signal_emission():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -110,7 +111,7 @@ def test_set_manual_marking_programmatically():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -126,6 +127,31 @@ def test_set_manual_marking_programmatically():
     print("✓ test_set_manual_marking_programmatically passed")
 
 
+def test_set_manual_marking_does_not_emit():
+    """Test programmatic marking only updates the display, without signalling a user change."""
+    brick = Brick(
+        part_number="3005",
+        color="Red",
+        quantity=5,
+        found_quantity=0
+    )
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
+    
+    widget = BrickListWidget()
+    widget.load_set(lego_set)
+    
+    brick_item = widget._brick_items.get("3005")
+    signal_received = []
+    brick_item.manually_marked_changed.connect(signal_received.append)
+    
+    brick_item.set_manual_marking(True)
+    
+    assert brick_item.manual_checkbox.isChecked() == True, "Checkbox should be checked"
+    assert signal_received == [], f"Expected no signal, got {signal_received}"
+    assert brick.manually_marked == False, "Programmatic marking should not write the model"
+    print("✓ test_set_manual_marking_does_not_emit passed")
+
+
 def test_manual_marking_visual_style():
     """Test that manually marked bricks have distinct styling."""
     brick = Brick(
@@ -134,7 +160,7 @@ def test_manual_marking_visual_style():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -159,7 +185,7 @@ def test_manual_marking_with_counter():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -186,7 +212,7 @@ def test_unmarking_restores_normal_style():
         quantity=5,
         found_quantity=0
     )
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=1, bricks=[brick])
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=[brick])
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -211,7 +237,7 @@ def test_multiple_bricks_manual_marking():
         Brick(part_number="3004", color="Blue", quantity=3, found_quantity=0),
         Brick(part_number="3003", color="Green", quantity=2, found_quantity=0),
     ]
-    lego_set = LegoSet(name="Test Set", set_number="12345", total_bricks=3, bricks=bricks)
+    lego_set = LegoSet(name="Test Set", set_number="12345", bricks=bricks)
     
     widget = BrickListWidget()
     widget.load_set(lego_set)
@@ -229,11 +255,13 @@ def test_multiple_bricks_manual_marking():
 
 if __name__ == "__main__":
     print("Running manual marking tests...\n")
+    app = QApplication(sys.argv)
     
     test_checkbox_marks_brick()
     test_checkbox_unmarks_brick()
     test_manual_marking_signal_emission()
     test_set_manual_marking_programmatically()
+    test_set_manual_marking_does_not_emit()
     test_manual_marking_visual_style()
     test_manual_marking_with_counter()
     test_unmarking_restores_normal_style()
@@ -0,0 +1,92 @@
+"""
+Unit tests for ProgressTracker.
+"""
+
+import time
+import pytest
+from src.models.brick import Brick
+from src.models.lego_set import LegoSet
+from src.utils.progress_tracker import ProgressTracker
+
+
+class TestProgressTracker:
+    """Test ProgressTracker statistics."""
+    
+    @pytest.fixture
+    def tracker(self):
+        """Create a tracker following a small two-brick set."""
+        lego_set = LegoSet(
+            name="Test Set",
+            set_number="12345",
+            bricks=[
+                Brick(part_number="3005", color="Red", quantity=2),
+                Brick(part_number="3001", color="Blue", quantity=1),
+            ],
+        )
+        tracker = ProgressTracker()
+        tracker.start_tracking(lego_set)
+        return tracker
+    
+    def test_method_counts(self, tracker):
+        """Test manual and detected finds are counted separately."""
+        tracker.record_brick_found("3005", method="manual")
+        tracker.record_brick_found("3005", method="detected")
+        tracker.record_brick_found("3001", method="detected")
+        
+        stats = tracker.get_progress_stats()
+        assert stats['manual_finds'] == 1
+        assert stats['detected_finds'] == 2
+    
+    def test_restart_resets_counts(self, tracker):
+        """Test starting a new session clears the previous counts."""
+        tracker.record_brick_found("3005", method="manual")
+        tracker.start_tracking(tracker.current_set)
+        
+        stats = tracker.get_progress_stats()
+        assert stats['manual_finds'] == 0
+        assert stats['detected_finds'] == 0
+    
+    def test_bricks_found_in_last_24h(self, tracker):
+        """Test only finds newer than a day are counted."""
+        now = time.time()
+        tracker.found_history.extend([
+            (now - 48 * 3600, "3005", 'manual'),
+            (now - 25 * 3600, "3001", 'detected'),
+            (now - 3600, "3005", 'detected'),
+            (now, "3001", 'manual'),
+        ])
+        
+        assert tracker._get_bricks_found_in_last_24h() == 2
+    
+    def test_progress_log_replayed_for_same_set(self, tracker, tmp_path):
+        """Test finds written to the progress log are restored on restart."""
+        lego_set = tracker.current_set
+        log_path = tmp_path / 'progress.log'
+        
+        first = ProgressTracker(log_path=log_path)
+        first.start_tracking(lego_set)
+        first.record_brick_found("3005", method="manual")
+        first.record_brick_found("3001", method="detected")
+        first.stop_tracking()
+        
+        second = ProgressTracker(log_path=log_path)
+        second.start_tracking(lego_set)
+        assert [entry[1:] for entry in second.found_history] == [("3005", 'manual'), ("3001", 'detected')]
+        assert second.get_progress_stats()['manual_finds'] == 1
+        second.stop_tracking()
+    
+    def test_progress_log_reset_for_other_set(self, tracker, tmp_path):
+        """Test a log written for another set is not replayed."""
+        log_path = tmp_path / 'progress.log'
+        
+        first = ProgressTracker(log_path=log_path)
+        first.start_tracking(tracker.current_set)
+        first.record_brick_found("3005")
+        first.stop_tracking()
+        
+        other_set = LegoSet(name="Other", set_number="99999",
+                            bricks=[Brick(part_number="3005", color="Red", quantity=1)])
+        second = ProgressTracker(log_path=log_path)
+        second.start_tracking(other_set)
+        assert second.found_history == []
+        second.stop_tracking()
@@ -0,0 +1,37 @@
+"""
+Unit tests for VideoDisplayWidget detection drawing.
+"""
+
+import numpy as np
+import pytest
+from src.gui.video_display import VideoDisplayWidget
+from src.vision.detection_engine import Detection
+
+# Qt widgets need a QApplication; the session fixture creates it on first use
+pytestmark = pytest.mark.usefixtures("qapp")
+
+
+class TestDrawDetections:
+    """Test detection boxes are drawn on a copy in their confidence tier's color."""
+
+    @pytest.fixture
+    def widget(self):
+        """Create a video display widget."""
+        return VideoDisplayWidget()
+
+    def test_box_color_follows_confidence_tier(self, widget):
+        """Test boxes above 0.8 are green, above 0.6 yellow and red otherwise (BGR)."""
+        frame = np.zeros((200, 400, 3), dtype=np.uint8)
+        detections = [
+            Detection(bbox=(20, 60, 100, 180), class_id=0, class_name="3001", confidence=0.9),
+            Detection(bbox=(150, 60, 230, 180), class_id=0, class_name="3001", confidence=0.8),
+            Detection(bbox=(280, 60, 360, 180), class_id=0, class_name="3001", confidence=0.3),
+        ]
+
+        result = widget.draw_detections(frame, detections)
+
+        # Sample the left edge of each box, below its label
+        assert result[150, 20].tolist() == [0, 255, 0]
+        assert result[150, 150].tolist() == [0, 255, 255]
+        assert result[150, 280].tolist() == [0, 0, 255]
+        assert not frame.any()
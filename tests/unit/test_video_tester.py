@@ -0,0 +1,73 @@
+"""
+Unit tests for VideoTester settings probes.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from src.vision import video_tester
+from src.vision.video_tester import VideoTester
+
+
+class _FakeCaptureManager:
+    """Capture manager that always opens and reports a fixed mode."""
+
+    mode = (640, 480, 0.0)
+
+    def open(self, device_id, width, height, fps):
+        return True
+
+    def get_mode(self):
+        return self.mode
+
+    def grab_frame(self):
+        return True
+
+    def retrieve_frame(self):
+        return np.full((480, 640, 3), 100, dtype=np.uint8)
+
+    def close(self):
+        pass
+
+
+class TestVideoTester:
+    """Test mode checks and the device access cache."""
+
+    @pytest.fixture
+    def tester(self, monkeypatch):
+        """Create a tester whose streams come from the fake capture manager."""
+        monkeypatch.setattr(video_tester, "VideoCaptureManager", _FakeCaptureManager)
+        return VideoTester()
+
+    @staticmethod
+    def _source(width=640, height=480, fps=30):
+        return SimpleNamespace(device_id=0, width=width, height=height, fps=fps,
+                               get_display_name=lambda: "Fake camera")
+
+    def test_unreported_fps_passes_mode_check(self, tester):
+        """Test a driver reporting 0 FPS is not rejected by the mode check."""
+        results = tester.test_stream(self._source(), test_duration=0.1, require_mode=True)
+
+        assert results['success'], results['error']
+
+    def test_mismatched_mode_rejected_only_when_required(self, tester):
+        """Test a resolution the driver did not apply fails only with require_mode."""
+        source = self._source(width=1280, height=720)
+
+        assert not tester.test_stream(source, test_duration=0.1, require_mode=True)['success']
+        assert tester.test_stream(source, test_duration=0.1)['success']
+
+    def test_access_cache_can_be_cleared(self, tester, monkeypatch):
+        """Test quick_test reuses its result until the cache is cleared or expires."""
+        probes = []
+        monkeypatch.setattr(tester, "_quick_test", lambda device_id: probes.append(device_id) or True)
+
+        assert tester.quick_test(0) and tester.quick_test(0)
+        assert probes == [0]
+
+        tester.clear_access_cache(0)
+        tester.quick_test(0)
+        tester.ACCESS_CACHE_TTL = -1
+        tester.quick_test(0)
+        assert probes == [0, 0, 0]
@@ -34,7 +34,6 @@ def test_basic_functionality():
     lego_set = LegoSet(
         set_number="60122-1",
         name="Volcano Crawler",
-        total_bricks=3,
         bricks=[brick1, brick2, brick3]
     )
     